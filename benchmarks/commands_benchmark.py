@@ -0,0 +1,257 @@
+"""End-to-end benchmark of the commands against the local RSC simulator.
+
+Every scenario is run through the command line (hprsctool main, in-process,
+including the login) and through its comm.operations functions (over an
+existing session). The latency percentiles, the requests per run and the
+bytes per run are printed and saved, and compared with a previous run to
+catch regressions in round trips or wall time between releases.
+
+    python benchmarks/commands_benchmark.py [--iterations N] [--latency MS]
+        [--output FILE] [--baseline FILE]
+
+Exits with status 1 if a scenario regressed against the baseline.
+"""
+
+import argparse
+import contextlib
+from dataclasses import asdict, dataclass
+import io
+import json
+import math
+import os
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# pylint: disable=wrong-import-position
+from hprsctool import hprsctool  # noqa: E402
+from hprsctool.comm import redfish_messages  # noqa: E402
+from hprsctool.comm.operations import manager as manager_ops  # noqa: E402
+from hprsctool.comm.operations import network as network_ops  # noqa: E402
+from hprsctool.comm.operations import system as system_ops  # noqa: E402
+from hprsctool.comm.operations import task as task_ops  # noqa: E402
+from hprsctool.comm.remote_system_controller import RedfishConfig, Rsc  # noqa: E402
+from hprsctool.simulator.server import RscSimulator, SimulatorConfig  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# Relative increase of p50 latency or bytes per run reported as a regression
+DEFAULT_TOLERANCE = 0.25
+USERNAME = "admin"
+PASSWORD = "password"
+FIRMWARE_NAME = "rsc_fw_9.9.9.xz"
+
+
+@dataclass
+class Scenario:
+    """A command, as given on the command line and as calls to comm.operations"""
+
+    name: str
+    argv: List[str]
+    operation: Callable[[Rsc, Path], Any]
+
+
+def set_network(rsc: Rsc, _workdir: Path):
+    network_ops.set_manager_ethernet_interface(rsc, {"DHCPv4": {"DHCPEnabled": True}})
+    network_ops.set_manager_network_protocol(
+        rsc, {"Oem": {"HP": {"mDNSDiscoveryProtocol": {"ProtocolEnabled": True}}}}
+    )
+
+
+SCENARIOS = [
+    Scenario("system get", ["system", "get"], lambda rsc, _: system_ops.get_system(rsc)),
+    Scenario(
+        "network get",
+        ["manager", "network", "get"],
+        lambda rsc, _: (
+            network_ops.get_manager_ethernet_interface(rsc),
+            network_ops.get_manager_network_protocol(rsc),
+        ),
+    ),
+    Scenario(
+        "network set",
+        ["manager", "network", "set", "--dhcp", "enable", "--mdns", "enable"],
+        set_network,
+    ),
+    Scenario("tasks list", ["tasks", "list"], lambda rsc, _: task_ops.get_tasks(rsc)),
+    Scenario(
+        "manager update",
+        ["manager", "update", "{firmware}", "--force"],
+        lambda rsc, workdir: manager_ops.update_rsc_firmware(rsc, str(workdir / FIRMWARE_NAME)),
+    ),
+]
+
+
+@dataclass
+class Result:
+    """Measurements of one scenario in one mode"""
+
+    runs: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    requests: int
+    bytes: int
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def run_cli(simulator: RscSimulator, argv: List[str]):
+    """Run hprsctool in-process against the first simulated RSC"""
+    command = ["hprsctool", "-u", USERNAME, "-p", PASSWORD, "-a", simulator.addresses[0], *argv]
+    with patch.object(sys, "argv", command):
+        try:
+            hprsctool.main()
+        except SystemExit as exc:
+            if exc.code:
+                raise RuntimeError(f"{' '.join(argv)} failed") from exc
+
+
+def measure(simulator: RscSimulator, run: Callable[[], Any], iterations: int) -> Result:
+    """Run once to warm up, then iterations times, counting the requests of each run"""
+    run()
+    times, requests, sizes = [], [], []
+    for _ in range(iterations):
+        simulator.reset_stats()
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+        stats = simulator.stats()
+        requests.append(stats.total_requests)
+        sizes.append(stats.bytes_sent + stats.bytes_received)
+    return Result(
+        runs=iterations,
+        p50_ms=round(percentile(times, 50), 2),
+        p95_ms=round(percentile(times, 95), 2),
+        p99_ms=round(percentile(times, 99), 2),
+        mean_ms=round(statistics.fmean(times), 2),
+        requests=max(requests),
+        bytes=round(statistics.fmean(sizes)),
+    )
+
+
+def run_benchmarks(
+    config: SimulatorConfig, iterations: int, names: List[str] | None
+) -> Dict[str, Result]:
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, RscSimulator(1, config) as simulator:
+        workdir = Path(workdir)
+        (workdir / FIRMWARE_NAME).write_bytes(os.urandom(1024 * 1024))
+        rsc = Rsc(RedfishConfig(simulator.base_urls[0], USERNAME, PASSWORD))
+        rsc.login()
+        for scenario in SCENARIOS:
+            if names and scenario.name not in names:
+                continue
+            argv = [arg.format(firmware=workdir / FIRMWARE_NAME) for arg in scenario.argv]
+            runs = {"ops": lambda s=scenario: s.operation(rsc, workdir)}
+            if simulator.scheme == "https":
+                runs["cli"] = lambda a=argv: run_cli(simulator, a)
+            for mode, run in runs.items():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[f"{scenario.name} [{mode}]"] = measure(simulator, run, iterations)
+        rsc.logout()
+        if simulator.scheme != "https":
+            print(
+                "openssl is not available, the command line scenarios were skipped",
+                file=sys.stderr,
+            )
+    return results
+
+
+def compare(baseline: Dict[str, Any], results: Dict[str, Result], tolerance: float) -> List[str]:
+    """Get the regressions of results against a baseline saved by a previous run"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        if result.requests > previous["requests"]:
+            regressions.append(
+                f"{name}: {previous['requests']} -> {result.requests} requests per run"
+            )
+        if result.p50_ms > previous["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {previous['p50_ms']} -> {result.p50_ms} ms")
+        if result.bytes > previous["bytes"] * (1 + tolerance):
+            regressions.append(f"{name}: {previous['bytes']} -> {result.bytes} bytes per run")
+    return regressions
+
+
+def print_results(results: Dict[str, Result]):
+    print(f"{'scenario':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'requests':>10}{'bytes':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<28}{result.p50_ms:>9.1f}{result.p95_ms:>9.1f}{result.p99_ms:>9.1f}"
+            f"{result.requests:>10}{result.bytes:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20, help="Measured runs per scenario")
+    parser.add_argument(
+        "--latency", type=float, default=5, help="Simulated RSC latency, in milliseconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0, help="Simulated RSC jitter, in milliseconds"
+    )
+    parser.add_argument("--scenario", action="append", help="Only run this scenario (repeatable)")
+    parser.add_argument(
+        "--output", type=Path, default=RESULTS_DIR / f"{hprsctool.VERSION}.json",
+        help="File the results are saved to (default: benchmarks/results/<version>.json)",
+    )  # fmt: skip
+    parser.add_argument("--baseline", type=Path, help="Results of a previous run to compare with")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="Relative increase of p50 latency or bytes reported as a regression",
+    )  # fmt: skip
+    args = parser.parse_args()
+
+    # Simulated registries are not worth keeping on disk
+    redfish_messages.registry_cache_dir = None
+    config = SimulatorConfig(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        task_duration=0.2,
+        retry_after=0,
+        seed=0,
+    )
+    results = run_benchmarks(config, args.iterations, args.scenario)
+    print_results(results)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps(
+            {
+                "version": hprsctool.VERSION,
+                "python": platform.python_version(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "simulator": asdict(config),
+                "results": {name: asdict(result) for name, result in results.items()},
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(baseline, results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Microbenchmark of the models: memory per device and attribute access cost.
+
+Compares the models of hprsctool.models with the previous implementation,
+which kept only the payload and walked it on every property access.
+
+    python benchmarks/models_benchmark.py [--devices N] [--repeat N]
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# pylint: disable=wrong-import-position
+from hprsctool.models.system import SAMPLE_SYSTEM_JSON, System  # noqa: E402
+
+FIELDS = (
+    "manufacturer",
+    "model",
+    "bios_version",
+    "uuid",
+    "serial_number",
+    "asset_tag",
+    "power_state",
+    "indicator_led",
+    "health",
+    "main_board_adapter_state",
+    "boot_state",
+    "boot_source_override_target",
+)
+
+
+class LegacyBlinkCodeState:
+    """BlinkCodeState as it was: a new object over the payload"""
+
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def message_id(self):
+        return self.data.get("MessageId", "N/A")
+
+
+class LegacySystem:
+    """System as it was: every property reads the payload again"""
+
+    def __init__(self, data):
+        self.data = data
+
+    manufacturer = property(lambda self: self.data.get("Manufacturer", "N/A"))
+    model = property(lambda self: self.data.get("Model", "N/A"))
+    bios_version = property(lambda self: self.data.get("BiosVersion", "N/A"))
+    uuid = property(lambda self: self.data.get("UUID", "N/A"))
+    serial_number = property(lambda self: self.data.get("SerialNumber", "N/A"))
+    asset_tag = property(lambda self: self.data.get("AssetTag", "N/A"))
+    power_state = property(lambda self: self.data.get("PowerState", "N/A"))
+    indicator_led = property(lambda self: self.data.get("IndicatorLED", "N/A"))
+
+    @property
+    def health(self):
+        if "Status" in self.data:
+            return self.data["Status"].get("Health", "N/A")
+        return "N/A"
+
+    @property
+    def main_board_adapter_state(self):
+        if "Oem" in self.data and "HP" in self.data["Oem"]:
+            return self.data["Oem"]["HP"].get("MainBoardAdapterState", "N/A")
+        return "N/A"
+
+    @property
+    def boot_state(self):
+        if "Oem" in self.data and "HP" in self.data["Oem"]:
+            return self.data["Oem"]["HP"].get("BootState", "N/A")
+        return "N/A"
+
+    @property
+    def blink_code_state(self):
+        if (
+            "Oem" in self.data
+            and "HP" in self.data["Oem"]
+            and "BlinkCodeState" in self.data["Oem"]["HP"]
+        ):
+            return LegacyBlinkCodeState(self.data["Oem"]["HP"]["BlinkCodeState"])
+        return LegacyBlinkCodeState({})
+
+    @property
+    def boot_source_override_target(self):
+        if "Boot" in self.data:
+            return self.data["Boot"].get("BootSourceOverrideTarget", "N/A")
+        return "N/A"
+
+
+def make_payloads(count: int) -> list:
+    """Distinct payloads, as read from count different RSCs"""
+    sample = json.loads(SAMPLE_SYSTEM_JSON)
+    payloads = []
+    for index in range(count):
+        payload = copy.deepcopy(sample)
+        payload["SerialNumber"] = f"MXL{index:07d}"
+        payload["UUID"] = f"{index:032x}"
+        payloads.append(payload)
+    return payloads
+
+
+def memory_per_device(model_class, count: int) -> tuple:
+    """Bytes held per device by the payload and by the models over it"""
+    tracemalloc.start()
+    payloads = make_payloads(count)
+    before = tracemalloc.get_traced_memory()[0]
+    models = [model_class(payload) for payload in payloads]
+    # Read everything once, as a report over the inventory would
+    for model in models:
+        for field in FIELDS:
+            getattr(model, field)
+        _ = model.blink_code_state.message_id
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return before / count, used / count
+
+
+def access_time(model_class, repeat: int) -> float:
+    """Microseconds to read every field of one device"""
+    model = model_class(json.loads(SAMPLE_SYSTEM_JSON))
+
+    def read_all():
+        for field in FIELDS:
+            getattr(model, field)
+        _ = model.blink_code_state.message_id
+
+    return min(timeit.repeat(read_all, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=5000, help="Number of devices in memory")
+    parser.add_argument("--repeat", type=int, default=20000, help="Reads per timing run")
+    args = parser.parse_args()
+
+    print(f"{'model':<8}{'payload B/device':>18}{'model B/device':>16}{'us/read all':>13}")
+    for label, model_class in (("before", LegacySystem), ("after", System)):
+        payload, model = memory_per_device(model_class, args.devices)
+        timing = access_time(model_class, args.repeat)
+        print(f"{label:<8}{payload:>18.0f}{model:>16.0f}{timing:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
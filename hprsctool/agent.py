@@ -0,0 +1,415 @@
+"""hprsctool agent: keeps RSC sessions open between invocations.
+
+Like an SSH ControlMaster, the agent listens on a Unix socket only the
+current user can use. hprsctool --agent forwards its command line to it, and
+the agent runs the command with a logged-in Rsc kept from a previous command
+to the same RSC, so the command does not pay for the start-up of the
+interpreter, the TLS handshake, the service root and the login. Sessions
+unused for --idle-timeout seconds are logged out, and so are all the
+sessions when the agent stops."""
+
+import argparse
+from dataclasses import dataclass
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlparse
+
+from . import cli, connection
+from .agent_client import DEFAULT_SOCKET, request, send_message
+from .comm.remote_system_controller import RedfishError, Rsc
+from .fleet import _ThreadLocalStdout
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+# Idle sessions are checked, which also keeps them open on the RSC, this often
+KEEPALIVE_INTERVAL = 60.0
+
+# Key of a session: address, user name, hash of the password, response cache
+SessionKey = Tuple[str, str, str, str | None]
+
+
+@dataclass
+class PooledSession:
+    """A logged-in Rsc kept by the agent"""
+
+    key: SessionKey
+    rsc: Rsc
+    last_used: float
+    last_checked: float
+    # Set when a command using the session failed, so that the session is
+    # checked before it is used again
+    suspect: bool = False
+
+
+def session_key(
+    address: str, username: str, password: str, response_cache: str | None
+) -> SessionKey:
+    """Get the key of the sessions of an address and user. A password that
+    does not match the one of a kept session never reuses it."""
+    digest = hashlib.sha256(f"{username}\0{password}".encode()).hexdigest()
+    return (address, username, digest, response_cache)
+
+
+def check_session(rsc: Rsc):
+    """Check that the RSC still accepts the session, and log in again if not"""
+    location = urlparse(rsc.client.get_session_location() or "").path
+    if not location or not rsc.resume_session(rsc.client.get_session_key(), location):
+        rsc.login()
+
+
+def logout(session: PooledSession):
+    try:
+        session.rsc.logout()
+    except Exception:  # pylint: disable=broad-exception-caught
+        pass
+
+
+class SessionPool:
+    """Logged-in Rsc instances, by address and user. A session is used by
+    one command at a time; commands run at the same time against the same
+    RSC get sessions of their own."""
+
+    def __init__(
+        self,
+        connect: Callable[[str, str, str, str | None], Rsc] | None = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        keepalive_interval: float = KEEPALIVE_INTERVAL,
+    ):
+        self.connect = connect or (
+            lambda address, username, password, response_cache: connection.connect_rsc(
+                address, username, password, response_cache_dir=response_cache
+            )
+        )
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self._idle: Dict[SessionKey, List[PooledSession]] = {}
+        self._in_use: List[PooledSession] = []
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, address: str, username: str, password: str, response_cache: str | None = None
+    ) -> PooledSession:
+        """Get a kept session, or log in"""
+        key = session_key(address, username, password, response_cache)
+        with self._lock:
+            idle = self._idle.get(key)
+            session = idle.pop() if idle else None
+        if session is not None:
+            now = time.monotonic()
+            if session.suspect or now - session.last_checked > self.keepalive_interval:
+                try:
+                    check_session(session.rsc)
+                    session.last_checked = now
+                    session.suspect = False
+                except RedfishError:
+                    session = None
+        if session is None:
+            now = time.monotonic()
+            rsc = self.connect(address, username, password, response_cache)
+            session = PooledSession(key, rsc, now, now)
+        with self._lock:
+            self._in_use.append(session)
+        return session
+
+    def release(self, session: PooledSession, suspect: bool = False):
+        """Give back a session once the command using it is done"""
+        session.last_used = time.monotonic()
+        session.suspect = session.suspect or suspect
+        with self._lock:
+            self._in_use.remove(session)
+            self._idle.setdefault(session.key, []).append(session)
+
+    def maintain(self):
+        """Log out of the sessions idle for too long, and check the others so
+        that the RSCs keep them open"""
+        now = time.monotonic()
+        expired, to_check = [], []
+        with self._lock:
+            for key, sessions in list(self._idle.items()):
+                for session in list(sessions):
+                    if now - session.last_used > self.idle_timeout:
+                        expired.append(session)
+                    elif now - session.last_checked > self.keepalive_interval:
+                        to_check.append(session)
+                    else:
+                        continue
+                    sessions.remove(session)
+                if not sessions:
+                    del self._idle[key]
+        for session in expired:
+            logout(session)
+        for session in to_check:
+            try:
+                check_session(session.rsc)
+            except RedfishError:
+                # Logged in again when it is next used
+                continue
+            session.last_checked = time.monotonic()
+            with self._lock:
+                self._idle.setdefault(session.key, []).append(session)
+
+    def close(self):
+        """Log out of every session"""
+        with self._lock:
+            sessions = [session for idle in self._idle.values() for session in idle] + self._in_use
+            self._idle.clear()
+            self._in_use.clear()
+        for session in sessions:
+            logout(session)
+
+    def status(self) -> List[Dict]:
+        """Describe the kept sessions"""
+        now = time.monotonic()
+        with self._lock:
+            sessions = [(session, False) for idle in self._idle.values() for session in idle]
+            sessions += [(session, True) for session in self._in_use]
+        return [
+            {
+                "address": session.key[0],
+                "username": session.key[1],
+                "in_use": in_use,
+                "idle": 0.0 if in_use else now - session.last_used,
+            }
+            for session, in_use in sessions
+        ]
+
+
+class _SocketWriter(io.TextIOBase):
+    """Sends what a command prints to the client, as messages of a stream"""
+
+    def __init__(self, stream, name: str, lock: threading.Lock):
+        super().__init__()
+        self.stream = stream
+        self.name = name
+        self.lock = lock
+
+    def write(self, s: str) -> int:
+        with self.lock:
+            try:
+                send_message(self.stream, {self.name: s})
+            except OSError:
+                # The client is gone; the command still runs to completion
+                pass
+        return len(s)
+
+
+def exit_status(exc: SystemExit) -> int:
+    """Get the exit status of a sys.exit() call"""
+    if exc.code is None or isinstance(exc.code, int):
+        return exc.code or 0
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def resolve_paths(args: argparse.Namespace, cwd: str):
+    """Make the file arguments relative to the directory of the client"""
+    for name, value in vars(args).items():
+        is_path = name.endswith(("_file", "_file_path")) or name in ("inventory", "response_cache")
+        if is_path and isinstance(value, str) and value and not os.path.isabs(value):
+            setattr(args, name, os.path.join(cwd, value))
+
+
+class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Runs the commands sent to the socket with the sessions of the pool"""
+
+    daemon_threads = False
+    block_on_close = True
+
+    def __init__(self, socket_path: str | Path, pool: SessionPool):
+        self.pool = pool
+        self.socket_path = str(socket_path)
+        # What each command prints is sent to its client, and the output of
+        # fleet commands is captured per host on top of it
+        self.stdout = _ThreadLocalStdout(sys.stdout)
+        self.stderr = _ThreadLocalStdout(sys.stderr)
+        # Only the current user may use the socket
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(self.socket_path, AgentRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        sys.stdout, sys.stderr = self.stdout, self.stderr
+        super().serve_forever(poll_interval)
+
+    def server_close(self):
+        # Waits for the commands still running
+        super().server_close()
+        if sys.stdout is self.stdout:
+            sys.stdout = self.stdout.stream
+        if sys.stderr is self.stderr:
+            sys.stderr = self.stderr.stream
+
+    def run_command(self, message: Dict) -> int | None:
+        """Run a forwarded command line. Returns None for commands the agent
+        does not run."""
+        if message.get("version") != cli.VERSION:
+            return None
+        argparser = cli.create_argument_parser()
+        try:
+            args = argparser.parse_args(message["argv"])
+        except SystemExit as exc:
+            return exit_status(exc)
+        # Commands connecting to the RSCs themselves, like the exporter, run in the client
+        if getattr(args, "handles_addresses", False):
+            return None
+        resolve_paths(args, message.get("cwd", os.getcwd()))
+
+        leases: List[PooledSession] = []
+
+        def connect(address: str, args: argparse.Namespace, trace) -> Rsc:
+            session = self.pool.acquire(address, args.username, args.password, args.response_cache)
+            leases.append(session)
+            session.rsc.trace = trace
+            return session.rsc
+
+        status = 0
+        try:
+            cli.run(args, argparser, connect)
+        except SystemExit as exc:
+            status = exit_status(exc)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            print(f"{type(exc).__name__}: {exc}", file=sys.stderr)
+            status = 1
+        finally:
+            for session in leases:
+                session.rsc.trace = None
+                self.pool.release(session, suspect=status != 0)
+        return status
+
+    def print_status(self):
+        sessions = self.pool.status()
+        print(f"Agent {os.getpid()} on {self.socket_path}: {len(sessions)} sessions")
+        for session in sorted(sessions, key=lambda s: (s["address"], s["username"])):
+            state = "in use" if session["in_use"] else f"idle for {session['idle']:.0f}s"
+            print(f"  {session['username']}@{session['address']}: {state}")
+
+
+class AgentRequestHandler(socketserver.StreamRequestHandler):
+    """Handles one request of a client"""
+
+    server: AgentServer
+
+    def handle(self):
+        stream = io.TextIOWrapper(self.wfile, encoding="utf-8", newline="\n", write_through=True)
+        line = self.rfile.readline()
+        if not line:
+            return
+        message = json.loads(line)
+        lock = threading.Lock()
+        self.server.stdout.local.buffer = _SocketWriter(stream, "stdout", lock)
+        self.server.stderr.local.buffer = _SocketWriter(stream, "stderr", lock)
+        try:
+            if message.get("request") == "run":
+                status = self.server.run_command(message)
+            elif message.get("request") == "status":
+                self.server.print_status()
+                status = 0
+            elif message.get("request") == "stop":
+                print("Agent stopping")
+                # Stop in another thread: shutdown() waits for serve_forever()
+                threading.Thread(target=self.server.shutdown).start()
+                status = 0
+            else:
+                print(f"Unknown request {message.get('request')!r}", file=sys.stderr)
+                status = 2
+        finally:
+            self.server.stdout.local.buffer = None
+            self.server.stderr.local.buffer = None
+        try:
+            with lock:
+                send_message(stream, {"exit": status})
+        except OSError:
+            pass
+
+
+def is_running(socket_path: str | Path) -> bool:
+    """Check whether an agent answers on a socket"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except OSError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def serve(socket_path: str | Path, idle_timeout: float):
+    """Run the agent until it is stopped, interrupted or terminated"""
+    socket_path = Path(socket_path)
+    if is_running(socket_path):
+        sys.exit(f"An agent is already running on {socket_path}")
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # Left over by an agent that did not stop cleanly
+    socket_path.unlink(missing_ok=True)
+
+    pool = SessionPool(idle_timeout=idle_timeout)
+    server = AgentServer(socket_path, pool)
+    stop_maintenance = threading.Event()
+
+    def maintain():
+        while not stop_maintenance.wait(min(pool.keepalive_interval, pool.idle_timeout) / 2):
+            pool.maintain()
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    maintenance = threading.Thread(target=maintain, name="agent-maintenance", daemon=True)
+    maintenance.start()
+    print(f"Agent {os.getpid()} listening on {socket_path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_maintenance.set()
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        pool.close()
+
+
+def main(argv: List[str]):
+    """Entry point of hprsctool agent"""
+    parser = argparse.ArgumentParser(
+        prog="hprsctool agent",
+        description="Keep RSC sessions open for the commands run with hprsctool --agent",
+    )
+    parser.add_argument(
+        "--socket",
+        help=f"Socket of the agent (default: {DEFAULT_SOCKET})",
+        default=DEFAULT_SOCKET,
+        type=Path,
+    )
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    start_parser = subparsers.add_parser("start", help="Run the agent until it is stopped")
+    start_parser.add_argument(
+        "--idle-timeout",
+        help="Seconds after which an unused session is logged out "
+        f"(default: {DEFAULT_IDLE_TIMEOUT:.0f})",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+    )
+    subparsers.add_parser("stop", help="Stop the agent, logging out of every RSC")
+    subparsers.add_parser("status", help="List the sessions kept by the agent")
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        sys.exit("The agent needs Unix domain sockets, which this platform does not support")
+    if args.action == "start":
+        if args.idle_timeout <= 0:
+            parser.error("--idle-timeout must be positive")
+        serve(args.socket, args.idle_timeout)
+        return
+    status = request({"request": args.action}, args.socket)
+    if status is None:
+        sys.exit(f"No agent is running on {args.socket}")
+    sys.exit(status)
@@ -0,0 +1,63 @@
+"""Client side of the hprsctool agent.
+
+Only uses the standard library, so that forwarding a command to the agent
+does not pay for importing the Redfish client. Messages are JSON objects, one
+per line. A command is sent as {"request": "run", "argv": [...], "cwd": ...}
+and the agent answers with {"stdout": text} and {"stderr": text} messages as
+the command prints, then {"exit": status}. An exit status of null means that
+the agent cannot run the command, and that it must be run locally."""
+
+import json
+import os
+from pathlib import Path
+import socket
+import sys
+from typing import Any, Dict
+
+DEFAULT_SOCKET = Path.home() / ".hprsctool" / "agent.sock"
+
+
+def send_message(stream, message: Dict[str, Any]):
+    """Write a message to a socket file"""
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+def request(message: Dict[str, Any], socket_path: str | Path | None = None) -> int | None:
+    """Send a request to the agent, print its output and return its exit
+    status. Returns None if no agent is running or if it did not handle the
+    request."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(socket_path or DEFAULT_SOCKET))
+    except OSError:
+        connection.close()
+        return None
+    with connection, connection.makefile("rw", encoding="utf-8", newline="\n") as stream:
+        send_message(stream, message)
+        for line in stream:
+            answer = json.loads(line)
+            if "stdout" in answer:
+                sys.stdout.write(answer["stdout"])
+                sys.stdout.flush()
+            elif "stderr" in answer:
+                sys.stderr.write(answer["stderr"])
+                sys.stderr.flush()
+            elif "exit" in answer:
+                return answer["exit"]
+    # The command may have been partly run, so it must not be run again here
+    print("The agent closed the connection before the command was done", file=sys.stderr)
+    return 1
+
+
+def run_command(argv: list, socket_path: str | Path | None = None) -> int | None:
+    """Run a command line (without the program name) through the agent"""
+    # The version is checked so that an agent left running by an older
+    # hprsctool does not run commands it may parse differently
+    from .cli import VERSION  # pylint: disable=import-outside-toplevel
+
+    return request(
+        {"request": "run", "argv": argv, "cwd": os.getcwd(), "version": VERSION}, socket_path
+    )
@@ -0,0 +1,329 @@
+"""Command line of hprsctool: the parser and the run of a parsed command.
+
+Kept apart from the entry point in hprsctool.py, so that the agent can run
+command lines without importing the module that starts it."""
+
+import argparse
+import contextlib
+import importlib
+import sys
+
+VERSION = "0.11.0"
+
+# Top-level commands, with the module defining their parameters. A module is
+# only imported when its command is used, so that --version and -h do not pay
+# for loading the Redfish client and the models.
+COMMANDS = {
+    "manager": ("Manager commands", ".commands.manager.manager"),
+    "system": ("System commands", ".commands.system"),
+    "tasks": ("Task commands", ".commands.task"),
+    "apply": ("Bring the RSCs to the desired state of a file", ".commands.apply"),
+    "exporter": ("Serve the metrics of the RSCs to Prometheus", ".commands.exporter"),
+}
+
+
+class LazySubParsersAction(argparse._SubParsersAction):  # pylint: disable=protected-access
+    """Subparsers action that only fills in the parser of the selected command"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._command_modules = {}
+
+    def add_command(self, name: str, help_text: str, module_name: str):
+        """Add a command whose parameters are defined by module_name"""
+        self._command_modules[name] = (self.add_parser(name, help=help_text), module_name)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if values and values[0] in self._command_modules:
+            command_parser, module_name = self._command_modules.pop(values[0])
+            module = importlib.import_module(module_name, __package__)
+            if hasattr(module, "add_arguments"):
+                # Command without subcommands
+                module.add_arguments(command_parser)
+            else:
+                module.get_parameters(command_parser.add_subparsers())
+        super().__call__(parser, namespace, values, option_string)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """Create the parser of the command line"""
+    argparser = argparse.ArgumentParser(
+        description="HP RSC tool",
+        prog="hprsctool",
+        epilog="For help on a specific command, use hprsctool <command> -h. "
+        "To keep RSC sessions open between commands, see hprsctool agent -h",
+    )
+    argparser.add_argument(
+        "-u", "--username", help="Username for the RSC", required=True
+    )
+    argparser.add_argument(
+        "-p", "--password", help="Password for the RSC", required=True
+    )
+    argparser.add_argument(
+        "-a",
+        "--address",
+        help="Address of the RSC. May be specified more than once to run the "
+        "command against several RSCs concurrently",
+        action="append",
+        default=[],
+    )
+    argparser.add_argument(
+        "-i",
+        "--inventory",
+        help="File with one RSC address per line to run the command against",
+        action="store",
+    )
+    argparser.add_argument(
+        "--workers",
+        help="Maximum number of RSCs handled concurrently when running "
+        "against several RSCs (default: 16)",
+        type=int,
+    )
+    argparser.add_argument(
+        "--max-uploads",
+        help="Maximum number of firmware files uploaded at the same time, to all the RSCs",
+        type=int,
+    )
+    argparser.add_argument(
+        "--max-uploads-per-rsc",
+        help="Maximum number of firmware files uploaded at the same time to each RSC "
+        "(default: 1)",
+        type=int,
+    )
+    argparser.add_argument(
+        "--max-bandwidth",
+        help="Maximum total bandwidth of firmware uploads, in MiB/s",
+        type=float,
+        metavar="MIB_PER_S",
+    )
+
+    argparser.add_argument(
+        "--session-cache",
+        help="Reuse RSC sessions between invocations by keeping their tokens in "
+        "FILE (default: ~/.hprsctool/sessions.json)",
+        nargs="?",
+        const="",
+        metavar="FILE",
+    )
+    argparser.add_argument(
+        "--response-cache",
+        help="Keep GET responses in DIR and only download resources that changed "
+        "since the previous invocation (default: ~/.hprsctool/responses)",
+        nargs="?",
+        const="",
+        metavar="DIR",
+    )
+    argparser.add_argument(
+        "--if-match",
+        help="Send changes with the ETag of the settings they are based on, so that "
+        "settings changed by someone else in the meantime are read again instead of "
+        "being overwritten. With --response-cache, settings read in the last minute "
+        "are not read again before being changed",
+        action="store_true",
+    )
+    argparser.add_argument(
+        "--retries",
+        help="Number of times a request is sent again when the RSC does not answer or "
+        "is unavailable (default: 3). Changes are only sent again when the RSC "
+        "did not get them",
+        type=int,
+    )
+    argparser.add_argument(
+        "--connect-timeout",
+        help="Seconds to wait for the connection to the RSC (default: 10)",
+        type=float,
+        metavar="SECONDS",
+    )
+    argparser.add_argument(
+        "--read-timeout",
+        help="Seconds to wait for the RSC to answer (default: 30)",
+        type=float,
+        metavar="SECONDS",
+    )
+    argparser.add_argument(
+        "--request-deadline",
+        help="Seconds after which a request is not sent again (default: 120)",
+        type=float,
+        metavar="SECONDS",
+    )
+    argparser.add_argument(
+        "--trace",
+        help="Trace the requests sent to the RSCs and time the login and the phases of "
+        "the command, and print the trace to stderr",
+        action="store_true",
+    )
+    argparser.add_argument(
+        "--trace-format",
+        help="Print the trace as a summary (default) or as one JSON line per event",
+        choices=["summary", "jsonl"],
+        default="summary",
+    )
+    argparser.add_argument(
+        "--trace-file",
+        help="Append the trace to FILE instead of printing it to stderr. Implies --trace",
+        metavar="FILE",
+    )
+
+    # Include version and agent in the main argument parser so they show up in the help text
+    add_version_argument(argparser)
+    add_agent_arguments(argparser)
+
+    top_level_subparsers = argparser.add_subparsers(action=LazySubParsersAction)
+    for name, (help_text, module_name) in COMMANDS.items():
+        top_level_subparsers.add_command(name, help_text, module_name)
+    return argparser
+
+
+def run(args: argparse.Namespace, argparser: argparse.ArgumentParser, connect_rsc=None):
+    """Run a parsed command line. connect_rsc(address, args, trace) returns
+    the logged-in Rsc of an address, instead of logging in with the session
+    cache; the agent passes its warm sessions."""
+    if "func" not in args:
+        print("-- No action specified.")
+        argparser.print_help()
+        sys.exit(1)
+
+    # pylint: disable=import-outside-toplevel
+    from . import connection, fleet
+    from .comm import firmware_image, upload
+    from .comm.remote_system_controller import RedfishError, Rsc
+    from .comm.retry import RetryPolicy
+    from .comm.trace import trace_phase
+
+    addresses = list(args.address)
+    if args.inventory:
+        try:
+            addresses += fleet.read_inventory(args.inventory)
+        except OSError as e:
+            argparser.error(f"cannot read inventory file: {e}")
+    if not addresses:
+        argparser.error("at least one RSC address is required (-a or -i)")
+    if args.workers is None:
+        args.workers = fleet.DEFAULT_WORKERS
+    if args.workers < 1:
+        argparser.error("--workers must be at least 1")
+    if args.max_uploads is not None and args.max_uploads < 1:
+        argparser.error("--max-uploads must be at least 1")
+    if args.max_uploads_per_rsc is not None and args.max_uploads_per_rsc < 1:
+        argparser.error("--max-uploads-per-rsc must be at least 1")
+    if args.max_bandwidth is not None and args.max_bandwidth <= 0:
+        argparser.error("--max-bandwidth must be positive")
+    # Set on every run, as the agent runs the commands of many clients in
+    # the same process
+    firmware_image.set_upload_limits(
+        args.max_uploads,
+        args.max_bandwidth * upload.MIB if args.max_bandwidth else None,
+        args.max_uploads_per_rsc or firmware_image.DEFAULT_MAX_UPLOADS_PER_RSC,
+    )
+
+    if args.retries is not None and args.retries < 0:
+        argparser.error("--retries must not be negative")
+    retry_settings = {}
+    if args.retries is not None:
+        retry_settings["attempts"] = args.retries + 1
+    for option, name, value in (
+        ("--connect-timeout", "connect_timeout", args.connect_timeout),
+        ("--read-timeout", "read_timeout", args.read_timeout),
+        ("--request-deadline", "total_timeout", args.request_deadline),
+    ):
+        if value is not None:
+            if value <= 0:
+                argparser.error(f"{option} must be positive")
+            retry_settings[name] = value
+    retry_policy = RetryPolicy(**retry_settings) if retry_settings else None
+
+    sessions = None if connect_rsc else connection.get_session_cache(args.session_cache)
+
+    with open_trace(args) as tracer:
+
+        def connect(address: str) -> Rsc:
+            if connect_rsc is not None:
+                rsc = connect_rsc(address, args, tracer)
+            else:
+                rsc = connection.connect_rsc(
+                    address, args.username, args.password, sessions, args.response_cache, tracer
+                )
+            rsc.conditional_writes = args.if_match
+            # Set again by fleet mode. The agent reuses the Rsc of other commands.
+            rsc.task_scheduler = None
+            rsc.retry_policy = retry_policy or RetryPolicy.from_config(rsc.config)
+            return rsc
+
+        handles_addresses = getattr(args, "handles_addresses", False)
+        if not handles_addresses and (len(addresses) > 1 or args.inventory):
+            run_fleet(addresses, args, connect)
+
+        try:
+            if handles_addresses:
+                # The command connects to every address itself
+                args.addresses = addresses
+                args.connect = connect
+                args.func(args)
+                return
+            args.rsc = connect(addresses[0])
+            with trace_phase(tracer, f"command {args.func.__name__}", args.rsc.address):
+                args.func(args)
+        except ValueError as e:
+            print(f"Invalid parameters: {e}")
+            sys.exit(1)
+        except RedfishError as e:
+            print(e)
+            sys.exit(1)
+
+
+@contextlib.contextmanager
+def open_trace(args):
+    """Get the trace recorder selected by --trace, if any, and print the
+    summary when the command is done, even if it fails"""
+    if not args.trace and not args.trace_file:
+        yield None
+        return
+    from .comm.trace import TraceRecorder  # pylint: disable=import-outside-toplevel
+
+    with contextlib.ExitStack() as stack:
+        stream = sys.stderr
+        if args.trace_file:
+            stream = stack.enter_context(open(args.trace_file, "a", encoding="utf-8"))
+        tracer = TraceRecorder(stream if args.trace_format == "jsonl" else None)
+        try:
+            yield tracer
+        finally:
+            if args.trace_format == "summary":
+                print(tracer.summary(), file=stream, flush=True)
+
+
+def run_fleet(addresses, args, connect):
+    """Run the command against several RSCs and exit with the fleet status"""
+    from . import fleet  # pylint: disable=import-outside-toplevel
+
+    results = []
+    for result in fleet.run_fleet(addresses, args, connect, args.workers):
+        fleet.print_host_result(result)
+        results.append(result)
+    fleet.print_summary(results)
+    sys.exit(0 if all(result.succeeded for result in results) else 1)
+
+
+def add_agent_arguments(parser):
+    """Add the arguments selecting the agent running the command"""
+    parser.add_argument(
+        "--agent",
+        help="Run the command through the hprsctool agent, which keeps the RSC "
+        "sessions open. The command is run here if no agent is running",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--agent-socket",
+        help="Socket of the agent (default: ~/.hprsctool/agent.sock)",
+        metavar="PATH",
+    )
+
+
+def add_version_argument(parser):
+    """Add a --version argument to an argument parser"""
+    parser.add_argument(
+        "--version",
+        help="Print the program version and exit.",
+        required=False,
+        action="store_true",
+    )
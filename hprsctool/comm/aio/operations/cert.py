@@ -0,0 +1,20 @@
+'''RSC certificate commands'''
+
+from ....comm.operations.cert import get_replace_certificate_body
+from ....models import certificate
+from ..remote_system_controller import AsyncRsc
+
+async def get_certificate(rsc: AsyncRsc) -> certificate.Certificate:
+    """Get the certificate information"""
+    return certificate.Certificate(
+        (await rsc.perform_redfish_get(
+            "/redfish/v1/Managers/1/NetworkProtocol/HTTPS/Certificates/1"
+        )).dict
+    )
+
+async def replace_certificate(rsc: AsyncRsc, cert_file_path: str, key_file_path: str):
+    """Upload a certificate"""
+    await rsc.perform_redfish_post(
+        "/redfish/v1/CertificateService/Actions/CertificateService.ReplaceCertificate",
+        get_replace_certificate_body(cert_file_path, key_file_path),
+    )
@@ -0,0 +1,60 @@
+"""Manager commands"""
+
+from pathlib import Path
+
+from redfish.aio import AsyncRestResponse
+
+from ....comm.operations.manager import check_firmware_update_result
+from ....models.manager import Manager
+from ..remote_system_controller import AsyncRsc
+
+
+async def get_manager(rsc: AsyncRsc) -> Manager:
+    """Get the RSC manager information"""
+    return Manager((await rsc.perform_redfish_get("/redfish/v1/Managers/1")).dict)
+
+
+async def change_admin_password(rsc: AsyncRsc, new_password: str):
+    """Change the RSC password"""
+    body = {"Password": new_password}
+    await rsc.perform_redfish_patch("/redfish/v1/AccountService/Accounts/1", body)
+
+
+async def restart(rsc: AsyncRsc):
+    """Restart the RSC"""
+    await rsc.perform_redfish_post(
+        "/redfish/v1/Managers/1/Actions/Manager.Reset",
+        {"ResetType": "ForceRestart"},
+    )
+
+
+async def factory_reset(rsc: AsyncRsc):
+    """Factory-reset the RSC"""
+    await rsc.perform_redfish_post(
+        "/redfish/v1/Managers/1/Actions/Manager.ResetToDefaults",
+        {"ResetToDefaultsType": "ResetAll"},
+    )
+
+
+async def update_rsc_firmware(rsc: AsyncRsc, fw_file_path: str) -> AsyncRestResponse:
+    """Update the RSC firmware. The file is streamed, not loaded in memory."""
+
+    fw_path = Path(fw_file_path)
+    if not fw_path.exists():
+        raise ValueError(f"Firmware file {fw_file_path} not found")
+
+    with open(fw_path, "rb") as firmware:
+        response = await rsc.perform_redfish_post(
+            "/redfish/v1/UpdateService/MultipartUpdate",
+            {"UpdateFile": (fw_path.name, firmware, "application/octet-stream")},
+            is_multipart=True,
+        )
+
+    monitor_response = await rsc.monitor_task(response)
+    check_firmware_update_result(monitor_response)
+    return monitor_response
+
+
+async def update_manager(rsc: AsyncRsc, body: dict) -> AsyncRestResponse:
+    """Update the RSC manager information"""
+    return await rsc.perform_redfish_patch("/redfish/v1/Managers/1", body)
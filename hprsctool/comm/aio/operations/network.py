@@ -0,0 +1,32 @@
+"""network related commands"""
+
+from redfish.aio import AsyncRestResponse
+
+from ....models import ethernet_interface
+from ....models.manager_network_protocol import ManagerNetworkProtocol
+from ..remote_system_controller import AsyncRsc
+
+async def get_manager_ethernet_interface(rsc: AsyncRsc) -> ethernet_interface.EthernetInterface:
+    """Get the RSC ethernet interface information"""
+    return ethernet_interface.EthernetInterface(
+        (await rsc.perform_redfish_get("/redfish/v1/Managers/1/EthernetInterfaces/eth0")).dict
+    )
+
+
+async def set_manager_ethernet_interface(rsc: AsyncRsc, data: dict) -> AsyncRestResponse:
+    """Set the RSC ethernet interface information"""
+    return await rsc.perform_redfish_patch(
+        "/redfish/v1/Managers/1/EthernetInterfaces/eth0", data
+    )
+
+
+async def get_manager_network_protocol(rsc: AsyncRsc) -> ManagerNetworkProtocol:
+    """Get the RSC network protocol information"""
+    return ManagerNetworkProtocol(
+        (await rsc.perform_redfish_get("/redfish/v1/Managers/1/NetworkProtocol")).dict
+    )
+
+
+async def set_manager_network_protocol(rsc: AsyncRsc, data: dict) -> AsyncRestResponse:
+    """Set the RSC network protocol information"""
+    return await rsc.perform_redfish_patch("/redfish/v1/Managers/1/NetworkProtocol", data)
@@ -0,0 +1,18 @@
+"""Commands for system management."""
+
+from redfish.aio import AsyncRestResponse
+
+from ....models.system import System
+from ..remote_system_controller import AsyncRsc
+
+async def get_system(rsc: AsyncRsc) -> System:
+    """Get the system information"""
+    return System((await rsc.perform_redfish_get("/redfish/v1/Systems/1")).dict)
+
+
+async def set_system_power(rsc: AsyncRsc, state: str) -> AsyncRestResponse:
+    """Set the system power state"""
+    body = {"ResetType": state}
+    return await rsc.perform_redfish_post(
+        "/redfish/v1/Systems/1/Actions/ComputerSystem.Reset", body
+    )
@@ -0,0 +1,22 @@
+"""Task Commands"""
+
+from ....models.task import Task, TaskCollection
+from ..remote_system_controller import AsyncRsc
+
+async def get_task_collection(rsc: AsyncRsc) -> TaskCollection:
+    """Get the task collection information"""
+    return TaskCollection(
+        (await rsc.perform_redfish_get("/redfish/v1/TaskService/Tasks")).dict
+    )
+
+
+async def get_task(rsc: AsyncRsc, task_id: str) -> Task:
+    """Get the task information"""
+    return Task(
+        (await rsc.perform_redfish_get(f"/redfish/v1/TaskService/Tasks/{task_id}")).dict
+    )
+
+
+async def delete_task(rsc: AsyncRsc, task_id: str):
+    """Delete (cancel) a task"""
+    await rsc.perform_redfish_delete(f"/redfish/v1/TaskService/Tasks/{task_id}/Monitor")
@@ -0,0 +1,38 @@
+"""RSC certificate commands"""
+
+import asyncio
+from typing import List
+
+from ....comm.operations.trusted_cert import get_add_trusted_certificate_body
+from ....models import certificate
+from ..remote_system_controller import AsyncRsc
+
+
+async def add_trusted_certificate(rsc: AsyncRsc, cert_file_path: str):
+    """Add a trusted certificate"""
+    await rsc.perform_redfish_post(
+        "/redfish/v1/Managers/1/TrustedCertificates",
+        get_add_trusted_certificate_body(cert_file_path),
+    )
+
+
+async def get_trusted_certificates(rsc: AsyncRsc) -> List[certificate.Certificate]:
+    """Get the trusted certificates"""
+    response = (await rsc.perform_redfish_get(
+        "/redfish/v1/CertificateService/CertificateLocations"
+    )).dict
+
+    cert_uris = [
+        cert["@odata.id"]
+        for cert in response.get("Links", {}).get("Certificates", [])
+        if "TrustedCertificates" in cert["@odata.id"]
+    ]
+    responses = await asyncio.gather(
+        *(rsc.perform_redfish_get(cert_uri) for cert_uri in cert_uris)
+    )
+    return [certificate.Certificate(cert_response.dict) for cert_response in responses]
+
+
+async def delete_trusted_certificate(rsc: AsyncRsc, cert_id: str):
+    """Delete a trusted certificate"""
+    await rsc.perform_redfish_delete(f"/redfish/v1/Managers/1/TrustedCertificates/{cert_id}")
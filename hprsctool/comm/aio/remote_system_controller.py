@@ -0,0 +1,168 @@
+"""Module defining the asyncio RSC class and redfish operations"""
+
+import asyncio
+import ssl
+from typing import Any
+
+try:
+    import aiohttp
+    from redfish import aio as redfish_aio
+    from redfish.aio import AsyncRestResponse
+except ImportError as import_exc:
+    raise ImportError(
+        "The asyncio RSC client requires aiohttp. "
+        "Install hprsctool with the 'async' extra."
+    ) from import_exc
+
+from .. import redfish_messages
+from ..remote_system_controller import RedfishConfig, RedfishError, check_response_for_error
+
+# Number of simultaneous connections of a ClientSession created by AsyncRsc
+DEFAULT_CONNECTION_LIMIT = 100
+
+
+def create_client_session(
+    config: RedfishConfig, limit: int = DEFAULT_CONNECTION_LIMIT
+) -> aiohttp.ClientSession:
+    """Create an aiohttp session suitable for talking to RSCs.
+
+    One session can be shared by many AsyncRsc instances, so that thousands of
+    requests to different RSCs reuse a single connection pool."""
+    ssl_context: ssl.SSLContext | bool = False
+    if config.cafile or config.capath:
+        ssl_context = ssl.create_default_context(
+            cafile=config.cafile or None, capath=config.capath or None
+        )
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=ssl_context, limit=limit),
+        timeout=aiohttp.ClientTimeout(total=config.timeout),
+    )
+
+
+def retry_after(response: AsyncRestResponse) -> int | None:
+    """Get the Retry-After header of a response, in seconds"""
+    value = response.getheader("Retry-After")
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return 5
+
+
+class AsyncRsc:
+    """Class defining an RSC accessed through asyncio.
+
+    Offers the same operations as Rsc. If no aiohttp session is given, one is
+    created on first use and closed by close()."""
+
+    def __init__(self, config: RedfishConfig, session: aiohttp.ClientSession | None = None):
+        self.config = config
+        self.address = config.base_url
+        self.session = session
+        self._owns_session = session is None
+        self._client: redfish_aio.AsyncRedfishClient | None = None
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            await self.logout()
+        finally:
+            await self.close()
+
+    @property
+    def client(self) -> redfish_aio.AsyncRedfishClient:
+        """Get the underlying redfish client, creating it if needed"""
+        if self._client is None:
+            if self.session is None:
+                self.session = create_client_session(self.config)
+            self._client = redfish_aio.AsyncRedfishClient(
+                self.config.base_url,
+                username=self.config.username,
+                password=self.config.password,
+                session=self.session,
+                timeout=self.config.timeout,
+            )
+        return self._client
+
+    async def close(self):
+        """Close the aiohttp session if it was created by this object"""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+        self._client = None
+
+    async def _perform(self, method: str, url: str, **kwargs) -> AsyncRestResponse:
+        try:
+            response = await getattr(self.client, method.lower())(url, **kwargs)
+        except redfish_aio.RedfishConnectionError as exc:
+            raise RedfishError("Failed to connect to the RSC") from exc
+        error_msg = check_response_for_error(response)
+        if error_msg:
+            raise RedfishError(f"{method} failed for {url}: {error_msg}")
+        return response
+
+    async def perform_redfish_get(self, url: str) -> AsyncRestResponse:
+        """Perform a Redfish action"""
+        return await self._perform("GET", url)
+
+    async def perform_redfish_patch(self, url: str, data: dict) -> AsyncRestResponse:
+        """Perform a Redfish action"""
+        return await self._perform("PATCH", url, body=data)
+
+    async def perform_redfish_post(
+        self, url: str, data: Any, is_multipart: bool = False
+    ) -> AsyncRestResponse:
+        """Perform a Redfish action. A multipart body is a dict of part names to
+        either values or (filename, file object, content type) tuples."""
+        if is_multipart:
+            form = aiohttp.FormData()
+            for name, value in data.items():
+                if isinstance(value, tuple):
+                    filename, content, content_type = value
+                    form.add_field(
+                        name, content, filename=filename, content_type=content_type
+                    )
+                else:
+                    form.add_field(name, value)
+            return await self._perform("POST", url, body=form, timeout=3600)
+        return await self._perform("POST", url, body=data)
+
+    async def perform_redfish_delete(self, url: str) -> AsyncRestResponse:
+        """Perform a Redfish action"""
+        return await self._perform("DELETE", url)
+
+    async def login(self):
+        """Login to the RSC"""
+        try:
+            await self.client.login(auth="session")
+        except redfish_aio.RedfishHTTPError as e:
+            error_msg = redfish_messages.get_error_message(e.response.dict)
+            raise RedfishError(f"Login failed: {error_msg or e}") from e
+        except redfish_aio.RedfishAuthenticationError as e:
+            raise RedfishError("Invalid credentials") from e
+        except Exception as e:
+            raise RedfishError(f"Login failed: {str(e)}") from e
+
+    async def logout(self):
+        """Logout from the RSC"""
+        if self._client is not None:
+            await self._client.logout()
+
+    async def monitor_task(self, task_response: AsyncRestResponse) -> AsyncRestResponse:
+        """Monitors a task until it is completed. Returns the final response of the
+        task monitor. Unlike Rsc.monitor_task, nothing is printed."""
+        task_location = task_response.getheader("Location")
+        while task_response.status == 202:
+            if not task_location:
+                raise RedfishError("The RSC started a task but provided no task monitor")
+            retry_time = retry_after(task_response)
+            await asyncio.sleep(retry_time if retry_time else 5)
+            try:
+                task_response = await self.client.get(task_location)
+            except redfish_aio.RedfishConnectionError as exc:
+                raise RedfishError("Failed to connect to the RSC") from exc
+        return task_response
@@ -0,0 +1,71 @@
+"""Pending changes to Redfish resources, merged so that each resource is patched once"""
+
+import copy
+from typing import Any, Dict, Iterator, Tuple
+
+
+def deep_merge(target: dict, changes: dict) -> dict:
+    """Merge changes into target, recursing into nested objects. Lists and
+    other values replace the value in target, as they do in a PATCH."""
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            deep_merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+    return target
+
+
+class ChangeSet:
+    """Changes to send to Redfish resources, by URI.
+
+    Changes added for the same resource are deep-merged, so that the RSC
+    receives a single PATCH per resource and reconfigures itself once."""
+
+    def __init__(self):
+        self._changes: Dict[str, dict] = {}
+
+    def add(self, url: str, changes: dict) -> None:
+        """Add changes to a resource. Empty changes are ignored."""
+        if changes:
+            deep_merge(self._changes.setdefault(url, {}), changes)
+
+    def get(self, url: str) -> dict:
+        """The changes pending for a resource"""
+        return self._changes.get(url, {})
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._changes
+
+    def __len__(self) -> int:
+        """The number of PATCH requests needed to send the changes"""
+        return len(self._changes)
+
+    def __iter__(self) -> Iterator[Tuple[str, dict]]:
+        return iter(self._changes.items())
+
+
+def difference(desired: dict, current: dict) -> dict:
+    """The part of desired that differs from current, as a PATCH body. Nested
+    objects are compared key by key and only the keys of desired count, while
+    lists are replaced as a whole when any of their items differs."""
+    changes = {}
+    for key, value in desired.items():
+        if isinstance(value, dict) and isinstance(current.get(key), dict):
+            nested = difference(value, current[key])
+            if nested:
+                changes[key] = nested
+        elif key not in current or _differs(value, current[key]):
+            changes[key] = copy.deepcopy(value)
+    return changes
+
+
+def _differs(desired: Any, current: Any) -> bool:
+    if isinstance(desired, dict):
+        return not isinstance(current, dict) or bool(difference(desired, current))
+    if isinstance(desired, list):
+        return (
+            not isinstance(current, list)
+            or len(desired) != len(current)
+            or any(_differs(item, other) for item, other in zip(desired, current))
+        )
+    return desired != current
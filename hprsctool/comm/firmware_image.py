@@ -0,0 +1,160 @@
+"""Firmware images shared by concurrent uploads to many RSCs"""
+
+import contextlib
+import mmap
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict, Iterator
+import weakref
+
+# Simultaneous firmware uploads to the same RSC, which applies one at a time
+DEFAULT_MAX_UPLOADS_PER_RSC = 1
+
+
+class BandwidthLimiter:
+    """Paces reads so that, together, they do not exceed a number of bytes
+    per second. One limiter is shared by all the uploads of the process."""
+
+    def __init__(self, bytes_per_second: float):
+        if bytes_per_second <= 0:
+            raise ValueError("The bandwidth limit must be positive")
+        self.bytes_per_second = bytes_per_second
+        self._next_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, count: int):
+        """Wait until count more bytes can be sent"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + count / self.bytes_per_second
+        if start > now:
+            time.sleep(start - now)
+
+
+class UploadLimits:
+    """Limits shared by all the firmware uploads of the process: the number
+    of simultaneous uploads, overall and to each RSC, and their bandwidth"""
+
+    def __init__(
+        self,
+        max_uploads: int | None = None,
+        max_bandwidth: float | None = None,
+        max_uploads_per_rsc: int | None = DEFAULT_MAX_UPLOADS_PER_RSC,
+    ):
+        if max_uploads is not None and max_uploads < 1:
+            raise ValueError("The number of simultaneous uploads must be at least 1")
+        if max_uploads_per_rsc is not None and max_uploads_per_rsc < 1:
+            raise ValueError("The number of simultaneous uploads to an RSC must be at least 1")
+        self.max_uploads = max_uploads
+        self.max_uploads_per_rsc = max_uploads_per_rsc
+        self._slots = threading.BoundedSemaphore(max_uploads) if max_uploads else None
+        self._rsc_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._rsc_slots_lock = threading.Lock()
+        self.limiter = BandwidthLimiter(max_bandwidth) if max_bandwidth else None
+
+    def _rsc_slot(self, address: str | None) -> threading.BoundedSemaphore | None:
+        if address is None or not self.max_uploads_per_rsc:
+            return None
+        with self._rsc_slots_lock:
+            return self._rsc_slots.setdefault(
+                address, threading.BoundedSemaphore(self.max_uploads_per_rsc)
+            )
+
+    @contextlib.contextmanager
+    def upload_slot(self, address: str | None = None) -> Iterator[None]:
+        """Wait until fewer than max_uploads uploads are running, and fewer
+        than max_uploads_per_rsc to the RSC at address"""
+        with contextlib.ExitStack() as stack:
+            rsc_slot = self._rsc_slot(address)
+            if rsc_slot is not None:
+                stack.enter_context(rsc_slot)
+            if self._slots is not None:
+                stack.enter_context(self._slots)
+            yield
+
+
+upload_limits = UploadLimits()
+
+
+def set_upload_limits(
+    max_uploads: int | None = None,
+    max_bandwidth: float | None = None,
+    max_uploads_per_rsc: int | None = DEFAULT_MAX_UPLOADS_PER_RSC,
+):
+    """Limit the number of simultaneous uploads, overall and to each RSC,
+    and their total bandwidth, in bytes per second"""
+    global upload_limits  # pylint: disable=global-statement
+    upload_limits = UploadLimits(max_uploads, max_bandwidth, max_uploads_per_rsc)
+
+
+class ImageReader:
+    """Read-only file object over a FirmwareImage. read() returns slices of
+    the memory mapping instead of copies of the file."""
+
+    def __init__(self, image: "FirmwareImage", limiter: BandwidthLimiter | None = None):
+        self.image = image
+        self.name = image.name
+        self.limiter = limiter
+        self._position = 0
+
+    @property
+    def len(self) -> int:
+        """Number of bytes left to read"""
+        return self.image.size - self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def read(self, size: int = -1) -> memoryview:
+        end = self.image.size
+        if size is not None and size >= 0:
+            end = min(self._position + size, end)
+        chunk = self.image.view[self._position:end]
+        self._position = end
+        if self.limiter is not None and len(chunk):
+            self.limiter.consume(len(chunk))
+        return chunk
+
+
+class FirmwareImage:
+    """Firmware file mapped in memory once and read by any number of uploads.
+
+    Every upload reads the same pages, so memory use and page-cache traffic do
+    not grow with the number of RSCs updated at the same time."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.name = self.path.name
+        with open(self.path, "rb") as firmware:
+            self.size = os.fstat(firmware.fileno()).st_size
+            if self.size == 0:
+                raise ValueError(f"Firmware file {path} is empty")
+            self._mmap = mmap.mmap(firmware.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self._mmap)
+
+    def open(self, limiter: BandwidthLimiter | None = None) -> ImageReader:
+        """Get a new reader positioned at the start of the image"""
+        return ImageReader(self, limiter)
+
+
+_shared_images: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_shared_images_lock = threading.Lock()
+
+
+def get_shared_image(path: str | Path) -> FirmwareImage:
+    """Get the image of a firmware file, mapping it only once for all the
+    uploads running at the same time. A file changed on disk is mapped again."""
+    try:
+        stat = os.stat(path)
+    except OSError as exc:
+        raise ValueError(f"Firmware file {path} not found") from exc
+    key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    with _shared_images_lock:
+        image = _shared_images.get(key)
+        if image is None:
+            image = FirmwareImage(path)
+            _shared_images[key] = image
+        return image
@@ -0,0 +1,116 @@
+"""Pre-flight information about firmware images: hash and target version"""
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import threading
+from typing import Tuple
+
+from .firmware_image import get_shared_image
+
+DEFAULT_CACHE_FILE = Path.home() / ".hprsctool" / "firmware.json"
+
+version_regex = re.compile(r"\d+(?:\.\d+)+")
+
+
+@dataclass
+class FirmwareInfo:
+    """Hash and version of a firmware image"""
+
+    path: str
+    sha256: str
+    version: str | None
+
+
+def version_from_filename(path: str | Path) -> str | None:
+    """Get the version from a file name such as rsc_fw_1.2.3.xz"""
+    matches = version_regex.findall(Path(path).name)
+    return matches[-1] if matches else None
+
+
+def normalize_version(version: str | None) -> Tuple[int, ...] | None:
+    """Get the numeric parts of a version, ignoring trailing zero parts, so
+    that "1.2" and "v1.2.0" compare equal"""
+    match = version_regex.search(version or "")
+    if not match:
+        return None
+    parts = [int(part) for part in match.group(0).split(".")]
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def versions_match(installed: str | None, target: str | None) -> bool:
+    """Check if an installed firmware version is the target version"""
+    installed_parts = normalize_version(installed)
+    return installed_parts is not None and installed_parts == normalize_version(target)
+
+
+class FirmwareInfoCache:
+    """Remembers the hash of firmware files by path, size and modification
+    time, and the version of each hash, so images are only hashed once."""
+
+    def __init__(self, cache_file: str | Path = DEFAULT_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        self._lock = threading.Lock()
+
+    def get_info(self, path: str | Path, target_version: str | None = None) -> FirmwareInfo:
+        """Get the hash and version of an image. The version is target_version
+        if given, else the one recorded for the same hash, else the one in the
+        file name."""
+        try:
+            stat = os.stat(path)
+        except OSError as exc:
+            raise ValueError(f"Firmware file {path} not found") from exc
+        file_key = os.path.realpath(path)
+        with self._lock:
+            data = self._load()
+            entry = data["files"].get(file_key)
+            if entry and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                sha256 = entry["sha256"]
+            else:
+                sha256 = hashlib.sha256(get_shared_image(path).view).hexdigest()
+                data["files"][file_key] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": sha256,
+                }
+            if target_version:
+                data["versions"][sha256] = target_version
+            version = data["versions"].get(sha256) or version_from_filename(path)
+            self._save(data)
+        return FirmwareInfo(path=str(path), sha256=sha256, version=version)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            if isinstance(data.get("files"), dict) and isinstance(data.get("versions"), dict):
+                return data
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"files": {}, "versions": {}}
+
+    def _save(self, data: dict):
+        """Write the cache. Failing to write it only means hashing again."""
+        tmp_file = self.cache_file.with_name(
+            f"{self.cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            self.cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            tmp_file.unlink(missing_ok=True)
+
+
+_default_cache = FirmwareInfoCache()
+
+
+def get_firmware_info(path: str | Path, target_version: str | None = None) -> FirmwareInfo:
+    """Get the hash and version of an image through the default cache"""
+    return _default_cache.get_info(path, target_version)
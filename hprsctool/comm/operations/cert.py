@@ -13,18 +13,21 @@ def get_certificate(rsc: Rsc) -> certificate.Certificate:
 
 def replace_certificate(rsc: Rsc, cert_file_path: str, key_file_path: str):
     """Upload a certificate"""
+    rsc.perform_redfish_post(
+        "/redfish/v1/CertificateService/Actions/CertificateService.ReplaceCertificate",
+        get_replace_certificate_body(cert_file_path, key_file_path),
+    )
+
+def get_replace_certificate_body(cert_file_path: str, key_file_path: str) -> dict:
+    """Build the ReplaceCertificate action body from the certificate and key files"""
     with open(cert_file_path, "r", encoding="utf-8") as cert_file:
         cert_data = cert_file.read()
     with open(key_file_path, "r", encoding="utf-8") as key_file:
         key_data = key_file.read()
-    body = {
+    return {
         "CertificateUri": {
             "@odata.id": "/redfish/v1/Managers/1/NetworkProtocol/HTTPS/Certificates/1"
         },
         "CertificateString": cert_data + key_data,
         "CertificateType": "PEM",
     }
-    rsc.perform_redfish_post(
-        "/redfish/v1/CertificateService/Actions/CertificateService.ReplaceCertificate",
-        body,
-    )
@@ -1,18 +1,29 @@
 """Manager commands"""
 
 from pathlib import Path
+import time
 
-import requests
+import redfish.rest.v1 as redfish_rest_v1
 from redfish.rest.v1 import RestResponse as RedfishRestResponse
 
 from ...comm.remote_system_controller import RedfishError, Rsc
-from ...comm import redfish_messages
+from ...comm import firmware_image, redfish_messages
+from ...comm.firmware_info import versions_match
+from ...comm.trace import trace_phase
+from ...comm.upload import ProgressPrinter, post_multipart
 from ...models.manager import Manager
 
+# How long to wait for an RSC to come back after losing the session during an
+# update, and how often to check, in seconds
+RECOVERY_TIMEOUT = 30 * 60
+RECOVERY_INTERVAL = 10
+
+MANAGER_URI = "/redfish/v1/Managers/1"
+
 
 def get_manager(rsc: Rsc) -> Manager:
     """Get the RSC manager information"""
-    return Manager(rsc.perform_redfish_get("/redfish/v1/Managers/1").dict)
+    return Manager(rsc.perform_redfish_get(MANAGER_URI).dict)
 
 
 def change_admin_password(rsc: Rsc, new_password: str):
@@ -37,33 +48,165 @@ def factory_reset(rsc: Rsc):
     )
 
 
-def update_rsc_firmware(rsc: Rsc, fw_file_path: str) -> RedfishRestResponse:
-    """Update the RSC firmware"""
+def is_firmware_current(rsc: Rsc, target_version: str) -> bool:
+    """Check if the RSC already runs the target firmware version"""
+    return versions_match(get_manager(rsc).firmware_version, target_version)
+
+
+def update_rsc_firmware(
+    rsc: Rsc, fw_file_path: str, target_version: str | None = None
+) -> RedfishRestResponse:
+    """Update the RSC firmware. Concurrent updates with the same file share
+    one memory-mapped image and the limits set with set_upload_limits().
+
+    If the session is lost while the update runs, the update is followed
+    again after logging in with the same configuration. target_version, or
+    without it a change of the version read before the upload, confirms the
+    result when the task is gone after the RSC restarts."""
 
     if not Path(fw_file_path).exists():
         raise ValueError(f"Firmware file {fw_file_path} not found")
 
+    previous_version = None
+    if target_version is None:
+        previous_version = get_manager(rsc).firmware_version
+
+    image = firmware_image.get_shared_image(fw_file_path)
+    limits = firmware_image.upload_limits
     response = RedfishRestResponse(None, None)
-    with open(fw_file_path, "rb") as firmware:
+    with limits.upload_slot(rsc.address):
         print("Sending file...", flush=True)
-        files = {"UpdateFile": firmware}
+        files = {"UpdateFile": (image.name, image.open(limits.limiter))}
         headers = {"X-Auth-Token": rsc.client.get_session_key()}
         # Using the self.client.post method directly fails to upload the
         # firmware in very old RSC versions. The following code is a workaround
-        # to upload the firmware file using requests.
-        resp = requests.post(
-            f"https://{rsc.address.split('//')[1]}/redfish/v1/UpdateService/MultipartUpdate",
-            files=files,
-            headers=headers,
-            verify=False,
-            timeout=3600,
-        )
+        # to upload the firmware file using requests. The body is streamed
+        # from the image instead of being built in memory.
+        with trace_phase(rsc.trace, "upload", rsc.address):
+            resp = post_multipart(
+                f"https://{rsc.address.split('//')[1]}/redfish/v1/UpdateService/MultipartUpdate",
+                files,
+                headers=headers,
+                callback=ProgressPrinter(),
+                verify=False,
+                timeout=rsc.upload_timeouts,
+            )
         resp.raise_for_status()
         # Create a redfish lib RedfishRestResponse object to monitor the task
         response = RedfishRestResponse(None, resp)
 
     print("File sent, monitoring update:", flush=True)
     monitor_response = rsc.monitor_task(response)
+    if monitor_response.status == 401:
+        print("The user session was lost, logging in again...", flush=True)
+        monitor_response = reattach_task_monitor(rsc, response.task_location)
+        if monitor_response is None:
+            print("The update task is gone, waiting for the RSC to restart...", flush=True)
+            wait_for_firmware_version(rsc, target_version, previous_version)
+            return
+    check_firmware_update_result(monitor_response)
+
+
+def _login_again(rsc: Rsc) -> bool:
+    """Log out of the lost session and log in with the configuration of the
+    Rsc. Returns False if the RSC cannot be reached or does not accept the
+    login yet."""
+    try:
+        rsc.logout()
+    except Exception:  # pylint: disable=broad-exception-caught
+        # The RSC usually forgot the session already
+        pass
+    try:
+        rsc.login()
+    except RedfishError:
+        return False
+    return True
+
+
+def reattach_task_monitor(
+    rsc: Rsc,
+    task_location: str | None,
+    timeout: float = RECOVERY_TIMEOUT,
+    interval: float = RECOVERY_INTERVAL,
+) -> RedfishRestResponse | None:
+    """Log in again and follow a task monitor until the task is done.
+
+    Returns the final response of the task monitor, or None if the RSC no
+    longer knows the task, e.g. because it restarted to apply the update.
+    The session is only replaced when the RSC rejects it."""
+    if not task_location:
+        return None
+    deadline = time.monotonic() + timeout
+    logged_in = False
+    while True:
+        if not logged_in:
+            logged_in = _login_again(rsc)
+        if logged_in:
+            try:
+                response = rsc.client.get(task_location)
+            except redfish_rest_v1.RetriesExhaustedError:
+                response = None
+            if response is not None and response.status == 404:
+                return None
+            if response is not None and response.status != 401:
+                if response.is_processing:
+                    response = rsc.monitor_task(response)
+                if response.status != 401:
+                    return response
+            logged_in = response is None
+        if time.monotonic() + interval > deadline:
+            raise RedfishError(
+                "The update might have succeeded, but the user session was lost and "
+                "logging in again failed.\n"
+                "Please use 'manager get' to confirm the version of the firmware."
+            )
+        time.sleep(interval)
+
+
+def wait_for_firmware_version(
+    rsc: Rsc,
+    target_version: str | None,
+    previous_version: str | None = None,
+    timeout: float = RECOVERY_TIMEOUT,
+    interval: float = RECOVERY_INTERVAL,
+):
+    """Wait until the RSC is back and runs target_version or, if the target is
+    unknown, a version other than previous_version. Raises a RedfishError if
+    that does not happen before timeout, or if neither version is known and
+    the update cannot be confirmed. The session is only replaced when the RSC
+    rejects it."""
+    deadline = time.monotonic() + timeout
+    version = None
+    logged_in = False
+    while True:
+        if not logged_in:
+            logged_in = _login_again(rsc)
+        if logged_in:
+            try:
+                response = rsc.client.get(MANAGER_URI)
+            except redfish_rest_v1.RetriesExhaustedError:
+                response = None
+            if response is not None and response.status == 200:
+                version = Manager(response.dict).firmware_version
+                if target_version is None and previous_version is None:
+                    raise RedfishError(
+                        f"The RSC is back with version {version}, but the update could not "
+                        "be confirmed as the previous version is unknown"
+                    )
+                if target_version is not None and versions_match(version, target_version):
+                    return
+                if target_version is None and version != previous_version:
+                    return
+            logged_in = response is None or response.status != 401
+        if time.monotonic() + interval > deadline:
+            if version is None:
+                raise RedfishError("Failed to update firmware: the RSC did not come back")
+            raise RedfishError(f"Failed to update firmware: the RSC runs version {version}")
+        time.sleep(interval)
+
+
+def check_firmware_update_result(monitor_response):
+    """Raise a RedfishError if the firmware update task did not succeed"""
     if monitor_response.status < 200 or monitor_response.status >= 300:
         if monitor_response.status == 401:
             raise RedfishError(
@@ -78,4 +221,4 @@ def update_rsc_firmware(rsc: Rsc, fw_file_path: str) -> RedfishRestResponse:
 
 def update_manager(rsc: Rsc, body: dict) -> RedfishRestResponse:
     """Update the RSC manager information"""
-    return rsc.perform_redfish_patch("/redfish/v1/Managers/1", body)
+    return rsc.perform_redfish_patch(MANAGER_URI, body)
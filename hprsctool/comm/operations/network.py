@@ -1,32 +1,65 @@
 """network related commands"""
 
+from typing import Callable, List, Tuple
+
 from redfish.rest.v1 import RestResponse as RedfishRestResponse
 
 from ...models import ethernet_interface
 from ...models.manager_network_protocol import ManagerNetworkProtocol
+from ...comm.change_set import ChangeSet
 from ...comm.remote_system_controller import Rsc
 
+ETHERNET_INTERFACE_URI = "/redfish/v1/Managers/1/EthernetInterfaces/eth0"
+NETWORK_PROTOCOL_URI = "/redfish/v1/Managers/1/NetworkProtocol"
+
+
 def get_manager_ethernet_interface(rsc: Rsc) -> ethernet_interface.EthernetInterface:
     """Get the RSC ethernet interface information"""
     return ethernet_interface.EthernetInterface(
-        rsc.perform_redfish_get("/redfish/v1/Managers/1/EthernetInterfaces/eth0").dict
+        rsc.perform_redfish_get(ETHERNET_INTERFACE_URI).dict
     )
 
 
 def set_manager_ethernet_interface(rsc: Rsc, data: dict) -> RedfishRestResponse:
     """Set the RSC ethernet interface information"""
-    return rsc.perform_redfish_patch(
-        "/redfish/v1/Managers/1/EthernetInterfaces/eth0", data
-    )
+    return rsc.perform_redfish_patch(ETHERNET_INTERFACE_URI, data)
 
 
 def get_manager_network_protocol(rsc: Rsc) -> ManagerNetworkProtocol:
     """Get the RSC network protocol information"""
     return ManagerNetworkProtocol(
-        rsc.perform_redfish_get("/redfish/v1/Managers/1/NetworkProtocol").dict
+        rsc.perform_redfish_get(NETWORK_PROTOCOL_URI).dict
     )
 
 
 def set_manager_network_protocol(rsc: Rsc, data: dict) -> RedfishRestResponse:
     """Set the RSC network protocol information"""
-    return rsc.perform_redfish_patch("/redfish/v1/Managers/1/NetworkProtocol", data)
+    return rsc.perform_redfish_patch(NETWORK_PROTOCOL_URI, data)
+
+
+def send_changes(
+    rsc: Rsc,
+    change_set: ChangeSet,
+    on_response: Callable[[str, RedfishRestResponse], None] | None = None,
+) -> List[Tuple[str, RedfishRestResponse]]:
+    """Send the changes to the network protocol and to the Ethernet interface,
+    with one PATCH per resource. The Ethernet interface is patched last, as
+    its changes may move the RSC to another address. on_response is called
+    with the URL and response of each PATCH before the next one is sent, e.g.
+    to wait for the RSC to apply it."""
+    setters = {
+        NETWORK_PROTOCOL_URI: set_manager_network_protocol,
+        ETHERNET_INTERFACE_URI: set_manager_ethernet_interface,
+    }
+    unknown = [url for url, _ in change_set if url not in setters]
+    if unknown:
+        raise ValueError(f"Cannot send changes to {', '.join(unknown)}")
+    responses = []
+    for url, setter in setters.items():
+        if url not in change_set:
+            continue
+        response = setter(rsc, change_set.get(url))
+        if on_response is not None:
+            on_response(url, response)
+        responses.append((url, response))
+    return responses
@@ -6,9 +6,12 @@ from redfish.rest.v1 import RestResponse as RedfishRestResponse
 from ...models.system import System
 from ..remote_system_controller import Rsc
 
+SYSTEM_URI = "/redfish/v1/Systems/1"
+
+
 def get_system(rsc: Rsc) -> System:
     """Get the system information"""
-    return System(rsc.perform_redfish_get("/redfish/v1/Systems/1").dict)
+    return System(rsc.perform_redfish_get(SYSTEM_URI).dict)
 
 
 def set_system_power(rsc: Rsc, state: str) -> RedfishRestResponse:
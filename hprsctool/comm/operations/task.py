@@ -1,11 +1,53 @@
 """Task Commands"""
 
+from typing import List
+from urllib.parse import quote
+
 from ...models.task import Task, TaskCollection
-from ..remote_system_controller import Rsc
+from ..remote_system_controller import DEFAULT_CONCURRENT_REQUESTS, Rsc
+
+RUNNING_TASKS_FILTER = "TaskState eq 'Running'"
+
 
-def get_task_collection(rsc: Rsc) -> TaskCollection:
-    """Get the task collection information"""
-    return TaskCollection(rsc.perform_redfish_get("/redfish/v1/TaskService/Tasks").dict)
+def get_task_collection(
+    rsc: Rsc, expand: bool = False, running_only: bool = False
+) -> TaskCollection:
+    """Get the task collection information. With expand, the members are full
+    tasks. With running_only, the RSC is asked to only return running tasks."""
+    query = []
+    if expand:
+        query.append("$expand=.")
+    if running_only:
+        running_filter = quote(RUNNING_TASKS_FILTER, safe="'")
+        query.append(f"$filter={running_filter}")
+    url = "/redfish/v1/TaskService/Tasks"
+    if query:
+        url += "?" + "&".join(query)
+    return TaskCollection(rsc.perform_redfish_get(url).dict)
+
+
+def get_tasks(
+    rsc: Rsc, running_only: bool = False, max_workers: int = DEFAULT_CONCURRENT_REQUESTS
+) -> List[Task]:
+    """Get all the tasks, in collection order, with as few round trips as the
+    RSC allows. Uses $expand and $filter when the service root advertises them,
+    and otherwise fetches the members concurrently."""
+    collection = get_task_collection(
+        rsc,
+        expand=rsc.supports_query("ExpandQuery", "NoLinks"),
+        running_only=running_only and rsc.supports_query("FilterQuery"),
+    )
+    if collection.expanded:
+        tasks = collection.tasks
+    else:
+        tasks = [
+            Task(response.dict)
+            for response in rsc.perform_redfish_get_many(collection.members, max_workers)
+        ]
+    if running_only:
+        # Also covers services that accept $filter but ignore it
+        tasks = [task for task in tasks if task.task_state == "Running"]
+    return tasks
 
 
 def get_task(rsc: Rsc, task_id: str) -> Task:
@@ -1,13 +1,23 @@
 """RSC certificate commands"""
 
-from typing import List
+from typing import Dict, List
 from pathlib import Path
 from ...models import certificate
 from ...comm.remote_system_controller import Rsc
 
+TRUSTED_CERTIFICATES_URI = "/redfish/v1/Managers/1/TrustedCertificates"
+
 
 def add_trusted_certificate(rsc: Rsc, cert_file_path: str):
     """Add a trusted certificate"""
+    rsc.perform_redfish_post(
+        TRUSTED_CERTIFICATES_URI,
+        get_add_trusted_certificate_body(cert_file_path),
+    )
+
+
+def get_add_trusted_certificate_body(cert_file_path: str) -> dict:
+    """Build the body that adds a trusted certificate from a PEM file"""
     if not cert_file_path or cert_file_path == "":
         raise ValueError("No certificate file provided.")
 
@@ -17,15 +27,27 @@ def add_trusted_certificate(rsc: Rsc, cert_file_path: str):
 
     with open(cert_path, "r", encoding="utf-8") as cert_file:
         cert_data = cert_file.read()
-    body = {"CertificateString": cert_data, "CertificateType": "PEM"}
-    rsc.perform_redfish_post("/redfish/v1/Managers/1/TrustedCertificates", body)
+    return {"CertificateString": cert_data, "CertificateType": "PEM"}
+
+
+def get_certificate_file_fingerprint(cert_file_path: str) -> str:
+    """Get the normalized SHA-256 fingerprint of a PEM certificate file"""
+    fingerprint = certificate.get_pem_fingerprint(
+        get_add_trusted_certificate_body(cert_file_path)["CertificateString"]
+    )
+    if fingerprint is None:
+        raise ValueError(f"Not a PEM certificate: {cert_file_path}")
+    return fingerprint
 
 
 def get_trusted_certificates(rsc: Rsc) -> List[certificate.Certificate]:
-    """Get the trusted certificates"""
-    response = rsc.perform_redfish_get(
-        "/redfish/v1/CertificateService/CertificateLocations"
-    ).dict
+    """Get the trusted certificates, in the order the RSC lists them.
+
+    The certificates are expanded in the CertificateLocations response when the
+    RSC supports it, and fetched concurrently otherwise."""
+    expand = rsc.supports_query("ExpandQuery", "Links")
+    url = "/redfish/v1/CertificateService/CertificateLocations"
+    response = rsc.perform_redfish_get(f"{url}?$expand=~" if expand else url).dict
 
     result = []
 
@@ -34,14 +56,28 @@ def get_trusted_certificates(rsc: Rsc) -> List[certificate.Certificate]:
     if "Certificates" not in response["Links"]:
         return result
 
-    for cert in response["Links"]["Certificates"]:
-        if "TrustedCertificates" in cert["@odata.id"]:
-            result.append(
-                certificate.Certificate(rsc.perform_redfish_get(cert["@odata.id"]).dict)
-            )
-    return result
+    trusted = [
+        cert
+        for cert in response["Links"]["Certificates"]
+        if "TrustedCertificates" in cert["@odata.id"]
+    ]
+    if all("Id" in cert for cert in trusted):
+        return [certificate.Certificate(cert) for cert in trusted]
+
+    responses = rsc.perform_redfish_get_many([cert["@odata.id"] for cert in trusted])
+    return [certificate.Certificate(cert_response.dict) for cert_response in responses]
+
+
+def get_trusted_certificates_by_fingerprint(rsc: Rsc) -> Dict[str, certificate.Certificate]:
+    """Get the trusted certificates indexed by their normalized fingerprint.
+    Certificates without a fingerprint (older RSC firmware) are left out."""
+    return {
+        cert.normalized_fingerprint: cert
+        for cert in get_trusted_certificates(rsc)
+        if cert.normalized_fingerprint
+    }
 
 
 def delete_trusted_certificate(rsc: Rsc, cert_id: str):
     """Delete a trusted certificate"""
-    rsc.perform_redfish_delete(f"/redfish/v1/Managers/1/TrustedCertificates/{cert_id}")
+    rsc.perform_redfish_delete(f"{TRUSTED_CERTIFICATES_URI}/{cert_id}")
@@ -1,5 +1,9 @@
 """Module for working with redfish messages"""
+import json
+import os
+from pathlib import Path
 import re
+import threading
 from typing import List
 
 import requests
@@ -7,6 +11,19 @@ import requests
 
 cached_registries = {}
 
+# Registries shipped with the package, named <Registry>.<major>.<minor>.<errata>.json
+PACKAGED_REGISTRIES_DIR = Path(__file__).resolve().parent.parent / "registries"
+# Registries downloaded from RSCs. They are keyed by their full version only, so
+# the cache is shared by all RSCs.
+DEFAULT_REGISTRY_CACHE_DIR = Path.home() / ".hprsctool" / "registries"
+registry_cache_dir: Path | None = DEFAULT_REGISTRY_CACHE_DIR
+
+# Guards cached_registries and _registry_locks. Each registry has its own
+# lock, held while it is read or downloaded, so that a slow RSC only delays
+# the threads waiting for the same registry.
+_registries_lock = threading.Lock()
+_registry_locks: dict[str, threading.Lock] = {}
+
 message_id_regex = re.compile(r"(?P<registry>\w+\.\d+\.\d+\.\d+)\.(?P<message_id>\w+)")
 
 
@@ -19,16 +36,7 @@ def get_redfish_message(address: str, message_id: str, message_args: list[str] |
     registry = match.group("registry")
     message_id = match.group("message_id")
 
-    if registry not in cached_registries:
-        response = requests.get(
-            f"https://{address.split('//')[1]}/registries/en/{registry}.json",
-            verify=False,
-            timeout=5,
-        )
-        response.raise_for_status()
-        cached_registries[registry] = response.json()
-
-    registry_data = cached_registries[registry]
+    registry_data = get_registry(address, registry)
 
     if message_id in registry_data["Messages"]:
         base_messsage = registry_data["Messages"][message_id]["Message"]
@@ -39,6 +47,76 @@ def get_redfish_message(address: str, message_id: str, message_args: list[str] |
 
     raise ValueError(f"Message ID {message_id} not found in registry {registry}")
 
+
+def get_registry(address: str, registry: str) -> dict:
+    """Get a message registry by its full versioned name, e.g. HPBlinkCode.1.1.0.
+
+    The registry is looked up in memory, then in the registries shipped with the
+    package, then in the on-disk cache, and only downloaded from the RSC if it
+    is in none of them. Downloaded registries are added to the on-disk cache."""
+    with _registries_lock:
+        if registry in cached_registries:
+            return cached_registries[registry]
+        registry_lock = _registry_locks.setdefault(registry, threading.Lock())
+
+    with registry_lock:
+        with _registries_lock:
+            if registry in cached_registries:
+                # Loaded by another thread in the meantime
+                return cached_registries[registry]
+
+        for directory in (PACKAGED_REGISTRIES_DIR, registry_cache_dir):
+            registry_data = _read_registry_file(directory, registry)
+            if registry_data is not None:
+                break
+        else:
+            response = requests.get(
+                f"https://{address.split('//')[1]}/registries/en/{registry}.json",
+                verify=False,
+                timeout=5,
+            )
+            response.raise_for_status()
+            registry_data = response.json()
+            _write_registry_file(registry_cache_dir, registry, registry_data)
+
+        with _registries_lock:
+            cached_registries[registry] = registry_data
+        return registry_data
+
+
+def _is_registry(registry: str, registry_data) -> bool:
+    return (
+        isinstance(registry_data, dict)
+        and isinstance(registry_data.get("Messages"), dict)
+        and registry_data.get("Id", registry) == registry
+    )
+
+
+def _read_registry_file(directory: Path | None, registry: str) -> dict | None:
+    if directory is None:
+        return None
+    try:
+        with open(Path(directory) / f"{registry}.json", "r", encoding="utf-8") as registry_file:
+            registry_data = json.load(registry_file)
+    except (OSError, ValueError):
+        return None
+    return registry_data if _is_registry(registry, registry_data) else None
+
+
+def _write_registry_file(directory: Path | None, registry: str, registry_data: dict):
+    """Add a registry to the on-disk cache. Failing to write it is not an error."""
+    if directory is None or not _is_registry(registry, registry_data):
+        return
+    directory = Path(directory)
+    tmp_file = directory / f"{registry}.json.{os.getpid()}.tmp"
+    try:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with open(tmp_file, "w", encoding="utf-8") as registry_file:
+            json.dump(registry_data, registry_file)
+        os.replace(tmp_file, directory / f"{registry}.json")
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+
 def get_error_message(resp_json: dict) -> str | None:
     """Get the error message from a response"""
 
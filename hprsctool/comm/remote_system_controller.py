@@ -1,15 +1,40 @@
 """Module defining the RSC class and refish operations"""
 
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 from dataclasses import dataclass
+from functools import partial
 import json
 import time
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
 import redfish
 import redfish.rest.v1 as redfish_rest_v1
 from redfish.rest.v1 import RestResponse as RedfishRestResponse
+import requests
 from . import redfish_messages
+from .response_cache import ResponseCache, get_etag
+from .retry import (
+    TRANSIENT_STATUSES,
+    RetryPolicy,
+    can_retry_error,
+    can_retry_status,
+    get_circuit_breaker,
+    get_retry_after,
+)
+from .task_events import TaskEventListener
+from .trace import AttemptCounter, TraceEvent, TraceHook, trace_phase
+from .upload import UploadProgress, post_multipart
 
+# Maximum number of requests sent at the same time to a single RSC
+DEFAULT_CONCURRENT_REQUESTS = 8
+# Polling intervals of task monitors that do not send Retry-After, in seconds.
+# Polls start fast and slow down while the task makes no progress.
+MIN_POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 5
+# How long an upload may wait for the RSC to answer, in seconds. The RSC may
+# check a whole firmware image before it answers.
+UPLOAD_READ_TIMEOUT = 3600
 
 # pylint: disable=too-many-instance-attributes
 @dataclass
@@ -48,6 +73,14 @@ def check_response_for_error(response) -> str | None:
     return None
 
 
+def json_size(data: Any) -> int:
+    """Get the size of a JSON request body, for tracing"""
+    try:
+        return len(json.dumps(data))
+    except (TypeError, ValueError):
+        return 0
+
+
 class RedfishError(Exception):
     """Class defining a Redfish error"""
 
@@ -55,59 +88,398 @@ class RedfishError(Exception):
         super().__init__(message)
 
 
+class PreconditionFailedError(RedfishError):
+    """A conditional write was refused because the resource changed since it was read"""
+
+
+class SessionRejectedError(RedfishError):
+    """A request was refused because the RSC no longer accepts the session"""
+
+
+class CircuitOpenError(RedfishError):
+    """A request was not sent because the RSC is down"""
+
+
 class Rsc:
     """Class defining an RSC"""
 
-    def __init__(self, config: RedfishConfig):
+    def __init__(
+        self,
+        config: RedfishConfig,
+        check_connectivity: bool = True,
+        response_cache: ResponseCache | None = None,
+        trace: TraceHook | None = None,
+        conditional_writes: bool = False,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        """Create the client. When check_connectivity is False, the service
+        root is only fetched when it is first needed. With a response_cache,
+        GETs are conditional and unchanged resources are served from it.
+        trace is called with a TraceEvent for every request, for the
+        connection, the login and the monitoring of tasks. With
+        conditional_writes, PATCHes are sent with If-Match and the ETag of
+        the last read of the resource. Requests are retried as retry_policy
+        allows, by default following the timeout and max_retry of config, and
+        fail fast while the circuit breaker of the RSC is open."""
         self.config = config
+        self.response_cache = response_cache
+        self.trace = trace
+        self.conditional_writes = conditional_writes
+        # ETag of the last version of each resource read or changed
+        self._etags: Dict[str, str] = {}
+        self._reading_for_update = False
+        self.address = config.base_url
+        self.retry_policy = retry_policy or RetryPolicy.from_config(config)
+        self.breaker = get_circuit_breaker(self.address)
+        # TaskMonitorScheduler shared with other RSCs that monitors the tasks
+        # of this one, in fleet mode
+        self.task_scheduler = None
+        self._attempts = None
+        # Responses, or errors, of prefetched GETs by URL
+        self._prefetched: Dict[str, RedfishRestResponse | Exception] = {}
+        client_args = config.__dict__()
+        if not check_connectivity:
+            client_args["check_connectivity"] = False
+        if trace is not None:
+            self._attempts = AttemptCounter()
+            client_args["https_adapter"] = self._attempts
+        if check_connectivity:
+            self._check_circuit()
         try:
-            self.client = redfish.redfish_client(**config.__dict__())
+            with trace_phase(trace, "connect", self.address):
+                self.client = redfish.redfish_client(**client_args)
         except redfish.rest.v1.InvalidCredentialsError as exc:
+            # The RSC answered
+            self.breaker.record_success()
             raise RedfishError("Invalid credentials") from exc
         except redfish.rest.v1.RetriesExhaustedError as exc:
+            self.breaker.record_failure()
             raise RedfishError("Failed to connect to the RSC") from exc
-        self.address = config.base_url
+        except Exception:
+            self.breaker.release_trial()
+            raise
+        if check_connectivity:
+            self.breaker.record_success()
+
+    def _check_circuit(self):
+        """Raise a CircuitOpenError if requests to the RSC must fail fast"""
+        wait = self.breaker.allow()
+        if wait is not None:
+            raise CircuitOpenError(
+                f"The RSC is not responding, no request is sent to it for {wait:.0f} seconds"
+            )
+
+    def _send(
+        self, method: str, send: Callable[..., RedfishRestResponse], attempts: int | None = None
+    ) -> RedfishRestResponse:
+        """Send a request with send(timeout=..., max_retry=...), retrying it
+        as the retry policy allows, or at most attempts times. Requests that
+        may have been processed are only sent again if their method is
+        idempotent."""
+        policy = self.retry_policy
+        attempts = attempts or policy.attempts
+        deadline = time.monotonic() + policy.total_timeout
+        attempt = 0
+        while True:
+            attempt += 1
+            self._check_circuit()
+            response = error = None
+            try:
+                response = send(timeout=policy.timeouts(deadline - time.monotonic()), max_retry=0)
+            except redfish_rest_v1.RetriesExhaustedError as exc:
+                error = exc.__cause__ or exc
+            except Exception:
+                self.breaker.release_trial()
+                raise
+            if response is None or response.status in TRANSIENT_STATUSES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            retry_after = None
+            if response is not None:
+                retry = can_retry_status(method, response.status)
+                retry_after = get_retry_after(response) if retry else None
+            else:
+                retry = can_retry_error(method, error)
+            if not retry or attempt >= attempts:
+                break
+            delay = policy.delay(attempt, retry_after)
+            if time.monotonic() + delay >= deadline:
+                break
+            time.sleep(delay)
+
+        if response is None:
+            raise RedfishError("Failed to connect to the RSC") from error
+        return response
+
+    def _traced(
+        self,
+        method: str,
+        url: str,
+        send: Callable[[], RedfishRestResponse],
+        request_bytes: int | Callable[[], int] = 0,
+    ) -> RedfishRestResponse:
+        """Send a request with send() and report it to the trace hook.
+        request_bytes may be a function called once the request is sent."""
+        if self.trace is None:
+            return send()
+        event = TraceEvent("request", method, self.address, url)
+        if self._attempts is not None:
+            self._attempts.reset()
+        start = time.perf_counter()
+        try:
+            response = send()
+        except Exception as exc:
+            event.error = str(exc) or type(exc).__name__
+            raise
+        else:
+            event.status = response.status
+            content = response.read or b""
+            event.response_bytes = len(content.encode() if isinstance(content, str) else content)
+        finally:
+            event.elapsed = time.perf_counter() - start
+            event.request_bytes = request_bytes() if callable(request_bytes) else request_bytes
+            if self._attempts is not None:
+                event.retries = max(0, self._attempts.attempts - 1)
+            self.trace(event)
+        return response
+
+    def _get(self, url: str) -> RedfishRestResponse:
+        """Send a GET, conditional if there is a response cache"""
+        if self.response_cache is None:
+            response = self._get_unconditional(url)
+        else:
+            headers = self.response_cache.request_headers(url)
+            send = partial(self.client.get, url, headers=headers)
+            response = self.response_cache.update(
+                url, self._traced("GET", url, lambda: self._send("GET", send))
+            )
+            if response.status == 304:
+                # The entry was dropped after the request was sent
+                response = self.response_cache.update(url, self._get_unconditional(url))
+        self._remember_etag(url, response)
+        return response
+
+    def _get_unconditional(self, url: str) -> RedfishRestResponse:
+        return self._traced(
+            "GET", url, lambda: self._send("GET", partial(self.client.get, url))
+        )
+
+    def _remember_etag(self, url: str, response: RedfishRestResponse):
+        """Keep the ETag of a resource that was read or changed, for If-Match"""
+        etag = get_etag(response) if 200 <= response.status < 300 else None
+        if isinstance(etag, str):
+            self._etags[url] = etag
+        else:
+            self._etags.pop(url, None)
+
+    def _cached_for_update(self, url: str) -> RedfishRestResponse | None:
+        """Get the fresh cached response of a resource read to be changed, if
+        it can be used instead of asking the RSC"""
+        if not (self.conditional_writes and self._reading_for_update and self.response_cache):
+            return None
+        entry = self.response_cache.lookup_fresh(url)
+        if entry is None:
+            return None
+        self._etags[url] = entry.etag
+        return entry.to_response(url)
+
+    @contextlib.contextmanager
+    def reading_for_update(self) -> Iterator[None]:
+        """Mark the reads of the block as made to change the resources. With
+        conditional writes, a resource read less than fresh_for seconds ago
+        is then taken from the response cache without asking the RSC: if it
+        changed since, If-Match makes the PATCH fail instead of overwriting
+        the change."""
+        previous = self._reading_for_update
+        self._reading_for_update = True
+        try:
+            yield
+        finally:
+            self._reading_for_update = previous
 
     def perform_redfish_get(self, url: str) -> RedfishRestResponse:
         """Perform a Redfish action"""
-        response = self.client.get(url)
+        response = self._prefetched.pop(url, None)
+        if isinstance(response, Exception):
+            raise response
+        if response is None:
+            response = self._cached_for_update(url)
+        if response is None:
+            response = self._get(url)
         error_msg = check_response_for_error(response)
+        if response.status == 401:
+            raise SessionRejectedError(f"GET failed for {url}: {error_msg}")
         if error_msg:
             raise RedfishError(f"GET failed for {url}: {error_msg}")
         return response
 
+    def perform_redfish_get_many(
+        self, urls: List[str], max_workers: int = DEFAULT_CONCURRENT_REQUESTS
+    ) -> List[RedfishRestResponse]:
+        """Perform several GETs concurrently over the same session.
+        Responses are returned in the same order as urls."""
+        if len(urls) <= 1:
+            return [self.perform_redfish_get(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            return list(executor.map(self.perform_redfish_get, urls))
+
+    @contextlib.contextmanager
+    def prefetch(
+        self, urls: List[str], max_workers: int = DEFAULT_CONCURRENT_REQUESTS
+    ) -> Iterator[None]:
+        """GET urls concurrently over the same session, for the GETs of the
+        block. Each response is used by the first GET of its URL, so later
+        reads still go to the RSC, and is dropped if the resource is changed
+        first. A failed GET raises its error when the block reads its URL."""
+        urls = [
+            url
+            for url in dict.fromkeys(urls)
+            if url not in self._prefetched and self._cached_for_update(url) is None
+        ]
+
+        def fetch(url: str) -> RedfishRestResponse | Exception:
+            try:
+                return self._get(url)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                return exc
+
+        with trace_phase(self.trace, "prefetch", self.address):
+            if len(urls) <= 1:
+                responses = [fetch(url) for url in urls]
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+                    responses = list(executor.map(fetch, urls))
+        self._prefetched.update(zip(urls, responses))
+        try:
+            yield
+        finally:
+            for url in urls:
+                self._prefetched.pop(url, None)
+
+    @property
+    def upload_timeouts(self) -> Tuple[float, float]:
+        """The connect and read timeouts of file uploads"""
+        policy = self.retry_policy
+        return policy.connect_timeout, max(policy.read_timeout, UPLOAD_READ_TIMEOUT)
+
+    @property
+    def service_root(self) -> dict:
+        """Get the service root, fetching it if the client has not done it yet"""
+        if getattr(self.client, "root_resp", None) is None:
+            try:
+                self.client.get_root_object()
+            except redfish_rest_v1.RetriesExhaustedError as exc:
+                raise RedfishError("Failed to connect to the RSC") from exc
+        return self.client.root_resp.dict
+
+    def supports_query(self, feature: str, option: str | None = None) -> bool:
+        """Check if the RSC advertises a query parameter feature in
+        ProtocolFeaturesSupported, e.g. supports_query("FilterQuery") or
+        supports_query("ExpandQuery", "NoLinks")"""
+        supported = self.service_root.get("ProtocolFeaturesSupported", {}).get(feature)
+        if option is not None:
+            return isinstance(supported, dict) and supported.get(option) is True
+        return supported is True
+
     def perform_redfish_patch(self, url: str, data: dict) -> RedfishRestResponse:
-        """Perform a Redfish action"""
-        response = self.client.patch(url, body=data)
+        """Perform a Redfish action. With conditional writes, a PATCH of a
+        resource whose ETag is known raises a PreconditionFailedError if the
+        resource changed since it was read."""
+        etag = self._etags.get(url) if self.conditional_writes else None
+
+        if etag:
+            send = partial(self.client.patch, url, body=data, headers={"If-Match": etag})
+        else:
+            send = partial(self.client.patch, url, body=data)
+        response = self._traced(
+            "PATCH", url, lambda: self._send("PATCH", send), lambda: json_size(data)
+        )
+        self._invalidate_cached(url)
+        if etag and response.status == 412:
+            raise PreconditionFailedError(
+                f"PATCH failed for {url}: the resource changed since it was read"
+            )
+        self._remember_etag(url, response)
         error_msg = check_response_for_error(response)
         if error_msg:
             raise RedfishError(f"PATCH failed for {url}: {error_msg}")
         return response
 
     def perform_redfish_post(
-        self, url: str, data: Any, is_multipart: bool = False
+        self,
+        url: str,
+        data: Any,
+        is_multipart: bool = False,
+        progress: Callable[[UploadProgress], None] | None = None,
     ) -> RedfishRestResponse:
-        """Perform a Redfish action"""
-        headers = {}
+        """Perform a Redfish action. A multipart body is streamed from its
+        files, and progress is called with the UploadProgress while it is sent."""
         if is_multipart:
-            headers = {"Content-Type": "multipart/form-data"}
-        response: RedfishRestResponse = self.client.post(
-            url,
-            body=data,
-            headers=headers,
-            timeout=(3600 if is_multipart else self.config.timeout),
-        )
+            sent = [0]
+
+            def report(state: UploadProgress):
+                sent[0] = state.bytes_sent
+                if progress is not None:
+                    progress(state)
+
+            response = self._traced(
+                "POST",
+                url,
+                lambda: self._post_multipart(url, data, report if self.trace else progress),
+                lambda: sent[0],
+            )
+        else:
+            response = self._traced(
+                "POST",
+                url,
+                lambda: self._send("POST", partial(self.client.post, url, body=data, headers={})),
+                lambda: json_size(data),
+            )
+        self._invalidate_cached(url)
         error_msg = check_response_for_error(response)
         if error_msg:
             raise RedfishError(f"POST failed for {url}: {error_msg}")
 
         return response
 
+    def _post_multipart(
+        self, url: str, fields: dict, progress: Callable[[UploadProgress], None] | None
+    ) -> RedfishRestResponse:
+        # The redfish client encodes multipart bodies in memory, so large
+        # files are sent with requests directly over the same session.
+        def send(**_) -> RedfishRestResponse:
+            try:
+                resp = post_multipart(
+                    f"{self.address}{url}",
+                    fields,
+                    headers={"X-Auth-Token": self.client.get_session_key() or ""},
+                    callback=progress,
+                    verify=self.config.cafile or False,
+                    proxies=self.config.proxies,
+                    timeout=self.upload_timeouts,
+                )
+            except requests.RequestException as exc:
+                raise redfish_rest_v1.RetriesExhaustedError() from exc
+            return RedfishRestResponse(redfish_rest_v1.RestRequest(url, method="POST"), resp)
+
+        # Sent once, as the first attempt consumes the files of the body
+        return self._send("POST", send, attempts=1)
+
     def login(self):
         """Login to the RSC"""
+        self._check_circuit()
         try:
-            self.client.login(auth="session")
+            with trace_phase(self.trace, "login", self.address):
+                self.client.login(auth="session")
+            self.breaker.record_success()
+        except redfish_rest_v1.RetriesExhaustedError as e:
+            self.breaker.record_failure()
+            raise RedfishError("Failed to connect to the RSC") from e
         except redfish_rest_v1.SessionCreationError as e:
+            # The RSC answered
+            self.breaker.record_success()
             exp_msg = ""
             # SessionCreationError does not have a message attribute.
             # It returns the body of the response as a string after a newline.
@@ -121,25 +493,77 @@ class Rsc:
                     exp_msg = f"Login failed: {error_msg}"
             raise RedfishError(exp_msg) from e
         except Exception as e:
+            self.breaker.release_trial()
             raise RedfishError(f"Login failed: {str(e)}") from e
 
     def logout(self):
         """Logout from the RSC"""
         self.client.logout()
 
+    def resume_session(self, session_key: str, session_location: str) -> bool:
+        """Reuse an existing session instead of logging in.
+        Returns False if the RSC no longer accepts the session."""
+        self.client.set_session_key(session_key)
+        self.client.set_session_location(session_location)
+        response = self._get_unconditional(session_location)
+        if response.status == 401:
+            self.client.set_session_key(None)
+            self.client.set_session_location(None)
+            return False
+        error_msg = check_response_for_error(response)
+        if error_msg:
+            raise RedfishError(f"GET failed for {session_location}: {error_msg}")
+        return True
+
     def perform_redfish_delete(self, url: str) -> RedfishRestResponse:
         """Perform a Redfish action"""
-        response = self.client.delete(url)
+        response = self._traced(
+            "DELETE", url, lambda: self._send("DELETE", partial(self.client.delete, url))
+        )
+        self._invalidate_cached(url)
         error_msg = check_response_for_error(response)
         if error_msg:
             raise RedfishError(f"DELETE failed for {url}: {error_msg}")
         return response
 
-    def monitor_task(self, task_response: RedfishRestResponse) -> RedfishRestResponse:
-        """Monitors a task until it is completed. Returns the final response of the task monitor."""
+    def _invalidate_cached(self, url: str):
+        """Drop the cached response of a resource that was just modified"""
+        self._prefetched.pop(url, None)
+        self._etags.pop(url, None)
+        if self.response_cache is not None:
+            self.response_cache.invalidate(url)
+
+    def monitor_task(
+        self, task_response: RedfishRestResponse, use_events: bool = True
+    ) -> RedfishRestResponse:
+        """Monitors a task until it is completed. Returns the final response of the task monitor.
+
+        When use_events is True and the RSC has an SSE event stream, the task
+        monitor is polled as soon as a task event arrives. Otherwise it is
+        polled after Retry-After, or at an interval that grows while the task
+        makes no progress. With a task_scheduler, the task is monitored by it
+        instead, along with the tasks of the other RSCs."""
+        if self.task_scheduler is not None:
+            with trace_phase(self.trace, "monitor_task", self.address):
+                return self.task_scheduler.wait(self.address, self, task_response)
+        listener = None
+        if use_events and task_response.is_processing:
+            listener = TaskEventListener.start(self)
+        try:
+            with trace_phase(self.trace, "monitor_task", self.address):
+                return self._poll_task(task_response, listener)
+        finally:
+            if listener is not None:
+                listener.close()
+
+    def _poll_task(
+        self, task_response: RedfishRestResponse, listener: TaskEventListener | None
+    ) -> RedfishRestResponse:
 
         previous_message = ""
         previous_line_len = 0
+        previous_body = None
+        poll_interval = MIN_POLL_INTERVAL
 
         while task_response.is_processing:
             task_body = task_response.dict
@@ -163,9 +587,27 @@ class Rsc:
                 previous_message = message
                 previous_line_len = len(message_to_display)
 
+            if task_body != previous_body:
+                poll_interval = MIN_POLL_INTERVAL
+            previous_body = task_body
+
             retry_time = task_response.retry_after
-            time.sleep(retry_time if retry_time else 5)
-            task_response = task_response.monitor(self.client)
+            if listener is not None and listener.connected:
+                # Events wake the loop up, polling is only a safety net
+                listener.wait(retry_time if retry_time else MAX_POLL_INTERVAL)
+            elif retry_time:
+                time.sleep(retry_time)
+            else:
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
+            task_location = task_response.task_location
+            if task_location is None:
+                raise ValueError("We are processing a 202, but provide no location")
+            task_response = self._traced(
+                "GET",
+                task_location,
+                lambda: self._send("GET", partial(self.client.get, task_location)),
+            )
 
         print("\n")
         return task_response
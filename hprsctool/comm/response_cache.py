@@ -0,0 +1,201 @@
+"""ETag-aware cache of Redfish GET responses"""
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict
+from urllib.parse import quote
+
+from redfish.rest.v1 import RestRequest, StaticRestResponse
+from redfish.rest.v1 import RestResponse as RedfishRestResponse
+
+DEFAULT_CACHE_DIR = Path.home() / ".hprsctool" / "responses"
+# Entries older than this are dropped instead of being revalidated
+DEFAULT_TTL = 60 * 60
+DEFAULT_MAX_ENTRIES = 256
+# Entries younger than this may be used without asking the RSC, by the reads
+# that precede a conditional write
+DEFAULT_FRESH_FOR = 60
+
+
+@dataclass
+class CachedResponse:
+    """A GET response stored in the cache"""
+
+    etag: str
+    headers: Dict[str, str]
+    body: str
+    stored_at: float
+
+    def to_response(self, url: str) -> RedfishRestResponse:
+        """Rebuild a response object equivalent to the original 200 response"""
+        return StaticRestResponse(
+            restreq=RestRequest(url), Status=200, Headers=self.headers, Content=self.body
+        )
+
+
+def get_etag(response: RedfishRestResponse) -> str | None:
+    """Get the ETag of a response, from the header or from @odata.etag"""
+    etag = response.getheader("ETag")
+    if etag:
+        return etag
+    try:
+        body = response.dict
+    except Exception:  # pylint: disable=broad-exception-caught
+        return None
+    return body.get("@odata.etag") if isinstance(body, dict) else None
+
+
+class ResponseCache:
+    """Cache of the GET responses of one RSC, keyed by URL.
+
+    Responses are stored with their ETag. Later reads of the same URL send
+    If-None-Match, and a 304 answer is served from the cache. Entries expire
+    after ttl seconds and the least recently used ones are evicted beyond
+    max_entries. Entries younger than fresh_for seconds are fresh. With a
+    cache_dir, entries are also kept on disk so they survive between
+    invocations, one file per URL so that a change only rewrites its own
+    entry and concurrent invocations do not lose each other's."""
+
+    def __init__(
+        self,
+        address: str,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: str | Path | None = None,
+        fresh_for: float = DEFAULT_FRESH_FOR,
+    ):
+        self.address = address
+        self.ttl = ttl
+        self.fresh_for = fresh_for
+        self.max_entries = max_entries
+        self.cache_dir = None
+        if cache_dir is not None:
+            self.cache_dir = Path(cache_dir) / quote(address, safe="")
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def lookup(self, url: str) -> CachedResponse | None:
+        """Get the entry of a URL, if there is one that has not expired"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            if time.time() - entry.stored_at > self.ttl:
+                del self._entries[url]
+                self._delete(url)
+                return None
+            self._entries.move_to_end(url)
+            return entry
+
+    def lookup_fresh(self, url: str) -> CachedResponse | None:
+        """Get the entry of a URL if it is fresh"""
+        entry = self.lookup(url)
+        if entry is None or time.time() - entry.stored_at > self.fresh_for:
+            return None
+        return entry
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Get the headers for a conditional GET of a URL"""
+        entry = self.lookup(url)
+        return {"If-None-Match": entry.etag} if entry is not None else {}
+
+    def update(self, url: str, response: RedfishRestResponse) -> RedfishRestResponse:
+        """Process the response to a GET of url. A 304 is answered from the
+        cache, and a new 200 response with an ETag is stored."""
+        if response.status == 304:
+            entry = self.lookup(url)
+            if entry is not None:
+                with self._lock:
+                    self.hits += 1
+                return entry.to_response(url)
+            return response
+        with self._lock:
+            self.misses += 1
+        etag = get_etag(response) if response.status == 200 else None
+        if etag:
+            self.store(url, etag, response)
+        else:
+            self.invalidate(url)
+        return response
+
+    def store(self, url: str, etag: str, response: RedfishRestResponse):
+        """Store the response to a GET of url"""
+        entry = CachedResponse(
+            etag=etag,
+            headers=dict(response.getheaders()),
+            body=response.text,
+            stored_at=time.time(),
+        )
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+        self._save(url, entry)
+        for evicted_url in evicted:
+            self._delete(evicted_url)
+
+    def invalidate(self, url: str):
+        """Forget the entry of a URL, e.g. after it was modified"""
+        with self._lock:
+            self._entries.pop(url, None)
+        self._delete(url)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get the hit and miss counters and the number of entries"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def _entry_file(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _load(self):
+        if self.cache_dir is None:
+            return
+        entries = []
+        now = time.time()
+        for entry_file in self.cache_dir.glob("*.json"):
+            try:
+                with open(entry_file, "r", encoding="utf-8") as cache_file:
+                    data = json.load(cache_file)
+                entries.append((data.pop("url"), CachedResponse(**data)))
+            except (OSError, ValueError, TypeError, KeyError):
+                continue
+        for url, entry in sorted(entries, key=lambda item: item[1].stored_at):
+            if now - entry.stored_at <= self.ttl:
+                self._entries[url] = entry
+        while len(self._entries) > self.max_entries:
+            self._delete(self._entries.popitem(last=False)[0])
+
+    def _save(self, url: str, entry: CachedResponse):
+        """Write the entry of a URL to disk, replacing the previous one atomically"""
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        entry_file = self._entry_file(url)
+        tmp_file = entry_file.with_name(
+            f"{entry_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+            json.dump({"url": url, **asdict(entry)}, cache_file)
+        os.replace(tmp_file, entry_file)
+
+    def _delete(self, url: str):
+        if self.cache_dir is None:
+            return
+        try:
+            self._entry_file(url).unlink()
+        except FileNotFoundError:
+            pass
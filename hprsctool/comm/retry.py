@@ -0,0 +1,163 @@
+"""Retries of requests to an RSC, and circuit breaker of each RSC"""
+
+from dataclasses import dataclass
+import email.utils
+import random
+import threading
+import time
+from typing import Dict, Tuple
+
+import requests
+from redfish.rest.v1 import RestResponse as RedfishRestResponse
+
+# Methods that can be sent again when it is unknown whether the RSC got them
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+# Statuses of requests the RSC did not process, that can be sent again with any method
+NOT_PROCESSED_STATUSES = frozenset({429, 503})
+# Statuses of transient failures, that can be sent again with idempotent methods
+TRANSIENT_STATUSES = frozenset({502, 504}) | NOT_PROCESSED_STATUSES
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How the requests to an RSC are retried.
+
+    A request is sent at most attempts times, waiting between attempts a
+    random time of up to backoff seconds, doubled after every attempt up to
+    max_backoff, or the Retry-After of the RSC. Each attempt may take
+    connect_timeout seconds to connect and read_timeout seconds between two
+    reads, and no attempt starts or waits beyond total_timeout seconds after
+    the first one."""
+
+    attempts: int = 4
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    total_timeout: float = 120.0
+
+    @classmethod
+    def from_config(cls, config) -> "RetryPolicy":
+        """The policy matching the timeout and max_retry of a RedfishConfig"""
+        return cls(
+            attempts=config.max_retry + 1,
+            connect_timeout=min(cls.connect_timeout, config.timeout),
+            read_timeout=config.timeout,
+        )
+
+    def timeouts(self, remaining: float) -> Tuple[float, float]:
+        """The connect and read timeouts of an attempt, within the time remaining"""
+        remaining = max(remaining, 0.001)
+        return min(self.connect_timeout, remaining), min(self.read_timeout, remaining)
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """The time to wait after a failed attempt, with full jitter"""
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+def can_retry_error(method: str, error: BaseException) -> bool:
+    """Check if a request that failed without response can be sent again"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        # The request did not reach the RSC
+        return True
+    return method in IDEMPOTENT_METHODS and isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    )
+
+
+def can_retry_status(method: str, status: int) -> bool:
+    """Check if a request that got a status can be sent again"""
+    if status in NOT_PROCESSED_STATUSES:
+        return True
+    return method in IDEMPOTENT_METHODS and status in TRANSIENT_STATUSES
+
+
+def get_retry_after(response: RedfishRestResponse) -> float | None:
+    """Get the Retry-After of a response in seconds, given as seconds or as an HTTP date"""
+    value = response.getheader("Retry-After")
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+class CircuitBreaker:
+    """Fails the requests to an RSC fast once it is clearly down.
+
+    After failure_threshold consecutive failures the circuit opens, and
+    requests fail without being sent for reset_timeout seconds. A single
+    request is then let through: its success closes the circuit, and its
+    failure opens it again."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> float | None:
+        """Check if a request can be sent. Returns None if it can, and the
+        seconds before the next trial request otherwise."""
+        with self._lock:
+            if self.opened_at is None:
+                return None
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self._trial:
+                return max(remaining, 0.0)
+            self._trial = True
+            return None
+
+    def record_success(self):
+        """Record a request the RSC answered"""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        """Record a request the RSC did not answer, or answered as unavailable"""
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+    def release_trial(self):
+        """Let the next request be the trial, when the trial request failed
+        without telling whether the RSC is up"""
+        with self._lock:
+            self._trial = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently failed without being sent"""
+        with self._lock:
+            return self.opened_at is not None
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(address: str) -> CircuitBreaker:
+    """Get the circuit breaker of an RSC, shared by all its clients"""
+    with _breakers_lock:
+        return _breakers.setdefault(address, CircuitBreaker())
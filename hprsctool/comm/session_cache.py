@@ -0,0 +1,156 @@
+"""Persistent on-disk cache of RSC session tokens"""
+
+import contextlib
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the threads of one process are serialized
+    fcntl = None
+
+from .remote_system_controller import Rsc
+
+DEFAULT_CACHE_FILE = Path.home() / ".hprsctool" / "sessions.json"
+# Sessions idle for longer than this are logged out and dropped from the cache
+DEFAULT_MAX_IDLE = 20 * 60
+DEFAULT_MAX_ENTRIES = 1024
+
+
+@dataclass
+class CachedSession:
+    """A session token saved in the cache"""
+
+    base_url: str
+    token: str
+    location: str
+    last_used: float
+
+
+class SessionCache:
+    """Keeps RSC session tokens in a file readable only by the current user.
+
+    Tokens are keyed by RSC address and user name. An Rsc logged in through
+    the cache reuses the saved X-Auth-Token when the RSC still accepts it, and
+    only creates a new session when the RSC answers 401. Every change reads
+    the file again under a lock shared with the other hprsctool processes, so
+    that concurrent invocations keep each other's sessions."""
+
+    def __init__(
+        self,
+        cache_file: str | Path = DEFAULT_CACHE_FILE,
+        max_idle: float = DEFAULT_MAX_IDLE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.cache_file = Path(cache_file)
+        self.lock_file = self.cache_file.with_name(f"{self.cache_file.name}.lock")
+        self.max_idle = max_idle
+        self.max_entries = max_entries
+        # Fleet mode shares one cache between worker threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(base_url: str, username: str) -> str:
+        """Get the cache key of an RSC address and user"""
+        return f"{username}@{base_url}"
+
+    def login(self, rsc: Rsc):
+        """Log in to the RSC, reusing a cached session when possible"""
+        key = self.key(rsc.config.base_url, rsc.config.username)
+        with self._locked():
+            entries = self._load()
+            evicted = self._evict(entries, time.time())
+            cached = entries.get(key)
+            if evicted:
+                self._save(entries)
+        for session in evicted:
+            logout_session(session, rsc.config.timeout)
+
+        if cached is None or not rsc.resume_session(cached.token, cached.location):
+            rsc.login()
+
+        session = CachedSession(
+            base_url=rsc.config.base_url,
+            token=rsc.client.get_session_key(),
+            location=urlparse(rsc.client.get_session_location()).path,
+            last_used=time.time(),
+        )
+        with self._locked():
+            entries = self._load()
+            entries[key] = session
+            self._save(entries)
+
+    def clear(self):
+        """Log out every cached session and empty the cache"""
+        with self._locked():
+            entries = self._load()
+            self._save({})
+        for session in entries.values():
+            logout_session(session)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the cache against the other threads and processes for a read-modify-write"""
+        with self._lock:
+            self.cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    # Released when the file is closed
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def _evict(self, entries: Dict[str, CachedSession], now: float) -> List[CachedSession]:
+        """Remove idle and least recently used sessions from entries and return them"""
+        evicted = []
+        for key, session in list(entries.items()):
+            if now - session.last_used > self.max_idle:
+                evicted.append(entries.pop(key))
+        # Keep one slot free for the session about to be stored
+        by_age = sorted(entries, key=lambda k: entries[k].last_used)
+        while len(entries) >= self.max_entries:
+            evicted.append(entries.pop(by_age.pop(0)))
+        return evicted
+
+    def _load(self) -> Dict[str, CachedSession]:
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            return {key: CachedSession(**value) for key, value in data.items()}
+        except (OSError, ValueError, TypeError):
+            # A missing or corrupt cache only costs a new login
+            return {}
+
+    def _save(self, entries: Dict[str, CachedSession]):
+        self.cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(
+            f"{self.cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+            json.dump({key: asdict(value) for key, value in entries.items()}, cache_file)
+        os.replace(tmp_file, self.cache_file)
+
+
+def logout_session(session: CachedSession, timeout: float = 5):
+    """Delete a cached session on its RSC. Failures are ignored, since the
+    RSC also expires idle sessions on its own."""
+    try:
+        requests.delete(
+            f"{session.base_url}{session.location}",
+            headers={"X-Auth-Token": session.token},
+            verify=False,
+            timeout=timeout,
+        )
+    except requests.RequestException:
+        pass
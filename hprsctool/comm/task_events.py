@@ -0,0 +1,144 @@
+"""Task state notifications from the Redfish EventService SSE stream"""
+
+import json
+import queue
+import socket
+import threading
+from typing import Iterator
+
+import requests
+
+# Prefix of the messages of the DMTF task event registry
+TASK_EVENT_PREFIX = "TaskEvent."
+# Timeout for opening the stream. Reads are not limited, since the RSC may
+# stay silent for a long time between events.
+CONNECT_TIMEOUT = 10
+
+
+def get_event_stream_uri(rsc) -> str | None:
+    """Get the ServerSentEventUri of the RSC, or None if it does not offer
+    an enabled SSE stream"""
+    try:
+        event_service = rsc.service_root.get("EventService", {}).get("@odata.id")
+        if not event_service:
+            return None
+        body = rsc.perform_redfish_get(event_service).dict
+    except Exception:  # pylint: disable=broad-exception-caught
+        return None
+    if body.get("ServiceEnabled") is False:
+        return None
+    return body.get("ServerSentEventUri")
+
+
+def read_events(lines: Iterator[str]) -> Iterator[dict]:
+    """Parse an SSE stream into the JSON payloads of its events"""
+    data = []
+    for line in lines:
+        if line == "":
+            if data:
+                try:
+                    yield json.loads("\n".join(data))
+                except ValueError:
+                    pass
+            data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].removeprefix(" "))
+
+
+def is_task_event(event: dict) -> bool:
+    """Check if an event payload reports a task state change"""
+    return any(
+        record.get("MessageId", "").startswith(TASK_EVENT_PREFIX)
+        for record in event.get("Events", [])
+        if isinstance(record, dict)
+    )
+
+
+class TaskEventListener:
+    """Listens to the SSE stream of an RSC in a background thread.
+
+    wait() returns as soon as a task event arrives, so a task monitor can be
+    polled right when its state changes instead of after a fixed delay."""
+
+    def __init__(self, rsc, stream_uri: str):
+        self.url = f"{rsc.address}{stream_uri}"
+        self.headers = {
+            "X-Auth-Token": rsc.client.get_session_key() or "",
+            "Accept": "text/event-stream",
+        }
+        self.verify = rsc.config.cafile or rsc.config.capath or False
+        self._events: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        # Guards _response against a close() racing with the connection
+        self._lock = threading.Lock()
+        self._response = None
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+
+    @classmethod
+    def start(cls, rsc) -> "TaskEventListener | None":
+        """Start listening to the RSC, or return None if it has no SSE stream"""
+        stream_uri = get_event_stream_uri(rsc)
+        if not stream_uri:
+            return None
+        listener = cls(rsc, stream_uri)
+        listener._thread.start()
+        return listener
+
+    @property
+    def connected(self) -> bool:
+        """Check if the stream is still being read"""
+        return self._thread.is_alive()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a task event. Returns True if one
+        arrived. Events that queued up in the meantime are all consumed."""
+        try:
+            self._events.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        while not self._events.empty():
+            self._events.get_nowait()
+        return True
+
+    def close(self):
+        """Stop listening and close the stream"""
+        with self._lock:
+            self._stop.set()
+            response = self._response
+        # Closing the response would wait for the blocked read of the listener
+        # thread. Shutting the socket down ends that read right away instead.
+        connection = getattr(getattr(response, "raw", None), "connection", None)
+        sock = getattr(connection, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _listen(self):
+        try:
+            with requests.get(
+                self.url,
+                headers=self.headers,
+                stream=True,
+                verify=self.verify,
+                timeout=(CONNECT_TIMEOUT, None),
+            ) as response:
+                with self._lock:
+                    if self._stop.is_set():
+                        # Closed while connecting: the stream is closed on return
+                        return
+                    self._response = response
+                if response.status_code != 200:
+                    return
+                # SSE events are small and must be seen as soon as they are sent
+                lines = response.iter_lines(chunk_size=1, decode_unicode=True)
+                for event in read_events(line or "" for line in lines):
+                    if self._stop.is_set():
+                        return
+                    if is_task_event(event):
+                        self._events.put(event)
+        except (requests.RequestException, AttributeError, OSError, ValueError):
+            # The stream was closed or could not be read. Callers fall back to
+            # polling once the thread is gone.
+            pass
@@ -0,0 +1,324 @@
+"""Monitoring of many tasks on many RSCs with a single scheduler"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List
+
+from redfish.rest.v1 import RestResponse as RedfishRestResponse
+from redfish.rest.v1 import RetriesExhaustedError
+
+from . import redfish_messages
+from .remote_system_controller import RedfishError, Rsc
+from .retry import RetryPolicy, can_retry_error, can_retry_status, get_retry_after
+
+# Maximum number of task monitors polled at the same time
+DEFAULT_POLL_WORKERS = 16
+# Delay between polls of task monitors that do not send Retry-After, in seconds
+DEFAULT_POLL_INTERVAL = 5
+
+
+@dataclass
+class TaskEvent:
+    """A change in the state of a monitored task"""
+
+    key: str
+    state: str
+    percent_complete: int | None
+    message: str | None
+    done: bool
+    succeeded: bool
+    timestamp: float
+    response: RedfishRestResponse | None = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        """Get the event as a JSON-serializable dict"""
+        return {
+            "key": self.key,
+            "state": self.state,
+            "percent_complete": self.percent_complete,
+            "message": self.message,
+            "done": self.done,
+            "succeeded": self.succeeded,
+            "timestamp": self.timestamp,
+        }
+
+
+@dataclass
+class TaskProgress:
+    """Aggregate progress of all the tasks of a scheduler"""
+
+    total: int
+    running: int
+    succeeded: int
+    failed: int
+    percent_complete: float
+
+    def __str__(self):
+        return (
+            f"{self.succeeded + self.failed}/{self.total} tasks done "
+            f"({self.succeeded} succeeded, {self.failed} failed), "
+            f"{self.percent_complete:.0f}% complete"
+        )
+
+
+@dataclass
+class _MonitoredTask:
+    key: str
+    rsc: Rsc
+    response: RedfishRestResponse
+    last_event: TaskEvent | None = None
+    done: bool = False
+    # Consecutive polls that failed transiently
+    failed_polls: int = 0
+    error: Exception | None = None
+    finished: threading.Event = field(default_factory=threading.Event)
+
+
+def _body(response: RedfishRestResponse) -> dict:
+    try:
+        body = response.dict
+    except Exception:  # pylint: disable=broad-exception-caught
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def get_task_event(key: str, response: RedfishRestResponse) -> TaskEvent:
+    """Describe the state of a task from a task monitor response"""
+    body = _body(response)
+    message = None
+    if body.get("Messages"):
+        message = body["Messages"][0].get("Message")
+    if response.is_processing:
+        state, done, succeeded = body.get("TaskState", "Running"), False, False
+    elif 200 <= response.status < 300:
+        state = body.get("TaskState", "Completed")
+        done, succeeded = True, state not in ("Exception", "Killed", "Cancelled")
+    else:
+        state, done, succeeded = "Exception", True, False
+        message = redfish_messages.get_error_message(body) or f"HTTP error: {response.status}"
+    return TaskEvent(
+        key=key,
+        state=state,
+        percent_complete=body.get("PercentComplete"),
+        message=message,
+        done=done,
+        succeeded=succeeded,
+        timestamp=time.time(),
+        response=response,
+    )
+
+
+class TaskMonitorScheduler:
+    """Tracks the task monitors of many RSCs at once.
+
+    Tasks are added with the 202 response that started them. run() polls every
+    task monitor through RedfishRestResponse.monitor() on one worker pool, as
+    soon as its Retry-After delay has passed, and yields a TaskEvent each time
+    the state, progress or message of a task changes. Polls that fail
+    transiently are retried as retry_policy allows, by default the policy of
+    the RSC of the task.
+
+    Alternatively, start() runs the scheduler in a background thread, and
+    wait() monitors a task from any thread until it is done. This is how the
+    threads of fleet mode share one scheduler."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_POLL_WORKERS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("The number of workers must be at least 1")
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.retry_policy = retry_policy
+        self.tasks: Dict[str, _MonitoredTask] = {}
+        self._due: List[tuple] = []
+        self._sequence = itertools.count()
+        # Tasks added by wait() and polls completed by the workers
+        self._inbox: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def add(self, key: str, rsc: Rsc, task_response: RedfishRestResponse):
+        """Add a task to monitor. key identifies it in the events, e.g. the
+        address of its RSC."""
+        with self._lock:
+            if key in self.tasks:
+                raise ValueError(f"A task is already monitored for {key}")
+            self.tasks[key] = _MonitoredTask(key, rsc, task_response)
+        if task_response.is_processing:
+            self._schedule(self.tasks[key])
+
+    @property
+    def results(self) -> Dict[str, RedfishRestResponse]:
+        """Get the latest task monitor response of every task"""
+        return {key: task.response for key, task in self.tasks.items()}
+
+    @property
+    def progress(self) -> TaskProgress:
+        """Get the aggregate progress of all tasks"""
+        with self._lock:
+            events = [task.last_event for task in self.tasks.values()]
+        succeeded = sum(1 for event in events if event and event.done and event.succeeded)
+        failed = sum(1 for event in events if event and event.done and not event.succeeded)
+        percents = [
+            100 if event and event.done else (event.percent_complete or 0) if event else 0
+            for event in events
+        ]
+        return TaskProgress(
+            total=len(events),
+            running=len(events) - succeeded - failed,
+            succeeded=succeeded,
+            failed=failed,
+            percent_complete=sum(percents) / len(percents) if percents else 100,
+        )
+
+    def run(self) -> Iterator[TaskEvent]:
+        """Monitor all tasks until they are done, yielding their state changes"""
+        for task in list(self.tasks.values()):
+            yield from self._update(task, task.response)
+        yield from self._run_loop()
+
+    def start(self, on_event: Callable[[TaskEvent], None] | None = None):
+        """Monitor the tasks given to wait() in a background thread, until
+        close(). on_event is called with every TaskEvent."""
+
+        def run_in_background():
+            for event in self._run_loop():
+                if on_event is not None:
+                    on_event(event)
+
+        self._thread = threading.Thread(target=run_in_background, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop the background thread once the tasks being monitored are done"""
+        self._closed = True
+        self._inbox.put(("wake", None, None))
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait(self, key: str, rsc: Rsc, task_response: RedfishRestResponse) -> RedfishRestResponse:
+        """Monitor a task with the background scheduler until it is done, and
+        return the final task monitor response. key is made unique if it is
+        already taken. Raises a RedfishError if the task monitor cannot be
+        polled."""
+        if not task_response.is_processing:
+            return task_response
+        with self._lock:
+            unique_key = key
+            for index in itertools.count(2):
+                if unique_key not in self.tasks:
+                    break
+                unique_key = f"{key} ({index})"
+            task = _MonitoredTask(unique_key, rsc, task_response)
+            self.tasks[unique_key] = task
+        self._inbox.put(("added", task, task_response))
+        task.finished.wait()
+        if task.error is not None:
+            raise RedfishError(f"Failed to poll the task monitor: {task.error}") from task.error
+        return task.response
+
+    def _run_loop(self) -> Iterator[TaskEvent]:
+        """Poll the scheduled tasks until none is left, or until close() in the background"""
+        background = self._thread is not None
+        in_flight = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while self._due or in_flight or (background and not self._closed):
+                now = time.monotonic()
+                while self._due and self._due[0][0] <= now:
+                    _, _, task = heapq.heappop(self._due)
+                    executor.submit(self._poll, task, self._inbox)
+                    in_flight += 1
+
+                timeout = self._due[0][0] - now if self._due else None
+                try:
+                    kind, task, response = self._inbox.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if kind == "wake":
+                    continue
+                if kind == "polled":
+                    in_flight -= 1
+                    delay = self._retry_delay(task, response)
+                    if delay is not None:
+                        self._schedule(task, delay)
+                        continue
+                yield from self._update(task, response)
+                if not task.done:
+                    self._schedule(task)
+
+    def _schedule(self, task: _MonitoredTask, delay: float | None = None):
+        """Schedule the next poll of a task after delay, or its Retry-After delay"""
+        if delay is None:
+            retry_time = task.response.retry_after
+            delay = retry_time if retry_time else self.poll_interval
+        heapq.heappush(self._due, (time.monotonic() + delay, next(self._sequence), task))
+
+    def _retry_delay(self, task: _MonitoredTask, response) -> float | None:
+        """Get the delay before polling a task again after a transient
+        failure, or None if the poll did not fail transiently or has been
+        retried enough"""
+        retry_after = None
+        if isinstance(response, Exception):
+            error = response
+            if isinstance(error, RetriesExhaustedError) and error.__cause__ is not None:
+                error = error.__cause__
+            transient = can_retry_error("GET", error)
+        else:
+            transient = not response.is_processing and can_retry_status("GET", response.status)
+            if transient:
+                retry_after = get_retry_after(response)
+        if not transient:
+            task.failed_polls = 0
+            return None
+        policy = self.retry_policy or task.rsc.retry_policy
+        task.failed_polls += 1
+        if task.failed_polls >= policy.attempts:
+            return None
+        return policy.delay(task.failed_polls, retry_after)
+
+    @staticmethod
+    def _poll(task: _MonitoredTask, completed: queue.Queue):
+        try:
+            response = task.response.monitor(task.rsc.client)
+        # The error is the result of the poll, handled by _update()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            response = e
+        completed.put(("polled", task, response))
+
+    def _update(self, task: _MonitoredTask, response) -> Iterator[TaskEvent]:
+        if isinstance(response, Exception):
+            task.error = response
+            event = TaskEvent(
+                key=task.key,
+                state="Exception",
+                percent_complete=None,
+                message=f"Failed to poll the task monitor: {response}",
+                done=True,
+                succeeded=False,
+                timestamp=time.time(),
+                response=None,
+            )
+        else:
+            event = get_task_event(task.key, response)
+            task.response = response
+        task.done = event.done
+        if task.done:
+            task.finished.set()
+        previous = task.last_event
+        task.last_event = event
+        if previous is None or (event.state, event.percent_complete, event.message) != (
+            previous.state,
+            previous.percent_complete,
+            previous.message,
+        ):
+            yield event
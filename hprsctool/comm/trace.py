@@ -0,0 +1,145 @@
+"""Tracing of the requests sent to RSCs and of the phases of a command"""
+
+from collections import defaultdict
+import contextlib
+from dataclasses import asdict, dataclass, field
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, TextIO
+
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class TraceEvent:
+    """A request sent to an RSC (kind "request") or a timed phase of a
+    command such as connect, login or monitor_task (kind "phase")"""
+
+    kind: str
+    # HTTP method of a request, or name of a phase
+    name: str
+    address: str | None = None
+    url: str | None = None
+    status: int | None = None
+    # Wall clock time of the start, and duration in seconds
+    start: float = field(default_factory=time.time)
+    elapsed: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        data = {key: value for key, value in asdict(self).items() if value is not None}
+        if self.kind == "phase":
+            for key in ("request_bytes", "response_bytes", "retries"):
+                del data[key]
+        return data
+
+
+TraceHook = Callable[[TraceEvent], None]
+
+
+class AttemptCounter(HTTPAdapter):
+    """Transport adapter that counts the attempts of each request, so the
+    retries of the redfish client can be traced. Counts are per thread."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    @property
+    def attempts(self) -> int:
+        return getattr(self._local, "attempts", 0)
+
+    def reset(self):
+        self._local.attempts = 0
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=arguments-differ
+        self._local.attempts = self.attempts + 1
+        return super().send(request, *args, **kwargs)
+
+
+@contextlib.contextmanager
+def trace_phase(hook: TraceHook | None, name: str, address: str | None = None) -> Iterator[None]:
+    """Time a phase and send it to hook, if there is one"""
+    if hook is None:
+        yield
+        return
+    event = TraceEvent("phase", name, address)
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as exc:
+        event.error = str(exc) or type(exc).__name__
+        raise
+    finally:
+        event.elapsed = time.perf_counter() - start
+        hook(event)
+
+
+class TraceRecorder:
+    """Trace hook that keeps the events for a summary and, with a stream,
+    writes each of them as a JSON line as soon as it is recorded"""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream
+        self.events: List[TraceEvent] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: TraceEvent):
+        with self._lock:
+            self.events.append(event)
+            if self.stream is not None:
+                self.stream.write(json.dumps(event.to_dict()) + "\n")
+                self.stream.flush()
+
+    def summary(self) -> str:
+        """Get a human readable summary of the recorded events"""
+        with self._lock:
+            return format_summary(list(self.events))
+
+
+def format_summary(events: List[TraceEvent]) -> str:
+    """Summarize events: the phases in order, then the requests grouped by
+    method and URL, slowest first"""
+    lines = []
+    phases = [event for event in events if event.kind == "phase"]
+    if phases:
+        lines.append("Phases:")
+        for event in phases:
+            host = f" {event.address}" if event.address else ""
+            failed = f" (failed: {event.error})" if event.error else ""
+            lines.append(f"  {event.name}{host}: {event.elapsed * 1000:.1f} ms{failed}")
+
+    requests = [event for event in events if event.kind == "request"]
+    groups: Dict[tuple, List[TraceEvent]] = defaultdict(list)
+    for event in requests:
+        groups[(event.name, event.url)].append(event)
+    if groups:
+        lines.append("Requests:")
+        lines.append(
+            f"  {'count':>5} {'total ms':>9} {'max ms':>8} {'bytes':>9} {'retries':>7}"
+            "  request (statuses)"
+        )
+        for (method, url), group in sorted(
+            groups.items(), key=lambda item: -sum(event.elapsed for event in item[1])
+        ):
+            statuses = ", ".join(
+                sorted(
+                    {str(event.status) if event.status is not None else "error" for event in group}
+                )
+            )
+            lines.append(
+                f"  {len(group):>5} {sum(e.elapsed for e in group) * 1000:>9.1f} "
+                f"{max(e.elapsed for e in group) * 1000:>8.1f} "
+                f"{sum(e.request_bytes + e.response_bytes for e in group):>9} "
+                f"{sum(e.retries for e in group):>7}  {method} {url} ({statuses})"
+            )
+    lines.append(
+        f"Total: {len(requests)} requests, "
+        f"{sum(e.request_bytes + e.response_bytes for e in requests)} bytes, "
+        f"{sum(e.elapsed for e in requests) * 1000:.1f} ms in requests"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,93 @@
+"""Streaming multipart uploads with progress reporting"""
+
+from dataclasses import dataclass
+import sys
+import time
+from typing import Any, Callable, Dict, TextIO, Tuple
+
+import requests
+from requests_toolbelt.multipart.encoder import MultipartEncoder, MultipartEncoderMonitor
+
+# Minimum delay between two progress lines printed by ProgressPrinter, in seconds
+PROGRESS_INTERVAL = 0.5
+
+MIB = 1024 * 1024
+
+
+@dataclass
+class UploadProgress:
+    """State of an upload in progress"""
+
+    bytes_sent: int
+    total_bytes: int
+    elapsed: float
+
+    @property
+    def percent(self) -> float:
+        return 100 * self.bytes_sent / self.total_bytes if self.total_bytes else 100
+
+    @property
+    def throughput(self) -> float:
+        """Average upload speed so far, in bytes per second"""
+        return self.bytes_sent / self.elapsed if self.elapsed > 0 else 0
+
+    @property
+    def done(self) -> bool:
+        return self.bytes_sent >= self.total_bytes
+
+    def __str__(self):
+        return (
+            f"{self.percent:3.0f}% {self.bytes_sent / MIB:.1f}/{self.total_bytes / MIB:.1f} MiB "
+            f"({self.throughput / MIB:.1f} MiB/s)"
+        )
+
+
+class ProgressPrinter:
+    """Upload progress callback that keeps a single progress line up to date"""
+
+    def __init__(self, stream: TextIO | None = None, interval: float = PROGRESS_INTERVAL):
+        self.stream = stream
+        self.interval = interval
+        self._last_print = None
+
+    def __call__(self, progress: UploadProgress):
+        now = time.monotonic()
+        if not progress.done and self._last_print is not None:
+            if now - self._last_print < self.interval:
+                return
+        self._last_print = now
+        stream = self.stream or sys.stdout
+        print(f"\r{progress}", end="\n" if progress.done else "", file=stream, flush=True)
+
+
+def create_multipart_encoder(
+    fields: Dict[str, Any], callback: Callable[[UploadProgress], None] | None = None
+) -> MultipartEncoderMonitor:
+    """Create a multipart body that is read from its files as it is sent.
+
+    fields maps part names to values, or to (filename, file object) or
+    (filename, file object, content type) tuples. Only one chunk of each file
+    is held in memory at a time. callback is called with the progress after
+    every chunk."""
+    start = time.monotonic()
+
+    def report(monitor: MultipartEncoderMonitor):
+        callback(UploadProgress(monitor.bytes_read, monitor.len, time.monotonic() - start))
+
+    return MultipartEncoderMonitor(MultipartEncoder(fields), report if callback else None)
+
+
+def post_multipart(
+    url: str,
+    fields: Dict[str, Any],
+    headers: Dict[str, str] | None = None,
+    callback: Callable[[UploadProgress], None] | None = None,
+    *,
+    timeout: float | Tuple[float, float],
+    **kwargs,
+) -> requests.Response:
+    """POST a streamed multipart body. timeout is the connect and read
+    timeouts of requests, and other arguments are passed to requests."""
+    body = create_multipart_encoder(fields, callback)
+    headers = {**(headers or {}), "Content-Type": body.content_type}
+    return requests.post(url, data=body, headers=headers, timeout=timeout, **kwargs)
@@ -0,0 +1,40 @@
+"""Apply command: bring the RSCs to a desired state"""
+
+import argparse
+
+from .. import desired_state
+from .prefetch import updates_resources
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments of the apply command"""
+    parser.add_argument(
+        "state_file",
+        help="JSON file with the desired settings. See the README for its format",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--dry-run",
+        help="Print the requests that would be sent, without sending them",
+        action="store_true",
+    )
+    parser.set_defaults(func=apply_desired_state)
+
+
+@updates_resources
+def apply_desired_state(args: argparse.Namespace):
+    """Send the requests needed to bring the RSC to the desired state. An RSC
+    already in that state gets no request."""
+    state = desired_state.load_desired_state(args.state_file)
+    plan = desired_state.compute_plan(args.rsc, state)
+    requests = plan.requests()
+    if not requests:
+        print("Already in the desired state")
+        return
+    for request in requests:
+        print(request)
+    if args.dry_run:
+        print(f"{len(requests)} requests planned")
+        return
+    desired_state.apply_plan(args.rsc, plan)
+    print(f"Desired state applied with {len(requests)} requests")
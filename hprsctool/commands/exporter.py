@@ -0,0 +1,50 @@
+"""Exporter command: serve the metrics of the RSCs over HTTP"""
+
+import argparse
+import signal
+import sys
+
+from .. import exporter
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments of the exporter command"""
+    parser.add_argument(
+        "--listen",
+        help="Address the metrics are served on (default: 127.0.0.1)",
+        default="127.0.0.1",
+    )
+    parser.add_argument(
+        "--port",
+        help=f"Port the metrics are served on (default: {exporter.DEFAULT_PORT})",
+        type=int,
+        default=exporter.DEFAULT_PORT,
+    )
+    parser.add_argument(
+        "--interval",
+        help="Seconds between two reads of each RSC "
+        f"(default: {exporter.DEFAULT_INTERVAL:.0f})",
+        type=float,
+        default=exporter.DEFAULT_INTERVAL,
+    )
+    parser.set_defaults(func=serve_metrics, handles_addresses=True)
+
+
+def serve_metrics(args: argparse.Namespace):
+    """Serve /metrics until interrupted, refreshing the RSCs in the background"""
+    metrics_exporter = exporter.Exporter(args.addresses, args.connect, args.interval, args.workers)
+    server = exporter.MetricsServer((args.listen, args.port), metrics_exporter)
+    # Stop cleanly, logging out of the RSCs, when run as a service
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with metrics_exporter:
+        print(
+            f"Serving the metrics of {len(metrics_exporter.targets)} RSCs on "
+            f"http://{args.listen}:{server.server_address[1]}/metrics",
+            flush=True,
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
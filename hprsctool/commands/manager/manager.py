@@ -2,6 +2,7 @@
 
 import argparse
 
+from ...comm import firmware_info
 from ...comm.remote_system_controller import RedfishError, Rsc
 from ...comm.operations import manager as manager_ops
 from . import network, cert, trusted_cert, time
@@ -46,6 +47,16 @@ def get_parameters(subparsers: argparse._SubParsersAction) -> None:
 
     update_parser = subparsers.add_parser("update", help="RSC firmware update")
     update_parser.add_argument("fw_file_path", help="Firmware file", action="store")
+    update_parser.add_argument(
+        "--target-version",
+        help="Version of the firmware file, if it is not part of its name",
+        action="store",
+    )
+    update_parser.add_argument(
+        "--force",
+        help="Update even if the RSC already runs the target version",
+        action="store_true",
+    )
     update_parser.set_defaults(func=update_firmware)
 
 
@@ -104,7 +115,16 @@ def change_password(args: argparse.Namespace):
 
 def update_firmware(args: argparse.Namespace):
     """Update the RSC firmware"""
-    manager_ops.update_rsc_firmware(args.rsc, args.fw_file_path)
+    info = firmware_info.get_firmware_info(args.fw_file_path, args.target_version)
+    # The version is also passed with --force, to confirm the update if the
+    # RSC restarts before the task is done
+    if not args.force:
+        if info.version is None:
+            print("Firmware version unknown, use --target-version to skip RSCs that are current")
+        elif manager_ops.is_firmware_current(args.rsc, info.version):
+            print(f"Firmware is already at version {info.version}, update skipped")
+            return
+    manager_ops.update_rsc_firmware(args.rsc, args.fw_file_path, info.version)
     print("Firmware updated")
 
 
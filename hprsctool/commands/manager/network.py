@@ -2,11 +2,15 @@
 
 import argparse
 
+from redfish.rest.v1 import RestResponse as RedfishRestResponse
+
 from hprsctool.comm import redfish_messages
 
 from ...models import ethernet_interface
+from ...comm.change_set import ChangeSet
 from ...comm.remote_system_controller import RedfishError, Rsc
 from ...comm.operations import network as network_ops
+from ..prefetch import updates_resources, uses_resources
 
 
 def get_parameters(parser: argparse.ArgumentParser) -> None:
@@ -72,6 +76,7 @@ def get_parameters(parser: argparse.ArgumentParser) -> None:
     set_network_parser.set_defaults(func=set_network_settings)
 
 
+@uses_resources(network_ops.ETHERNET_INTERFACE_URI, network_ops.NETWORK_PROTOCOL_URI)
 def print_network_settings(args: argparse.Namespace):
     rsc: Rsc = args.rsc
     current_network_settings = network_ops.get_manager_ethernet_interface(rsc)
@@ -101,6 +106,8 @@ def print_network_settings(args: argparse.Namespace):
         print(f"    {exclude}")
 
 
+@updates_resources
+@uses_resources(network_ops.ETHERNET_INTERFACE_URI)
 def set_network_settings(args: argparse.Namespace):
     rsc: Rsc = args.rsc
     current_network_settings = network_ops.get_manager_ethernet_interface(rsc)
@@ -112,20 +119,33 @@ def set_network_settings(args: argparse.Namespace):
     update_static_addresses(args, new_settings_body, dhcp_is_or_will_be_enabled)
     update_use_dns_servers(args, new_settings_body, dhcp_is_or_will_be_enabled)
 
-    response = rsc.monitor_task(network_ops.set_manager_ethernet_interface(rsc, new_settings_body))
-    if response.status < 200 or response.status >= 300:
-        raise RedfishError(
-            f"Failed to update network settings: "
-            f"{redfish_messages.get_error_message(response.dict)}")
-    
-    update_mdns_settings(args)
-    update_proxy_settings(args)
+    # All the changes are validated before any is sent, and each resource is
+    # patched once
+    change_set = ChangeSet()
+    change_set.add(network_ops.ETHERNET_INTERFACE_URI, new_settings_body)
+    update_mdns_settings(args, change_set)
+    update_proxy_settings(args, change_set)
+    send_changes(rsc, change_set, "network")
 
     print("Network settings updated")
 
 
-def update_proxy_settings(args: argparse.Namespace) -> None:
-    """Updates the proxy settings based on the provided arguments."""
+def send_changes(rsc: Rsc, change_set: ChangeSet, settings: str) -> None:
+    """Send the changes, waiting for the RSC to apply each one before the next"""
+
+    def check_applied(_url: str, response: RedfishRestResponse) -> None:
+        response = rsc.monitor_task(response)
+        if response.status < 200 or response.status >= 300:
+            raise RedfishError(
+                f"Failed to update {settings} settings: "
+                f"{redfish_messages.get_error_message(response.dict)}")
+
+    network_ops.send_changes(rsc, change_set, check_applied)
+
+
+def update_proxy_settings(args: argparse.Namespace, change_set: ChangeSet | None = None) -> None:
+    """Updates the proxy settings based on the provided arguments. The changes
+    are added to change_set if given, otherwise they are sent immediately."""
 
     rsc: Rsc = args.rsc
 
@@ -144,31 +164,29 @@ def update_proxy_settings(args: argparse.Namespace) -> None:
         manager_network_protocol.setdefault("Proxy", {})
         manager_network_protocol["Proxy"]["ExcludeAddresses"] = args.proxyexclude
 
-    if manager_network_protocol:
-        response = rsc.monitor_task(
-            network_ops.set_manager_network_protocol(rsc, manager_network_protocol))
-        if response.status < 200 or response.status >= 300:
-            raise RedfishError(
-                f"Failed to update proxy settings: "
-                f"{redfish_messages.get_error_message(response.dict)}")
+    pending = ChangeSet() if change_set is None else change_set
+    pending.add(network_ops.NETWORK_PROTOCOL_URI, manager_network_protocol)
+    if change_set is None:
+        send_changes(rsc, pending, "proxy")
 
-def update_mdns_settings(args: argparse.Namespace) -> None:
-    """Updates the mDNS discovery protocol setting based on the provided arguments."""
+def update_mdns_settings(args: argparse.Namespace, change_set: ChangeSet | None = None) -> None:
+    """Updates the mDNS discovery protocol setting based on the provided arguments.
+    The change is added to change_set if given, otherwise it is sent immediately."""
     if not hasattr(args, "mdns") or args.mdns is None:
         return  # Do not change mDNS if not specified
-    
+
     rsc: Rsc = args.rsc
     mdns_enabled = args.mdns == "enable"
     manager_network_protocol = {}
     manager_network_protocol.setdefault("Oem", {})
     manager_network_protocol["Oem"].setdefault("HP", {})
-    manager_network_protocol["Oem"]["HP"]["mDNSDiscoveryProtocol"] = {"ProtocolEnabled": mdns_enabled}
-    response = rsc.monitor_task(
-        network_ops.set_manager_network_protocol(rsc, manager_network_protocol))
-    if response.status < 200 or response.status >= 300:
-        raise RedfishError(
-            f"Failed to update mDNS settings: "
-            f"{redfish_messages.get_error_message(response.dict)}")
+    manager_network_protocol["Oem"]["HP"]["mDNSDiscoveryProtocol"] = {
+        "ProtocolEnabled": mdns_enabled
+    }
+    pending = ChangeSet() if change_set is None else change_set
+    pending.add(network_ops.NETWORK_PROTOCOL_URI, manager_network_protocol)
+    if change_set is None:
+        send_changes(rsc, pending, "mDNS")
 
 def update_dhcp(
     args: argparse.Namespace,
@@ -2,11 +2,13 @@
 
 import argparse
 
+from ...comm.change_set import ChangeSet
 from ...comm.remote_system_controller import Rsc
 from ...comm.operations import (
     manager as manager_ops,
     network as network_ops,
 )
+from ..prefetch import updates_resources, uses_resources
 
 
 def get_parameters(parser: argparse.ArgumentParser) -> None:
@@ -46,23 +48,18 @@ def get_parameters(parser: argparse.ArgumentParser) -> None:
     get_time_parser.set_defaults(func=get_time)
 
 
+@updates_resources
+@uses_resources(network_ops.NETWORK_PROTOCOL_URI)
 def set_time(args: argparse.Namespace):
     """Set the RSC time settings"""
     rsc: Rsc = args.rsc
     manager_net_protocol = network_ops.get_manager_network_protocol(rsc)
     time_settings = {}
-    net_protocol_settings = {}
-
-    ntp_is_or_will_be_enabled = manager_net_protocol.ntp.ntp_protocol_enabled
+    change_set = ChangeSet()
 
-    if args.ntp is not None:
-        ntp_is_or_will_be_enabled = args.ntp == "enable"
-        net_protocol_settings = {"NTP": {"ProtocolEnabled": ntp_is_or_will_be_enabled}}
-    if args.ntpserver is not None:
-        net_protocol_settings.setdefault("NTP", {})
-        net_protocol_settings["NTP"]["NTPServers"] = []
-        for server in args.ntpserver:
-            net_protocol_settings["NTP"]["NTPServers"].append(server)
+    ntp_is_or_will_be_enabled = update_ntp_settings(
+        args, manager_net_protocol.ntp.ntp_protocol_enabled, change_set
+    )
 
     if args.time is not None or args.offset is not None:
         if ntp_is_or_will_be_enabled:
@@ -72,14 +69,30 @@ def set_time(args: argparse.Namespace):
         if args.offset is not None:
             time_settings["DateTimeLocalOffset"] = args.offset
 
-    if net_protocol_settings:
-        network_ops.set_manager_network_protocol(rsc, net_protocol_settings)
+    network_ops.send_changes(rsc, change_set)
     if time_settings:
         manager_ops.update_manager(rsc, time_settings)
 
     print("Time settings updated")
 
 
+def update_ntp_settings(
+    args: argparse.Namespace, ntp_enabled: bool, change_set: ChangeSet
+) -> bool:
+    """Add the NTP changes requested by the arguments to change_set. Returns
+    True if NTP is or will be enabled."""
+    net_protocol_settings = {}
+    if args.ntp is not None:
+        ntp_enabled = args.ntp == "enable"
+        net_protocol_settings = {"NTP": {"ProtocolEnabled": ntp_enabled}}
+    if args.ntpserver is not None:
+        net_protocol_settings.setdefault("NTP", {})
+        net_protocol_settings["NTP"]["NTPServers"] = list(args.ntpserver)
+    change_set.add(network_ops.NETWORK_PROTOCOL_URI, net_protocol_settings)
+    return ntp_enabled
+
+
+@uses_resources(manager_ops.MANAGER_URI, network_ops.NETWORK_PROTOCOL_URI)
 def get_time(args: argparse.Namespace):
     """Get the RSC time settings"""
     rsc: Rsc = args.rsc
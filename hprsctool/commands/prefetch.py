@@ -0,0 +1,51 @@
+"""Declaration of the resources read and changed by a command"""
+
+import argparse
+import functools
+from typing import Callable
+
+from ..comm.remote_system_controller import PreconditionFailedError
+
+# Times a command changing resources is run when they keep being changed by
+# someone else between its reads and its writes
+CONFLICT_ATTEMPTS = 3
+
+Command = Callable[[argparse.Namespace], None]
+
+
+def uses_resources(*urls: str) -> Callable:
+    """Decorate a command that reads the resources at urls. They are fetched
+    concurrently before the command runs, so that its reads cost one round
+    trip in all instead of one each."""
+
+    def decorator(func: Command) -> Command:
+        @functools.wraps(func)
+        def command(args: argparse.Namespace):
+            with args.rsc.prefetch(list(urls)):
+                return func(args)
+
+        command.resources = urls
+        return command
+
+    return decorator
+
+
+def updates_resources(func: Command) -> Command:
+    """Decorate a command that reads resources to change them. With
+    conditional writes, its reads may be served from fresh cached responses,
+    and it is run again on new reads when a resource it changes was changed
+    by someone else after it was read."""
+
+    @functools.wraps(func)
+    def command(args: argparse.Namespace):
+        for attempt in range(1, CONFLICT_ATTEMPTS + 1):
+            try:
+                with args.rsc.reading_for_update():
+                    return func(args)
+            except PreconditionFailedError:
+                if attempt == CONFLICT_ATTEMPTS:
+                    raise
+                print("The settings were changed by someone else, reading them again", flush=True)
+        return None
+
+    return command
@@ -58,11 +58,10 @@ def print_system(args):
         print(f"  Type: {system.blink_code_state.type}")
         print(f"  Major: {system.blink_code_state.major}")
         print(f"  Minor: {system.blink_code_state.minor}")
-        print(
-            f"  Message: {redfish_messages.get_redfish_message(
-                args.rsc.config.base_url,
-                system.blink_code_state.message_id, [])}"
+        message = redfish_messages.get_redfish_message(
+            args.rsc.config.base_url, system.blink_code_state.message_id, []
         )
+        print(f"  Message: {message}")
 
 
 def power_system(args):
@@ -27,11 +27,7 @@ def get_parameters(subparser: argparse.ArgumentParser):
 def list_tasks(args: argparse.Namespace):
     """List the tasks"""
     rsc: Rsc = args.rsc
-    tasks = task_ops.get_task_collection(rsc)
-    for task_uri in tasks:
-        task = task_ops.get_task(rsc, task_uri.split("/")[-1])
-        if args.running and task.task_state != "Running":
-            continue
+    for task in task_ops.get_tasks(rsc, running_only=args.running):
         print(task)
 
 
@@ -0,0 +1,39 @@
+"""Creation of logged-in RSC clients from the command-line settings"""
+
+from .comm.remote_system_controller import RedfishConfig, Rsc
+from .comm.response_cache import DEFAULT_CACHE_DIR, ResponseCache
+from .comm.session_cache import DEFAULT_CACHE_FILE, SessionCache
+from .comm.trace import TraceHook, trace_phase
+
+
+def get_session_cache(cache_file: str | None) -> SessionCache | None:
+    """Get the session cache selected by --session-cache, if any"""
+    if cache_file is None:
+        return None
+    return SessionCache(cache_file or DEFAULT_CACHE_FILE)
+
+
+def connect_rsc(
+    address: str,
+    username: str,
+    password: str,
+    sessions: SessionCache | None = None,
+    response_cache_dir: str | None = None,
+    trace: TraceHook | None = None,
+) -> Rsc:
+    """Create an RSC client for an address and log in"""
+    config = RedfishConfig(f"https://{address}", username, password)
+    responses = None
+    if response_cache_dir is not None:
+        responses = ResponseCache(
+            config.base_url, cache_dir=response_cache_dir or DEFAULT_CACHE_DIR
+        )
+    if sessions is None:
+        thersc = Rsc(config, response_cache=responses, trace=trace)
+        thersc.login()
+    else:
+        # The service root is only needed if the cached session is rejected
+        thersc = Rsc(config, check_connectivity=False, response_cache=responses, trace=trace)
+        with trace_phase(trace, "session", thersc.address):
+            sessions.login(thersc)
+    return thersc
@@ -0,0 +1,303 @@
+"""Desired state of RSCs: compare it with their current state and apply the difference
+
+The desired state is a JSON file. Every setting is optional, and the settings
+that are left out are not changed:
+
+    {
+      "ntp": {"enabled": true, "servers": ["ntp1.example.com"]},
+      "network": {"dhcp": false, "static_address": "10.0.0.2",
+                  "subnet_mask": "255.255.255.0", "gateway": "10.0.0.1",
+                  "name_servers": ["10.0.0.53"]},
+      "proxy": {"enabled": true, "server": "http://proxy:8080", "exclude": ["localhost"]},
+      "mdns": false,
+      "time_offset": "+02:00",
+      "trusted_certificates": ["certs/ca.pem"]
+    }
+
+The "network" section also takes "use_dhcp_dns". Certificate paths are
+relative to the file. When "trusted_certificates" is given, it is the whole
+set: the RSC certificates that are not listed are deleted."""
+
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import re
+from typing import Any, Dict, List
+
+from .comm import redfish_messages
+from .comm.change_set import ChangeSet, difference
+from .comm.operations import (
+    manager as manager_ops,
+    network as network_ops,
+    trusted_cert as trusted_cert_ops,
+)
+from .comm.remote_system_controller import RedfishError, Rsc
+from .models import certificate, ethernet_interface
+
+# Type of each setting of the desired state, by section
+SCHEMA = {
+    "ntp": {"enabled": bool, "servers": list},
+    "network": {
+        "dhcp": bool,
+        "use_dhcp_dns": bool,
+        "static_address": str,
+        "subnet_mask": str,
+        "gateway": str,
+        "name_servers": list,
+    },
+    "proxy": {"enabled": bool, "server": str, "exclude": list},
+    "mdns": bool,
+    "time_offset": str,
+    "trusted_certificates": list,
+}
+
+TIME_OFFSET_PATTERN = re.compile(r"[+-]\d\d:\d\d")
+
+
+@dataclass
+class DesiredState:
+    """Validated desired state"""
+
+    settings: Dict[str, Any]
+    # Path of each trusted certificate file, by normalized fingerprint
+    certificates: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class PlannedRequest:
+    """A request needed to reach the desired state"""
+
+    method: str
+    url: str
+    detail: str = ""
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.url} {self.detail}".rstrip()
+
+
+@dataclass
+class Plan:
+    """The requests needed to bring an RSC to the desired state"""
+
+    manager_changes: Dict[str, Any] = field(default_factory=dict)
+    network_changes: ChangeSet = field(default_factory=ChangeSet)
+    added_certificates: List[str] = field(default_factory=list)
+    deleted_certificates: List[certificate.Certificate] = field(default_factory=list)
+
+    def requests(self) -> List[PlannedRequest]:
+        """The requests of the plan, in the order they are sent"""
+        requests = [
+            PlannedRequest(
+                "DELETE", f"{trusted_cert_ops.TRUSTED_CERTIFICATES_URI}/{cert.certificate_id}"
+            )
+            for cert in self.deleted_certificates
+        ]
+        requests += [
+            PlannedRequest("POST", trusted_cert_ops.TRUSTED_CERTIFICATES_URI, path)
+            for path in self.added_certificates
+        ]
+        if self.manager_changes:
+            requests.append(
+                PlannedRequest("PATCH", manager_ops.MANAGER_URI, json.dumps(self.manager_changes))
+            )
+        # Same order as network_ops.send_changes
+        for url in (network_ops.NETWORK_PROTOCOL_URI, network_ops.ETHERNET_INTERFACE_URI):
+            if url in self.network_changes:
+                requests.append(
+                    PlannedRequest("PATCH", url, json.dumps(self.network_changes.get(url)))
+                )
+        return requests
+
+    def __len__(self) -> int:
+        return len(self.requests())
+
+
+def validate_settings(settings: Any, schema: Dict[str, Any], name: str = ""):
+    """Raise a ValueError if the settings do not follow the schema"""
+    if not isinstance(settings, dict):
+        raise ValueError(f"{name or 'The desired state'} must be an object")
+    for key, value in settings.items():
+        setting = f"{name}.{key}" if name else key
+        if key not in schema:
+            raise ValueError(f"Unknown setting {setting}")
+        if isinstance(schema[key], dict):
+            validate_settings(value, schema[key], setting)
+        elif not isinstance(value, schema[key]):
+            raise ValueError(f"{setting} must be a {schema[key].__name__}")
+        elif schema[key] is list and not all(isinstance(item, str) for item in value):
+            raise ValueError(f"{setting} must be a list of strings")
+    if "time_offset" in settings and not TIME_OFFSET_PATTERN.fullmatch(settings["time_offset"]):
+        raise ValueError("time_offset must be in the format [+-]HH:MM")
+
+
+def load_desired_state(path: str) -> DesiredState:
+    """Read and validate a desired state file"""
+    try:
+        with open(path, "r", encoding="utf-8") as state_file:
+            settings = json.load(state_file)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read the desired state from {path}: {e}") from e
+    validate_settings(settings, SCHEMA)
+
+    certificates = {}
+    for cert_path in settings.get("trusted_certificates", []):
+        cert_path = str(Path(path).parent / cert_path)
+        try:
+            certificates[trusted_cert_ops.get_certificate_file_fingerprint(cert_path)] = cert_path
+        except FileNotFoundError as e:
+            raise ValueError(str(e)) from e
+    return DesiredState(settings, certificates)
+
+
+def plan_network_protocol(settings: Dict[str, Any], current: Dict[str, Any], plan: Plan):
+    """Add the NTP, proxy and mDNS changes to the plan"""
+    desired: Dict[str, Any] = {}
+    ntp = settings.get("ntp", {})
+    if "enabled" in ntp:
+        desired.setdefault("NTP", {})["ProtocolEnabled"] = ntp["enabled"]
+    if "servers" in ntp:
+        desired.setdefault("NTP", {})["NTPServers"] = ntp["servers"]
+
+    proxy = settings.get("proxy", {})
+    if proxy.get("enabled") and "server" not in proxy:
+        raise ValueError("Cannot enable proxy without specifying a proxy server")
+    for key, name in (
+        ("enabled", "Enabled"),
+        ("server", "ProxyServerURI"),
+        ("exclude", "ExcludeAddresses"),
+    ):
+        if key in proxy:
+            desired.setdefault("Proxy", {})[name] = proxy[key]
+
+    if "mdns" in settings:
+        desired["Oem"] = {"HP": {"mDNSDiscoveryProtocol": {"ProtocolEnabled": settings["mdns"]}}}
+
+    plan.network_changes.add(network_ops.NETWORK_PROTOCOL_URI, difference(desired, current))
+
+
+def plan_ethernet_interface(
+    settings: Dict[str, Any], current: ethernet_interface.EthernetInterface, plan: Plan
+):
+    """Add the addressing changes to the plan, with the checks of network set"""
+    network = settings.get("network", {})
+    dhcp_is_or_will_be_enabled = network.get("dhcp", current.dhcp)
+    desired: Dict[str, Any] = {}
+
+    if "dhcp" in network:
+        desired[ethernet_interface.DHCPV4_KEY] = {
+            ethernet_interface.DHCP_ENABLED_KEY: network["dhcp"]
+        }
+        if not network["dhcp"] and "static_address" not in network and not current.static_ips:
+            raise ValueError("Cannot disable DHCP without setting a static address")
+
+    if "use_dhcp_dns" in network:
+        if not dhcp_is_or_will_be_enabled:
+            raise ValueError("Cannot use DHCP DNS servers when DHCP is disabled")
+        desired.setdefault(ethernet_interface.DHCPV4_KEY, {})[
+            ethernet_interface.USE_DNS_SERVERS_KEY
+        ] = network["use_dhcp_dns"]
+
+    if "static_address" in network:
+        if dhcp_is_or_will_be_enabled:
+            raise ValueError("Cannot set a static address when DHCP is enabled")
+        if "subnet_mask" not in network:
+            raise ValueError("Static address requires a subnet mask")
+        address = {
+            ethernet_interface.ADDRESS_KEY: network["static_address"],
+            ethernet_interface.SUBNET_MASK_KEY: network["subnet_mask"],
+        }
+        if "gateway" in network:
+            address[ethernet_interface.GATEWAY_KEY] = network["gateway"]
+        desired[ethernet_interface.STATIC_IPV4_ADDRESSES_KEY] = [address]
+    elif "subnet_mask" in network or "gateway" in network:
+        raise ValueError("A subnet mask or a gateway requires a static address")
+
+    if "name_servers" in network:
+        desired[ethernet_interface.STATIC_NAME_SERVERS_KEY] = network["name_servers"]
+
+    plan.network_changes.add(network_ops.ETHERNET_INTERFACE_URI, difference(desired, current.data))
+
+
+def plan_trusted_certificates(
+    certificates: Dict[str, str], current: List[certificate.Certificate], plan: Plan
+):
+    """Add the trusted certificates that are missing, and delete the others.
+    Certificates whose fingerprint is unknown are left alone."""
+    installed = set()
+    for cert in current:
+        fingerprint = cert.normalized_fingerprint or certificate.get_pem_fingerprint(
+            cert.certificate
+        )
+        if fingerprint is None:
+            continue
+        installed.add(fingerprint)
+        if fingerprint not in certificates:
+            plan.deleted_certificates.append(cert)
+    plan.added_certificates = [
+        path for fingerprint, path in certificates.items() if fingerprint not in installed
+    ]
+
+
+def compute_plan(rsc: Rsc, state: DesiredState) -> Plan:
+    """Read the current state of the RSC and plan the fewest requests that
+    bring it to the desired state"""
+    settings = state.settings
+    plan = Plan()
+    urls = []
+    if {"ntp", "proxy", "mdns", "time_offset"} & settings.keys():
+        urls.append(network_ops.NETWORK_PROTOCOL_URI)
+    if "network" in settings:
+        urls.append(network_ops.ETHERNET_INTERFACE_URI)
+    if "time_offset" in settings:
+        urls.append(manager_ops.MANAGER_URI)
+
+    with rsc.prefetch(urls):
+        protocol = None
+        if network_ops.NETWORK_PROTOCOL_URI in urls:
+            protocol = network_ops.get_manager_network_protocol(rsc)
+            plan_network_protocol(settings, protocol.data, plan)
+        if "network" in settings:
+            plan_ethernet_interface(settings, network_ops.get_manager_ethernet_interface(rsc), plan)
+        if "time_offset" in settings:
+            manager = manager_ops.get_manager(rsc)
+            plan.manager_changes = difference(
+                {"DateTimeLocalOffset": settings["time_offset"]}, manager.data
+            )
+            ntp_is_or_will_be_enabled = settings.get("ntp", {}).get(
+                "enabled", protocol.ntp.ntp_protocol_enabled
+            )
+            if plan.manager_changes and ntp_is_or_will_be_enabled:
+                raise ValueError(
+                    "Can't manually set the time offset when NTP is or will be enabled"
+                )
+
+    if "trusted_certificates" in settings:
+        plan_trusted_certificates(
+            state.certificates, trusted_cert_ops.get_trusted_certificates(rsc), plan
+        )
+    return plan
+
+
+def check_response(rsc: Rsc, response, url: str):
+    """Wait for the RSC to apply a change, and raise a RedfishError if it failed"""
+    response = rsc.monitor_task(response)
+    if response.status < 200 or response.status >= 300:
+        raise RedfishError(
+            f"Failed to update {url}: {redfish_messages.get_error_message(response.dict)}"
+        )
+
+
+def apply_plan(rsc: Rsc, plan: Plan):
+    """Send the requests of the plan. The Ethernet interface is changed last,
+    as the RSC may move to another address."""
+    for cert in plan.deleted_certificates:
+        trusted_cert_ops.delete_trusted_certificate(rsc, cert.certificate_id)
+    for path in plan.added_certificates:
+        trusted_cert_ops.add_trusted_certificate(rsc, path)
+    if plan.manager_changes:
+        check_response(
+            rsc, manager_ops.update_manager(rsc, plan.manager_changes), manager_ops.MANAGER_URI
+        )
+    network_ops.send_changes(
+        rsc, plan.network_changes, lambda url, response: check_response(rsc, response, url)
+    )
@@ -0,0 +1,438 @@
+"""Exporter mode: serve the state of many RSCs as Prometheus/OpenMetrics metrics.
+
+Every RSC keeps a logged-in session and is read in the background, on its own
+schedule, by a bounded worker pool. Scrapes are answered from the last state
+read from each RSC, so their latency never depends on the RSCs."""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .comm.operations import manager as manager_ops
+from .comm.operations import network as network_ops
+from .comm.operations import system as system_ops
+from .comm.remote_system_controller import Rsc, SessionRejectedError
+from .fleet import DEFAULT_WORKERS
+from .models.manager import Manager
+from .models.manager_network_protocol import ManagerNetworkProtocol
+from .models.system import System
+
+DEFAULT_PORT = 9866
+# Seconds between two reads of the same RSC
+DEFAULT_INTERVAL = 60.0
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+POWER_STATES = ("On", "Off", "PoweringOn", "PoweringOff", "Paused")
+HEALTH_STATES = ("OK", "Warning", "Critical")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """State of an RSC as of its last refresh. The models are those of the
+    last successful refresh, and are kept when a refresh fails."""
+
+    address: str
+    up: bool = False
+    system: System | None = None
+    manager: Manager | None = None
+    network_protocol: ManagerNetworkProtocol | None = None
+    error: str | None = None
+    # Unix time of the last successful refresh
+    last_success: float | None = None
+    refresh_seconds: float = 0.0
+    failures: int = 0
+
+
+class Target:
+    """An RSC read by the exporter, with the session kept between refreshes"""
+
+    def __init__(self, address: str, connect: Callable[[str], Rsc]):
+        self.address = address
+        self.connect = connect
+        self.rsc: Rsc | None = None
+        self.snapshot = Snapshot(address)
+
+    def refresh(self) -> Snapshot:
+        """Read the RSC and replace the snapshot. A warm session rejected by
+        the RSC is logged out and replaced by a new login before the refresh
+        fails. Other failures keep the session for the next refresh."""
+        start = time.monotonic()
+        previous = self.snapshot
+        warm = self.rsc is not None
+        try:
+            try:
+                system, manager, network_protocol = self._read()
+            except SessionRejectedError:
+                if not warm:
+                    raise
+                # The session expired: log in again and retry once
+                self.close()
+                system, manager, network_protocol = self._read()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if isinstance(e, SessionRejectedError):
+                self.close()
+            snapshot = Snapshot(
+                self.address,
+                up=False,
+                system=previous.system,
+                manager=previous.manager,
+                network_protocol=previous.network_protocol,
+                error=str(e) or type(e).__name__,
+                last_success=previous.last_success,
+                refresh_seconds=time.monotonic() - start,
+                failures=previous.failures + 1,
+            )
+        else:
+            snapshot = Snapshot(
+                self.address,
+                up=True,
+                system=system,
+                manager=manager,
+                network_protocol=network_protocol,
+                last_success=time.time(),
+                refresh_seconds=time.monotonic() - start,
+                failures=previous.failures,
+            )
+        # Scrapes read the snapshot without locking: it is replaced, never changed
+        self.snapshot = snapshot
+        return snapshot
+
+    def _read(self) -> Tuple[System, Manager, ManagerNetworkProtocol]:
+        if self.rsc is None:
+            self.rsc = self.connect(self.address)
+        with self.rsc.prefetch(
+            [system_ops.SYSTEM_URI, manager_ops.MANAGER_URI, network_ops.NETWORK_PROTOCOL_URI]
+        ):
+            return (
+                system_ops.get_system(self.rsc),
+                manager_ops.get_manager(self.rsc),
+                network_ops.get_manager_network_protocol(self.rsc),
+            )
+
+    def close(self):
+        """Log out of the session, if there is one"""
+        rsc, self.rsc = self.rsc, None
+        if rsc is not None:
+            try:
+                rsc.logout()
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+
+
+class Exporter:
+    """Refreshes targets in the background and renders their metrics.
+
+    Each target is refreshed interval seconds after its previous refresh
+    started, by at most workers threads. A target whose refresh is still
+    running is not refreshed again until it finishes."""
+
+    def __init__(
+        self,
+        addresses: Iterable[str],
+        connect: Callable[[str], Rsc],
+        interval: float = DEFAULT_INTERVAL,
+        workers: int = DEFAULT_WORKERS,
+    ):
+        if interval <= 0:
+            raise ValueError("The refresh interval must be positive")
+        if workers < 1:
+            raise ValueError("The number of workers must be at least 1")
+        self.targets = {address: Target(address, connect) for address in addresses}
+        self.interval = interval
+        self.workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._running: set = set()
+        self._due: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def refresh_all(self) -> List[Snapshot]:
+        """Refresh every target now and wait for them"""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(Target.refresh, self.targets.values()))
+
+    def start(self):
+        """Start refreshing the targets in the background, all of them at once first"""
+        self._stop.clear()
+        now = time.monotonic()
+        self._due = dict.fromkeys(self.targets, now)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="exporter")
+        self._thread = threading.Thread(
+            target=self._schedule, name="exporter-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the refreshes and log out of every RSC"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        for target in self.targets.values():
+            target.close()
+
+    def __enter__(self) -> "Exporter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _schedule(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [
+                    address
+                    for address, when in self._due.items()
+                    if when <= now and address not in self._running
+                ]
+                for address in due:
+                    self._running.add(address)
+                    self._due[address] = now + self.interval
+            for address in due:
+                self._executor.submit(self._refresh, self.targets[address])
+            with self._lock:
+                waiting = [
+                    when for address, when in self._due.items() if address not in self._running
+                ]
+            # Targets still being refreshed are looked at again at least once a second
+            timeout = min(waiting, default=now + 1.0) - time.monotonic()
+            self._stop.wait(min(max(timeout, 0.0), 1.0))
+
+    def _refresh(self, target: Target):
+        try:
+            target.refresh()
+        finally:
+            with self._lock:
+                self._running.discard(target.address)
+
+    def snapshots(self) -> List[Snapshot]:
+        """Get the last snapshot of every target"""
+        return [target.snapshot for target in self.targets.values()]
+
+    def render(self, openmetrics: bool = True) -> str:
+        """Render the metrics of every target in the OpenMetrics text format,
+        or in the Prometheus 0.0.4 text format"""
+        return render_metrics(self.snapshots(), openmetrics)
+
+
+class MetricFamily:
+    """Samples of one metric, rendered in either text format"""
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        self.name = name
+        self.type = metric_type
+        self.help = help_text
+        self.samples: List[Tuple[str, Dict[str, str], float]] = []
+
+    def add(self, labels: Dict[str, str], value: float, suffix: str = ""):
+        """Add a sample, named after the family followed by suffix"""
+        self.samples.append((suffix, labels, value))
+
+    def render(self, openmetrics: bool) -> List[str]:
+        """Render the family. The Prometheus format has no info and stateset
+        types, and names counters after their _total sample."""
+        name, metric_type = self.name, self.type
+        if not openmetrics:
+            if metric_type == "info":
+                name, metric_type = f"{name}_info", "gauge"
+            elif metric_type == "stateset":
+                metric_type = "gauge"
+            elif metric_type == "counter":
+                name = f"{name}_total"
+        lines = [f"# HELP {name} {self.help}", f"# TYPE {name} {metric_type}"]
+        for suffix, labels, value in self.samples:
+            lines.append(f"{self.name}{suffix}{format_labels(labels)} {format_value(value)}")
+        return lines
+
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{key}="{escape_label_value(value)}"' for key, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def add_states(family: MetricFamily, labels: Dict[str, str], states: Iterable[str], current: str):
+    """Add the samples of a stateset, including current if it is not a known state"""
+    states = list(states)
+    if current not in states:
+        states.append(current)
+    for state in states:
+        family.add({**labels, family.name: state}, state == current)
+
+
+def render_metrics(snapshots: List[Snapshot], openmetrics: bool = True) -> str:
+    """Render the snapshots of the targets as metrics"""
+    families = {
+        name: MetricFamily(name, metric_type, help_text)
+        for name, metric_type, help_text in [
+            ("hprsctool_up", "gauge", "Whether the last refresh of the RSC succeeded"),
+            (
+                "hprsctool_last_success_timestamp_seconds",
+                "gauge",
+                "Time of the last successful refresh",
+            ),
+            ("hprsctool_refresh_duration_seconds", "gauge", "Duration of the last refresh"),
+            ("hprsctool_refresh_failures", "counter", "Failed refreshes of the RSC"),
+            ("hprsctool_system", "info", "System information"),
+            ("hprsctool_system_power_state", "stateset", "Power state of the system"),
+            ("hprsctool_system_health", "stateset", "Health of the system"),
+            ("hprsctool_system_boot", "info", "Boot state of the system"),
+            ("hprsctool_system_blink_code", "info", "Blink code reported by the system"),
+            ("hprsctool_system_blink_code_major", "gauge", "Major number of the blink code"),
+            ("hprsctool_system_blink_code_minor", "gauge", "Minor number of the blink code"),
+            ("hprsctool_manager", "info", "RSC information"),
+            ("hprsctool_manager_ntp_enabled", "gauge", "Whether NTP is enabled on the RSC"),
+            ("hprsctool_manager_proxy_enabled", "gauge", "Whether the RSC uses a proxy"),
+            (
+                "hprsctool_manager_mdns_enabled",
+                "gauge",
+                "Whether mDNS discovery is enabled on the RSC",
+            ),
+        ]
+    }
+
+    for snapshot in snapshots:
+        labels = {"rsc": snapshot.address}
+        families["hprsctool_up"].add(labels, snapshot.up)
+        if snapshot.last_success is not None:
+            families["hprsctool_last_success_timestamp_seconds"].add(labels, snapshot.last_success)
+        families["hprsctool_refresh_duration_seconds"].add(labels, snapshot.refresh_seconds)
+        families["hprsctool_refresh_failures"].add(labels, snapshot.failures, "_total")
+
+        system = snapshot.system
+        if system is not None:
+            families["hprsctool_system"].add(
+                {
+                    **labels,
+                    "manufacturer": system.manufacturer,
+                    "model": system.model,
+                    "serial_number": system.serial_number,
+                    "bios_version": system.bios_version,
+                },
+                1,
+                "_info",
+            )
+            add_states(
+                families["hprsctool_system_power_state"], labels, POWER_STATES, system.power_state
+            )
+            add_states(families["hprsctool_system_health"], labels, HEALTH_STATES, system.health)
+            families["hprsctool_system_boot"].add(
+                {
+                    **labels,
+                    "boot_state": system.boot_state,
+                    "main_board_adapter_state": system.main_board_adapter_state,
+                },
+                1,
+                "_info",
+            )
+            blink_code = system.blink_code_state
+            if blink_code is not None:
+                families["hprsctool_system_blink_code"].add(
+                    {**labels, "type": blink_code.type, "message_id": blink_code.message_id},
+                    1,
+                    "_info",
+                )
+                for part in ("major", "minor"):
+                    value = getattr(blink_code, part)
+                    if isinstance(value, int):
+                        families[f"hprsctool_system_blink_code_{part}"].add(labels, value)
+
+        if snapshot.manager is not None:
+            families["hprsctool_manager"].add(
+                {
+                    **labels,
+                    "model": snapshot.manager.model,
+                    "serial_number": snapshot.manager.serial_number,
+                    "firmware_version": snapshot.manager.firmware_version,
+                },
+                1,
+                "_info",
+            )
+
+        protocol = snapshot.network_protocol
+        if protocol is not None:
+            for name, enabled in [
+                ("ntp", protocol.ntp.ntp_protocol_enabled),
+                ("proxy", protocol.proxy.proxy_enabled),
+                ("mdns", protocol.mdns_protocol_enabled),
+            ]:
+                if enabled is not None:
+                    families[f"hprsctool_manager_{name}_enabled"].add(labels, bool(enabled))
+
+    lines = []
+    for family in families.values():
+        if family.samples:
+            lines.extend(family.render(openmetrics))
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves /metrics from the exporter of the server"""
+
+    server: "MetricsServer"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a scrape"""
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = self.server.exporter.render(openmetrics).encode()
+            content_type = OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+            self._send(200, body, content_type)
+        elif path == "/":
+            self._send(
+                200, b'<html><body><a href="/metrics">Metrics</a></body></html>\n', "text/html"
+            )
+        else:
+            self._send(404, b"Not found\n", "text/plain")
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """HTTP server of the metrics of an exporter"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], exporter: Exporter):
+        self.exporter = exporter
+        super().__init__(address, MetricsRequestHandler)
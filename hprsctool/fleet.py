@@ -0,0 +1,179 @@
+"""Fleet mode: run a command against many RSCs concurrently"""
+
+import argparse
+import contextlib
+import copy
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List
+
+from .comm.remote_system_controller import RedfishError, Rsc
+from .comm.task_scheduler import TaskEvent, TaskMonitorScheduler
+
+DEFAULT_WORKERS = 16
+
+
+@dataclass
+class HostResult:
+    """Outcome of running a command against a single RSC"""
+
+    address: str
+    succeeded: bool
+    output: str
+    error: str | None
+    elapsed: float
+
+
+def read_inventory(inventory_path: str) -> List[str]:
+    """Read RSC addresses from an inventory file.
+
+    One address per line. Blank lines and anything after a '#' are ignored,
+    and duplicated addresses are only returned once."""
+    addresses = []
+    with open(inventory_path, "r", encoding="utf-8") as inventory:
+        for line in inventory:
+            address = line.split("#", 1)[0].strip()
+            if address and address not in addresses:
+                addresses.append(address)
+    return addresses
+
+
+class _ThreadLocalStdout(io.TextIOBase):
+    """stdout replacement that sends each worker thread's output to its own buffer"""
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, s: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            return self.stream.write(s)
+        return buffer.write(s)
+
+    def flush(self):
+        if getattr(self.local, "buffer", None) is None:
+            self.stream.flush()
+
+
+@contextlib.contextmanager
+def _redirected_stdout() -> Iterator[_ThreadLocalStdout]:
+    """Install a thread-local stdout for the duration of a fleet run"""
+    original = sys.stdout
+    if isinstance(original, _ThreadLocalStdout):
+        # The agent already captures the output of each thread
+        yield original
+        return
+    proxy = _ThreadLocalStdout(original)
+    sys.stdout = proxy
+    try:
+        yield proxy
+    finally:
+        sys.stdout = original
+
+
+def run_on_host(
+    address: str,
+    args: argparse.Namespace,
+    connect: Callable[[str], Rsc],
+    stdout: _ThreadLocalStdout | None = None,
+) -> HostResult:
+    """Run args.func against a single RSC, capturing its output and any error"""
+    buffer = io.StringIO()
+    if stdout is not None:
+        stdout.local.buffer = buffer
+    error = None
+    start = time.monotonic()
+    try:
+        host_args = copy.copy(args)
+        host_args.rsc = connect(address)
+        host_args.func(host_args)
+    except ValueError as e:
+        error = f"Invalid parameters: {e}"
+    except RedfishError as e:
+        error = str(e)
+    # A failure on one host must never take down the rest of the fleet
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if stdout is not None:
+            stdout.local.buffer = None
+    return HostResult(
+        address=address,
+        succeeded=error is None,
+        output=buffer.getvalue(),
+        error=error,
+        elapsed=time.monotonic() - start,
+    )
+
+
+def run_fleet(
+    addresses: Iterable[str],
+    args: argparse.Namespace,
+    connect: Callable[[str], Rsc],
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[HostResult]:
+    """Run args.func against every address through a bounded worker pool.
+
+    Each host gets its own Rsc from connect(). Results are yielded as soon as
+    each host finishes, in completion order. The tasks the hosts start, e.g.
+    firmware updates or power changes, are all monitored by one scheduler,
+    which prints their progress to stderr."""
+    if workers < 1:
+        raise ValueError("The number of workers must be at least 1")
+
+    scheduler = TaskMonitorScheduler(max_workers=workers)
+
+    def print_task_event(event: TaskEvent):
+        if event.done:
+            print(
+                f"{event.key}: task {event.state}. {scheduler.progress}",
+                file=sys.stderr,
+                flush=True,
+            )
+
+    def connect_with_scheduler(address: str) -> Rsc:
+        rsc = connect(address)
+        rsc.task_scheduler = scheduler
+        return rsc
+
+    scheduler.start(print_task_event)
+    try:
+        with _redirected_stdout() as stdout, ThreadPoolExecutor(
+            max_workers=workers
+        ) as executor:
+            futures = [
+                executor.submit(run_on_host, address, args, connect_with_scheduler, stdout)
+                for address in addresses
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        scheduler.close()
+
+
+def print_host_result(result: HostResult):
+    """Print the output of a single host as one block"""
+    status = "OK" if result.succeeded else "FAILED"
+    print(f"=== {result.address} ({status}, {result.elapsed:.2f}s) ===")
+    if result.output:
+        print(result.output, end="" if result.output.endswith("\n") else "\n")
+    if result.error:
+        print(f"Error: {result.error}")
+    print(flush=True)
+
+
+def print_summary(results: List[HostResult]):
+    """Print the summary of a fleet run"""
+    failed = [result for result in results if not result.succeeded]
+    print(
+        f"Fleet summary: {len(results)} hosts, "
+        f"{len(results) - len(failed)} succeeded, {len(failed)} failed"
+    )
+    for result in sorted(failed, key=lambda r: r.address):
+        print(f"  {result.address}: {result.error}")
@@ -3,12 +3,13 @@
 import argparse
 import sys
 
-from .commands.manager import manager
-from .commands import system
-from .commands import task
-from .comm import remote_system_controller
-
-VERSION = "0.11.0"
+from .cli import (
+    VERSION,
+    add_agent_arguments,
+    add_version_argument,
+    create_argument_parser,
+    run,
+)
 
 
 def main():
@@ -24,66 +25,28 @@ def main():
         print("hprsctool", VERSION)
         sys.exit(0)
 
-    argparser = argparse.ArgumentParser(
-        description="HP RSC tool",
-        prog="hprsctool",
-        epilog="For help on a specific command, use hprsctool <command> -h",
-    )
-    argparser.add_argument(
-        "-u", "--username", help="Username for the RSC", required=True
-    )
-    argparser.add_argument(
-        "-p", "--password", help="Password for the RSC", required=True
-    )
-    argparser.add_argument("-a", "--address", help="Address of the RSC", required=True)
-
-    # Include version in the main argument parser so it shows up in the help text
-    add_version_argument(argparser)
-
-    top_level_subparsers = argparser.add_subparsers()
-    subparser = top_level_subparsers.add_parser("manager", help="Manager commands")
-    manager_subparsers = subparser.add_subparsers()
-
-    manager.get_parameters(manager_subparsers)
-
-    subparser = top_level_subparsers.add_parser("system", help="System commands")
-    system_subparsers = subparser.add_subparsers()
-    system.get_parameters(system_subparsers)
+    if remaining_args[:1] == ["agent"]:
+        # The agent serves any RSC and user, so it takes none of the global options
+        from . import agent  # pylint: disable=import-outside-toplevel
 
-    subparser = top_level_subparsers.add_parser("tasks", help="Task commands")
-    task_subparsers = subparser.add_subparsers()
-    task.get_parameters(task_subparsers)
+        agent.main(remaining_args[1:])
+        return
 
-    args = argparser.parse_args(remaining_args)
-    config = remote_system_controller.RedfishConfig(
-        f"https://{args.address}", args.username, args.password
-    )
+    # Forward the command line to the agent before parsing it, which imports
+    # the Redfish client. Without an agent, the command is run here.
+    agent_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    add_agent_arguments(agent_parser)
+    agent_args, remaining_args = agent_parser.parse_known_args(remaining_args)
+    if agent_args.agent:
+        from . import agent_client  # pylint: disable=import-outside-toplevel
 
-    if "func" not in args:
-        print("-- No action specified.")
-        argparser.print_help()
-        sys.exit(1)
+        exit_code = agent_client.run_command(remaining_args, agent_args.agent_socket)
+        if exit_code is not None:
+            sys.exit(exit_code)
 
-    try:
-        thersc = remote_system_controller.Rsc(config)
-        thersc.login()
-        args.rsc = thersc
-        args.func(args)
-    except ValueError as e:
-        print(f"Invalid parameters: {e}")
-        sys.exit(1)
-    except remote_system_controller.RedfishError as e:
-        print(e)
-        sys.exit(1)
+    argparser = create_argument_parser()
+    run(argparser.parse_args(remaining_args), argparser)
 
-def add_version_argument(parser):
-    """Add a --version argument to an argument parser"""
-    parser.add_argument(
-        "--version",
-        help="Print the program version and exit.",
-        required=False,
-        action="store_true",
-    )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,35 @@
+"""Base class of the Redfish models"""
+
+from typing import Any, Dict
+
+
+class Model:
+    """Read-only view of a Redfish resource.
+
+    The fields are read from the payload once, when the model is created, and
+    stored in slots, so reading them is a plain attribute access. The raw
+    payload is kept in data. Models cannot be changed once created."""
+
+    __slots__ = ("data",)
+
+    data: Any
+
+    # Message of the ValueError raised when the payload is missing
+    missing_data_message = "data is required"
+
+    def __init__(self, data: Any):
+        if data is None:
+            raise ValueError(self.missing_data_message)
+        object.__setattr__(self, "data", data)
+        for name, value in self._parse(data).items():
+            object.__setattr__(self, name, value)
+
+    def _parse(self, data: Any) -> Dict[str, Any]:
+        """Get the value of every field of the model from the payload"""
+        raise NotImplementedError
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is read-only")
@@ -1,6 +1,10 @@
 """Certificate models"""
 
-from typing import Any
+import hashlib
+import ssl
+from typing import Any, Dict
+
+from .base import Model
 
 # Sample certificate json:
 #
@@ -50,38 +54,37 @@ from typing import Any
 # }
 
 
-class Certificate:
+class Certificate(Model):
     """Certificate model"""
 
-    def __init__(self, data: Any) -> None:
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-
-    @property
-    def certificate(self) -> str:
-        """Get the certificate"""
-        return self.data.get("CertificateString", "N/A")
-
-    @property
-    def certificate_type(self) -> str:
-        """Get the certificate type"""
-        return self.data.get("CertificateType", "N/A")
-
-    @property
-    def certificate_expiration(self) -> str:
-        """Get the certificate expiration"""
-        return self.data.get("ValidNotAfter", "N/A")
+    __slots__ = (
+        "certificate",
+        "certificate_type",
+        "certificate_expiration",
+        "certificate_id",
+        "certificate_fingerprint",
+        "normalized_fingerprint",
+    )
 
-    @property
-    def certificate_id(self) -> str:
-        """Get the certificate ID"""
-        return self.data.get("Id", "N/A")
+    certificate: str
+    certificate_type: str
+    certificate_expiration: str
+    certificate_id: str
+    certificate_fingerprint: str
+    # Fingerprint in lowercase hex without separators, or None if the RSC did
+    # not report one
+    normalized_fingerprint: str | None
 
-    @property
-    def certificate_fingerprint(self) -> str:
-        """Get the certificate fingerprint"""
-        return self.data.get("Fingerprint", "N/A")
+    def _parse(self, data: Any) -> Dict[str, Any]:
+        fingerprint = data.get("Fingerprint")
+        return {
+            "certificate": data.get("CertificateString", "N/A"),
+            "certificate_type": data.get("CertificateType", "N/A"),
+            "certificate_expiration": data.get("ValidNotAfter", "N/A"),
+            "certificate_id": data.get("Id", "N/A"),
+            "certificate_fingerprint": data.get("Fingerprint", "N/A"),
+            "normalized_fingerprint": normalize_fingerprint(fingerprint) if fingerprint else None,
+        }
 
     def __str__(self) -> str:
         """Print the certificate"""
@@ -92,3 +95,18 @@ class Certificate:
             f"Expiration: {self.certificate_expiration}\n"
             f"Fingerprint: {self.certificate_fingerprint}"
         )
+
+
+def normalize_fingerprint(fingerprint: str) -> str:
+    """Normalize a fingerprint such as '1A:14:C7...' to '1a14c7...'"""
+    return "".join(c for c in fingerprint.lower() if c not in ": \n\t")
+
+
+def get_pem_fingerprint(pem: str) -> str | None:
+    """Get the normalized SHA-256 fingerprint of a PEM certificate, or None if
+    pem is not a certificate"""
+    try:
+        der = ssl.PEM_cert_to_DER_cert(pem.strip())
+    except (ValueError, AttributeError):
+        return None
+    return hashlib.sha256(der).hexdigest()
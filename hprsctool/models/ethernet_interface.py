@@ -1,5 +1,8 @@
 """Module defining the EthernetInterface class"""
 
+from typing import Any, Dict, List
+
+from .base import Model
 
 DHCPV4_KEY = "DHCPv4"
 DHCP_ENABLED_KEY = "DHCPEnabled"
@@ -17,77 +20,63 @@ GATEWAY_KEY = "Gateway"
 ADDRESS_ORIGIN_KEY = "AddressOrigin"
 
 
-class RedfishAddress:
+class RedfishAddress(Model):
     """Class defining a Redfish address"""
 
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("RedfishAddress: data is empty")
-        self.data = data
-
-    @property
-    def address(self):
-        return self.data.get(ADDRESS_KEY, "N/A")
+    __slots__ = ("address", "subnet_mask", "gateway", "origin")
 
-    @property
-    def subnet_mask(self):
-        return self.data.get(SUBNET_MASK_KEY, "N/A")
+    missing_data_message = "RedfishAddress: data is empty"
 
-    @property
-    def gateway(self):
-        return self.data.get(GATEWAY_KEY, "N/A")
+    address: str
+    subnet_mask: str
+    gateway: str
+    origin: str
 
-    @property
-    def origin(self):
-        return self.data.get(ADDRESS_ORIGIN_KEY, "N/A")
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {
+            "address": data.get(ADDRESS_KEY, "N/A"),
+            "subnet_mask": data.get(SUBNET_MASK_KEY, "N/A"),
+            "gateway": data.get(GATEWAY_KEY, "N/A"),
+            "origin": data.get(ADDRESS_ORIGIN_KEY, "N/A"),
+        }
 
 
-class EthernetInterface:
+class EthernetInterface(Model):
     """Class defining the EthernetInterface Redfish type"""
 
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("EthernetInterface: data is empty")
-        self.data = data
-
-    @property
-    def hostname(self) -> str:
-        return self.data.get(HOST_NAME_KEY, "N/A")
-
-    @property
-    def mac_address(self) -> str:
-        return self.data.get(MAC_ADDRESS_KEY, "N/A")
-
-    @property
-    def dhcp(self) -> bool:
-        return self.data.get(DHCPV4_KEY, {}).get(
-            DHCP_ENABLED_KEY, False
-        )
-
-    @property
-    def use_dns_servers(self) -> bool:
-        return self.data.get(DHCPV4_KEY, {}).get(
-            USE_DNS_SERVERS_KEY, False
-        )
-
-    @property
-    def ips(self) -> list:
-        return [
-            RedfishAddress(i)
-            for i in self.data.get(IPV4_ADDRESSES_KEY, [])
-        ]
-
-    @property
-    def static_ips(self) -> list:
-        return [
-            RedfishAddress(i)
-            for i in self.data.get(STATIC_IPV4_ADDRESSES_KEY, [])
-        ]
-
-    @property
-    def name_servers(self) -> list:
-        return self.data.get(NAME_SERVERS_KEY, [])
-
-    @property
-    def static_name_servers(self) -> list:
-        return self.data.get(STATIC_NAME_SERVERS_KEY, [])
+    __slots__ = (
+        "hostname",
+        "mac_address",
+        "dhcp",
+        "use_dns_servers",
+        "ips",
+        "static_ips",
+        "name_servers",
+        "static_name_servers",
+    )
+
+    missing_data_message = "EthernetInterface: data is empty"
+
+    hostname: str
+    mac_address: str
+    dhcp: bool
+    use_dns_servers: bool
+    ips: List[RedfishAddress]
+    static_ips: List[RedfishAddress]
+    name_servers: List[str]
+    static_name_servers: List[str]
+
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        dhcpv4 = data.get(DHCPV4_KEY, {})
+        return {
+            "hostname": data.get(HOST_NAME_KEY, "N/A"),
+            "mac_address": data.get(MAC_ADDRESS_KEY, "N/A"),
+            "dhcp": dhcpv4.get(DHCP_ENABLED_KEY, False),
+            "use_dns_servers": dhcpv4.get(USE_DNS_SERVERS_KEY, False),
+            "ips": [RedfishAddress(i) for i in data.get(IPV4_ADDRESSES_KEY, [])],
+            "static_ips": [
+                RedfishAddress(i) for i in data.get(STATIC_IPV4_ADDRESSES_KEY, [])
+            ],
+            "name_servers": data.get(NAME_SERVERS_KEY, []),
+            "static_name_servers": data.get(STATIC_NAME_SERVERS_KEY, []),
+        }
@@ -1,98 +1,85 @@
 """manager models"""
 
+from typing import Any, Dict
 
-class KVMSettings:
-    """Class defining KVM settings"""
-
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-
-    @property
-    def disable_video_on_kvm_idle(self):
-        return self.data.get("DisableVideoOnKVMIdle", None)
-
-    @property
-    def disable_collaboration(self):
-        return self.data.get("DisableCollaboration", None)
+from .base import Model
 
-    @property
-    def disable_collaboration_authorization(self):
-        return self.data.get("DisableCollaborationAuthorization", None)
-
-    @property
-    def port_range_begin(self):
-        return self.data.get("PortRangeBegin", None)
-
-    @property
-    def port_range_end(self):
-        return self.data.get("PortRangeEnd", None)
 
+class KVMSettings(Model):
+    """Class defining KVM settings"""
 
-class RSMStatus:
+    __slots__ = (
+        "disable_video_on_kvm_idle",
+        "disable_collaboration",
+        "disable_collaboration_authorization",
+        "port_range_begin",
+        "port_range_end",
+    )
+
+    disable_video_on_kvm_idle: bool | None
+    disable_collaboration: bool | None
+    disable_collaboration_authorization: bool | None
+    port_range_begin: int | None
+    port_range_end: int | None
+
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {
+            "disable_video_on_kvm_idle": data.get("DisableVideoOnKVMIdle", None),
+            "disable_collaboration": data.get("DisableCollaboration", None),
+            "disable_collaboration_authorization": data.get(
+                "DisableCollaborationAuthorization", None
+            ),
+            "port_range_begin": data.get("PortRangeBegin", None),
+            "port_range_end": data.get("PortRangeEnd", None),
+        }
+
+
+class RSMStatus(Model):
     """Class defining RSM status"""
 
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
+    __slots__ = ("binding_status", "organization")
 
-    @property
-    def binding_status(self):
-        return self.data.get("BindingStatus", "N/A")
+    binding_status: str
+    organization: str
 
-    @property
-    def organization(self):
-        return self.data.get("Organization", "N/A")
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {
+            "binding_status": data.get("BindingStatus", "N/A"),
+            "organization": data.get("Organization", "N/A"),
+        }
 
 
-class Manager:
+class Manager(Model):
     """Class defining a Manager"""
 
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-
-    @property
-    def firmware_version(self) -> str:
-        return self.data.get("FirmwareVersion", "N/A")
-
-    @property
-    def serial_number(self) -> str:
-        return self.data.get("SerialNumber", "N/A")
-
-    @property
-    def model(self) -> str:
-        return self.data.get("Model", "N/A")
-
-    @property
-    def kvm_settings(self) -> KVMSettings | None:
-        if (
-            "Oem" in self.data
-            and "HP" in self.data["Oem"]
-            and "KVMSettings" in self.data["Oem"]["HP"]
-        ):
-            return KVMSettings(self.data["Oem"]["HP"]["KVMSettings"])
-        return None
-
-    @property
-    def rsm_status(self) -> RSMStatus | None:
-        if (
-            "Oem" in self.data
-            and "HP" in self.data["Oem"]
-            and "HPRemoteSystemManagerBindingStatus" in self.data["Oem"]["HP"]
-        ):
-            return RSMStatus(
-                self.data["Oem"]["HP"]["HPRemoteSystemManagerBindingStatus"]
-            )
-        return None
-
-    @property
-    def date_time(self) -> str:
-        return self.data.get("DateTime", "N/A")
-
-    @property
-    def date_time_offset(self) -> str:
-        return self.data.get("DateTimeLocalOffset", "N/A")
+    __slots__ = (
+        "firmware_version",
+        "serial_number",
+        "model",
+        "kvm_settings",
+        "rsm_status",
+        "date_time",
+        "date_time_offset",
+    )
+
+    firmware_version: str
+    serial_number: str
+    model: str
+    kvm_settings: KVMSettings | None
+    rsm_status: RSMStatus | None
+    date_time: str
+    date_time_offset: str
+
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        oem = data.get("Oem", {}).get("HP", {})
+        kvm_settings = oem.get("KVMSettings")
+        rsm_status = oem.get("HPRemoteSystemManagerBindingStatus")
+        return {
+            "firmware_version": data.get("FirmwareVersion", "N/A"),
+            "serial_number": data.get("SerialNumber", "N/A"),
+            "model": data.get("Model", "N/A"),
+            "kvm_settings": KVMSettings(kvm_settings) if kvm_settings is not None else None,
+            "rsm_status": RSMStatus(rsm_status) if rsm_status is not None else None,
+            "date_time": data.get("DateTime", "N/A"),
+            "date_time_offset": data.get("DateTimeLocalOffset", "N/A"),
+        }
@@ -1,94 +1,76 @@
 """Module defining the ManagerNetworkProtocol class"""
 
-from typing import List
+from typing import Any, Dict, List
 
+from .base import Model
 
-class NTPSettings:
+
+class NTPSettings(Model):
     """NTP settings model"""
 
-    def __init__(self, data: dict) -> None:
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
+    __slots__ = ("ntp_servers", "ntp_protocol_enabled")
 
-    @property
-    def ntp_servers(self) -> List[str]:
-        """Get the NTP servers"""
-        return self.data.get("NTPServers", [])
+    ntp_servers: List[str]
+    ntp_protocol_enabled: bool | None
 
-    @property
-    def ntp_protocol_enabled(self) -> bool | None:
-        """Get the NTP protocol enabled"""
-        return self.data.get("ProtocolEnabled", None)
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {
+            "ntp_servers": data.get("NTPServers", []),
+            "ntp_protocol_enabled": data.get("ProtocolEnabled", None),
+        }
 
 
-class ProxySettings:
+class ProxySettings(Model):
     """Proxy settings model"""
 
-    def __init__(self, data: dict) -> None:
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-
-    @property
-    def proxy_enabled(self) -> bool | None:
-        """Get the proxy enabled"""
-        return self.data.get("Enabled", None)
-
-    @property
-    def exclude_addresses(self) -> List[str]:
-        """Get the exclude addresses"""
-        return self.data.get("ExcludeAddresses", [])
-
-    @property
-    def password_set(self) -> bool | None:
-        """Get the password set"""
-        return self.data.get("PasswordSet", None)
-
-    @property
-    def proxy_server_uri(self) -> str:
-        """Get the proxy server URI"""
-        return self.data.get("ProxyServerURI", "N/A")
-
-    @property
-    def username(self) -> str:
-        """Get the username"""
-        return self.data.get("Username", "N/A")
-
-
-class ManagerNetworkProtocol:
+    __slots__ = (
+        "proxy_enabled",
+        "exclude_addresses",
+        "password_set",
+        "proxy_server_uri",
+        "username",
+    )
+
+    proxy_enabled: bool | None
+    exclude_addresses: List[str]
+    password_set: bool | None
+    proxy_server_uri: str
+    username: str
+
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {
+            "proxy_enabled": data.get("Enabled", None),
+            "exclude_addresses": data.get("ExcludeAddresses", []),
+            "password_set": data.get("PasswordSet", None),
+            "proxy_server_uri": data.get("ProxyServerURI", "N/A"),
+            "username": data.get("Username", "N/A"),
+        }
+
+
+class ManagerNetworkProtocol(Model):
     """Manager network protocol model"""
 
-    def __init__(self, data: dict) -> None:
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-        self.ntp = NTPSettings(data.get("NTP", {}))
-        self.proxy = ProxySettings(data.get("Proxy", {}))
+    __slots__ = ("host_name", "ntp", "proxy", "mdns_protocol_enabled")
 
-    @property
-    def host_name(self) -> str:
-        """Get the host name"""
-        return self.data.get("HostName", "N/A")
+    host_name: str
+    ntp: NTPSettings
+    proxy: ProxySettings
+    mdns_protocol_enabled: bool | None
+
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        mdns = data.get("Oem", {}).get("HP", {}).get("mDNSDiscoveryProtocol", {})
+        return {
+            "host_name": data.get("HostName", "N/A"),
+            "ntp": NTPSettings(data.get("NTP", {})),
+            "proxy": ProxySettings(data.get("Proxy", {})),
+            "mdns_protocol_enabled": mdns.get("ProtocolEnabled", None),
+        }
 
     @property
     def ntp_settings(self) -> NTPSettings:
         """Get the NTP settings"""
         return self.ntp
 
-    @property
-    def mdns_protocol_enabled(self) -> bool | None:
-        """Get the mDNS protocol enabled"""
-        if (
-            "Oem" in self.data
-            and "HP" in self.data["Oem"]
-            and "mDNSDiscoveryProtocol" in self.data["Oem"]["HP"]
-        ):
-            return self.data["Oem"]["HP"]["mDNSDiscoveryProtocol"].get(
-                "ProtocolEnabled", None
-            )
-        return None
-
     @property
     def proxy_settings(self) -> ProxySettings:
         """Get the proxy settings"""
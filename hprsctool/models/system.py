@@ -2,6 +2,8 @@
 
 from typing import Any, Dict
 
+from .base import Model
+
 
 SAMPLE_SYSTEM_JSON = """{
   "@odata.type": "#ComputerSystem.v1_20_0.ComputerSystem",
@@ -86,144 +88,109 @@ SAMPLE_SYSTEM_JSON = """{
 }"""
 
 
-class ProcessorSummary:
+class ProcessorSummary(Model):
     """Class defining a processor summary"""
 
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-
-    @property
-    def core_count(self):
-        return self.data.get("CoreCount", "N/A")
+    __slots__ = ("core_count", "count", "model")
 
-    @property
-    def count(self):
-        return self.data.get("Count", "N/A")
+    core_count: int | str
+    count: int | str
+    model: str
 
-    @property
-    def model(self):
-        return self.data.get("Model", "N/A")
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {
+            "core_count": data.get("CoreCount", "N/A"),
+            "count": data.get("Count", "N/A"),
+            "model": data.get("Model", "N/A"),
+        }
 
 
 # pylint: disable=too-few-public-methods
-class MemorySummary:
+class MemorySummary(Model):
     """Class defining a memory summary"""
 
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
+    __slots__ = ("total_system_memory_gib",)
 
-    @property
-    def total_system_memory_gib(self):
-        return self.data.get("TotalSystemMemoryGiB", "N/A")
+    total_system_memory_gib: float | str
 
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {"total_system_memory_gib": data.get("TotalSystemMemoryGiB", "N/A")}
 
-class BlinkCodeState:
-    """Class defining a blink code state"""
 
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-
-    @property
-    def type(self):
-        return self.data.get("Type", "N/A")
+class BlinkCodeState(Model):
+    """Class defining a blink code state"""
 
-    @property
-    def major(self):
-        return self.data.get("Major", "N/A")
+    __slots__ = ("type", "major", "minor", "message_id")
 
-    @property
-    def minor(self):
-        return self.data.get("Minor", "N/A")
+    type: str
+    major: int | str
+    minor: int | str
+    message_id: str
 
-    @property
-    def message_id(self):
-        return self.data.get("MessageId", "N/A")
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {
+            "type": data.get("Type", "N/A"),
+            "major": data.get("Major", "N/A"),
+            "minor": data.get("Minor", "N/A"),
+            "message_id": data.get("MessageId", "N/A"),
+        }
 
 
-class System:
+class System(Model):
     """Class defining a system"""
 
-    def __init__(self, data: Dict[str, Any]):
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-
-    @property
-    def manufacturer(self):
-        return self.data.get("Manufacturer", "N/A")
-
-    @property
-    def model(self):
-        return self.data.get("Model", "N/A")
-
-    @property
-    def bios_version(self):
-        return self.data.get("BiosVersion", "N/A")
-
-    @property
-    def uuid(self):
-        return self.data.get("UUID", "N/A")
-
-    @property
-    def serial_number(self):
-        return self.data.get("SerialNumber", "N/A")
-
-    @property
-    def asset_tag(self):
-        return self.data.get("AssetTag", "N/A")
-
-    @property
-    def processor_summary(self):
-        return ProcessorSummary(self.data.get("ProcessorSummary", {}))
-
-    @property
-    def memory_summary(self):
-        return MemorySummary(self.data.get("MemorySummary", {}))
-
-    @property
-    def power_state(self):
-        return self.data.get("PowerState", "N/A")
-
-    @property
-    def indicator_led(self):
-        return self.data.get("IndicatorLED", "N/A")
-
-    @property
-    def health(self):
-        if "Status" in self.data:
-            return self.data["Status"].get("Health", "N/A")
-        return "N/A"
-
-    @property
-    def main_board_adapter_state(self):
-        if "Oem" in self.data and "HP" in self.data["Oem"]:
-            return self.data["Oem"]["HP"].get("MainBoardAdapterState", "N/A")
-        return "N/A"
-
-    @property
-    def boot_state(self):
-        if "Oem" in self.data and "HP" in self.data["Oem"]:
-            return self.data["Oem"]["HP"].get("BootState", "N/A")
-        return "N/A"
-
-    @property
-    def blink_code_state(self):
-        if (
-            "Oem" in self.data
-            and "HP" in self.data["Oem"]
-            and "BlinkCodeState" in self.data["Oem"]["HP"]
-        ):
-            return BlinkCodeState(self.data["Oem"]["HP"]["BlinkCodeState"])
-        return BlinkCodeState({})
-
-    @property
-    def boot_source_override_target(self):
-        if "Boot" in self.data:
-            return self.data["Boot"].get("BootSourceOverrideTarget", "N/A")
-        return "N/A"
+    __slots__ = (
+        "manufacturer",
+        "model",
+        "bios_version",
+        "uuid",
+        "serial_number",
+        "asset_tag",
+        "processor_summary",
+        "memory_summary",
+        "power_state",
+        "indicator_led",
+        "health",
+        "main_board_adapter_state",
+        "boot_state",
+        "blink_code_state",
+        "boot_source_override_target",
+    )
+
+    manufacturer: str
+    model: str
+    bios_version: str
+    uuid: str
+    serial_number: str
+    asset_tag: str
+    processor_summary: ProcessorSummary
+    memory_summary: MemorySummary
+    power_state: str
+    indicator_led: str
+    health: str
+    main_board_adapter_state: str
+    boot_state: str
+    blink_code_state: BlinkCodeState
+    boot_source_override_target: str
+
+    def _parse(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        oem = data.get("Oem", {}).get("HP", {})
+        return {
+            "manufacturer": data.get("Manufacturer", "N/A"),
+            "model": data.get("Model", "N/A"),
+            "bios_version": data.get("BiosVersion", "N/A"),
+            "uuid": data.get("UUID", "N/A"),
+            "serial_number": data.get("SerialNumber", "N/A"),
+            "asset_tag": data.get("AssetTag", "N/A"),
+            "processor_summary": ProcessorSummary(data.get("ProcessorSummary", {})),
+            "memory_summary": MemorySummary(data.get("MemorySummary", {})),
+            "power_state": data.get("PowerState", "N/A"),
+            "indicator_led": data.get("IndicatorLED", "N/A"),
+            "health": data.get("Status", {}).get("Health", "N/A"),
+            "main_board_adapter_state": oem.get("MainBoardAdapterState", "N/A"),
+            "boot_state": oem.get("BootState", "N/A"),
+            "blink_code_state": BlinkCodeState(oem.get("BlinkCodeState", {})),
+            "boot_source_override_target": data.get("Boot", {}).get(
+                "BootSourceOverrideTarget", "N/A"
+            ),
+        }
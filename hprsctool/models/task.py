@@ -1,41 +1,41 @@
 """Model for a task Redfish object"""
 
+from typing import Any, Dict, List
 
-class Task:
-    """Model for a task Redfish object"""
-
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("data is required")
-        self.data = data
-
-    @property
-    def task_id(self) -> str:
-        return self.data.get("Id", "N/A")
-
-    @property
-    def task_monitor(self) -> str:
-        return self.data.get("TaskMonitor", "N/A")
-
-    @property
-    def start_time(self) -> str:
-        return self.data.get("StartTime", "N/A")
+from .base import Model
 
-    @property
-    def end_time(self) -> str:
-        return self.data.get("EndTime", "N/A")
 
-    @property
-    def task_state(self) -> str:
-        return self.data.get("TaskState", "N/A")
-
-    @property
-    def task_status(self) -> str:
-        return self.data.get("TaskStatus", "N/A")
+class Task(Model):
+    """Model for a task Redfish object"""
 
-    @property
-    def name(self) -> str:
-        return self.data.get("Name", "N/A")
+    __slots__ = (
+        "task_id",
+        "task_monitor",
+        "start_time",
+        "end_time",
+        "task_state",
+        "task_status",
+        "name",
+    )
+
+    task_id: str
+    task_monitor: str
+    start_time: str
+    end_time: str
+    task_state: str
+    task_status: str
+    name: str
+
+    def _parse(self, data: dict) -> Dict[str, Any]:
+        return {
+            "task_id": data.get("Id", "N/A"),
+            "task_monitor": data.get("TaskMonitor", "N/A"),
+            "start_time": data.get("StartTime", "N/A"),
+            "end_time": data.get("EndTime", "N/A"),
+            "task_state": data.get("TaskState", "N/A"),
+            "task_status": data.get("TaskStatus", "N/A"),
+            "name": data.get("Name", "N/A"),
+        }
 
     def __str__(self):
         return (
@@ -49,15 +49,23 @@ class Task:
         )
 
 
-class TaskCollection:
+class TaskCollection(Model):
     """Model for a task collection Redfish object"""
 
-    def __init__(self, data: dict):
-        if data is None:
-            raise ValueError("data is required")
+    __slots__ = ("members", "tasks", "expanded")
+
+    members: List[str]
+    tasks: List[Task]
+    # True if every member of the collection was expanded
+    expanded: bool
+
+    def _parse(self, data: dict) -> Dict[str, Any]:
         if data.get("Members") is None:
             data["Members"] = []
-        self.members = [member["@odata.id"] for member in data["Members"]]
+        members = [member["@odata.id"] for member in data["Members"]]
+        # Members hold the whole task when the collection was read with $expand
+        tasks = [Task(member) for member in data["Members"] if "Id" in member]
+        return {"members": members, "tasks": tasks, "expanded": len(tasks) == len(members)}
 
     def __str__(self):
         return f"TaskCollection with {len(self.members)} tasks"
@@ -0,0 +1,5 @@
+"""Run the RSC simulator: python -m hprsctool.simulator"""
+
+from .server import main
+
+main()
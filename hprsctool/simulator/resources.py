@@ -0,0 +1,209 @@
+"""Resources served by a simulated RSC"""
+
+import copy
+import json
+from typing import Any, Dict
+
+from ..models.system import SAMPLE_SYSTEM_JSON
+
+SESSIONS_URI = "/redfish/v1/SessionService/Sessions"
+TASKS_URI = "/redfish/v1/TaskService/Tasks"
+TASK_MONITORS_URI = "/redfish/v1/TaskService/TaskMonitors"
+TRUSTED_CERTIFICATES_URI = "/redfish/v1/Managers/1/TrustedCertificates"
+HTTPS_CERTIFICATE_URI = "/redfish/v1/Managers/1/NetworkProtocol/HTTPS/Certificates/1"
+CERTIFICATE_LOCATIONS_URI = "/redfish/v1/CertificateService/CertificateLocations"
+MULTIPART_UPDATE_URI = "/redfish/v1/UpdateService/MultipartUpdate"
+
+# Registry of the messages used by the simulated resources. It has its own
+# name so that it never shadows a real registry in the registry cache.
+SIMULATOR_REGISTRY = "SimulatorBlinkCode.1.0.0"
+SIMULATOR_REGISTRY_JSON = {
+    "@odata.type": "#MessageRegistry.v1_4_0.MessageRegistry",
+    "Id": SIMULATOR_REGISTRY,
+    "Name": "Simulated blink code registry",
+    "Language": "en",
+    "RegistryPrefix": "SimulatorBlinkCode",
+    "RegistryVersion": "1.0.0",
+    "Messages": {
+        "NoError": {
+            "Description": "No blink code is active.",
+            "Message": "No error.",
+            "NumberOfArgs": 0,
+            "Severity": "OK",
+        }
+    },
+}
+
+INITIAL_FIRMWARE_VERSION = "1.0.0"
+
+
+def service_root(query_support: bool) -> Dict[str, Any]:
+    """Get the service root. With query_support, $expand and $filter are
+    advertised in ProtocolFeaturesSupported."""
+    root = {
+        "@odata.id": "/redfish/v1",
+        "@odata.type": "#ServiceRoot.v1_15_0.ServiceRoot",
+        "Id": "RootService",
+        "Name": "Root Service",
+        "RedfishVersion": "1.17.0",
+        "Systems": {"@odata.id": "/redfish/v1/Systems"},
+        "Managers": {"@odata.id": "/redfish/v1/Managers"},
+        "TaskService": {"@odata.id": "/redfish/v1/TaskService"},
+        "UpdateService": {"@odata.id": "/redfish/v1/UpdateService"},
+        "CertificateService": {"@odata.id": "/redfish/v1/CertificateService"},
+        "AccountService": {"@odata.id": "/redfish/v1/AccountService"},
+        "SessionService": {"@odata.id": "/redfish/v1/SessionService"},
+        "Links": {"Sessions": {"@odata.id": SESSIONS_URI}},
+    }
+    if query_support:
+        root["ProtocolFeaturesSupported"] = {
+            "ExpandQuery": {"ExpandAll": False, "Levels": False, "Links": True, "NoLinks": True},
+            "FilterQuery": True,
+        }
+    return root
+
+
+def system(index: int) -> Dict[str, Any]:
+    """Get the system of the simulated RSC number index"""
+    data = json.loads(SAMPLE_SYSTEM_JSON)
+    data["SerialNumber"] = f"SIM{index:07d}"
+    data["UUID"] = f"{index:032x}"
+    data["AssetTag"] = f"Simulated system {index}"
+    data["Oem"]["HP"]["BlinkCodeState"]["MessageId"] = f"{SIMULATOR_REGISTRY}.NoError"
+    return data
+
+
+def manager(index: int) -> Dict[str, Any]:
+    """Get the manager of the simulated RSC number index"""
+    return {
+        "@odata.id": "/redfish/v1/Managers/1",
+        "@odata.type": "#Manager.v1_18_0.Manager",
+        "Id": "1",
+        "Name": "Remote System Controller",
+        "Model": "HP Remote System Controller",
+        "SerialNumber": f"SIMRSC{index:07d}",
+        "FirmwareVersion": INITIAL_FIRMWARE_VERSION,
+        "DateTime": "2024-01-01T00:00:00+00:00",
+        "DateTimeLocalOffset": "+00:00",
+        "EthernetInterfaces": {"@odata.id": "/redfish/v1/Managers/1/EthernetInterfaces"},
+        "NetworkProtocol": {"@odata.id": "/redfish/v1/Managers/1/NetworkProtocol"},
+        "Oem": {
+            "HP": {
+                "KVMSettings": {
+                    "DisableVideoOnKVMIdle": False,
+                    "DisableCollaboration": False,
+                    "DisableCollaborationAuthorization": False,
+                    "PortRangeBegin": 5900,
+                    "PortRangeEnd": 5910,
+                },
+                "HPRemoteSystemManagerBindingStatus": {
+                    "BindingStatus": "Unbound",
+                    "Organization": "",
+                },
+            }
+        },
+    }
+
+
+def ethernet_interface(index: int) -> Dict[str, Any]:
+    """Get the eth0 interface of the simulated RSC number index"""
+    address = f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"
+    return {
+        "@odata.id": "/redfish/v1/Managers/1/EthernetInterfaces/eth0",
+        "@odata.type": "#EthernetInterface.v1_9_0.EthernetInterface",
+        "Id": "eth0",
+        "HostName": f"rsc-sim-{index}",
+        "MACAddress": ":".join(f"{byte:02X}" for byte in (2, 0) + tuple(index.to_bytes(4, "big"))),
+        "DHCPv4": {"DHCPEnabled": True, "UseDNSServers": True},
+        "IPv4Addresses": [
+            {
+                "Address": address,
+                "SubnetMask": "255.0.0.0",
+                "Gateway": "10.0.0.1",
+                "AddressOrigin": "DHCP",
+            }
+        ],
+        "IPv4StaticAddresses": [],
+        "NameServers": ["10.0.0.2"],
+        "StaticNameServers": [],
+    }
+
+
+def network_protocol(index: int) -> Dict[str, Any]:
+    """Get the network protocol settings of the simulated RSC number index"""
+    return {
+        "@odata.id": "/redfish/v1/Managers/1/NetworkProtocol",
+        "@odata.type": "#ManagerNetworkProtocol.v1_9_0.ManagerNetworkProtocol",
+        "Id": "NetworkProtocol",
+        "HostName": f"rsc-sim-{index}",
+        "NTP": {"ProtocolEnabled": False, "NTPServers": []},
+        "Proxy": {
+            "Enabled": False,
+            "ExcludeAddresses": [],
+            "PasswordSet": False,
+            "ProxyServerURI": "",
+            "Username": "",
+        },
+        "Oem": {"HP": {"mDNSDiscoveryProtocol": {"ProtocolEnabled": True}}},
+    }
+
+
+def https_certificate(index: int) -> Dict[str, Any]:
+    """Get the HTTPS certificate description of the simulated RSC number index"""
+    return {
+        "@odata.id": HTTPS_CERTIFICATE_URI,
+        "@odata.type": "#Certificate.v1_6_0.Certificate",
+        "Id": "1",
+        "Name": "HTTPS Certificate",
+        "CertificateString": "",
+        "CertificateType": "PEM",
+        "Subject": {"CommonName": f"rsc-sim-{index}", "Organization": "HP RSC"},
+        "ValidNotBefore": "2024-01-01T00:00:00Z",
+        "ValidNotAfter": "2034-01-01T00:00:00Z",
+        "Fingerprint": ":".join(f"{byte:02x}" for byte in index.to_bytes(32, "big")),
+        "FingerprintHashAlgorithm": "TPM_ALG_SHA256",
+    }
+
+
+def account() -> Dict[str, Any]:
+    """Get the account used to log in"""
+    return {
+        "@odata.id": "/redfish/v1/AccountService/Accounts/1",
+        "@odata.type": "#ManagerAccount.v1_10_0.ManagerAccount",
+        "Id": "1",
+        "UserName": "admin",
+        "RoleId": "Administrator",
+    }
+
+
+def initial_resources(index: int) -> Dict[str, Dict[str, Any]]:
+    """Get the resources of the simulated RSC number index that can be read
+    and patched, by URI"""
+    return {
+        "/redfish/v1/Systems/1": system(index),
+        "/redfish/v1/Managers/1": manager(index),
+        "/redfish/v1/Managers/1/EthernetInterfaces/eth0": ethernet_interface(index),
+        "/redfish/v1/Managers/1/NetworkProtocol": network_protocol(index),
+        HTTPS_CERTIFICATE_URI: https_certificate(index),
+        "/redfish/v1/AccountService/Accounts/1": account(),
+    }
+
+
+def merge_patch(target: Dict[str, Any], patch: Dict[str, Any]):
+    """Apply a PATCH body to a resource, merging nested objects"""
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_patch(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+def error_body(message_id: str, message: str) -> Dict[str, Any]:
+    """Get a Redfish error body with a single message"""
+    return {
+        "error": {
+            "code": message_id,
+            "message": message,
+            "@Message.ExtendedInfo": [{"MessageId": message_id, "Message": message}],
+        }
+    }
@@ -0,0 +1,832 @@
+"""Local Redfish RSC simulator for benchmarks and load tests.
+
+Serves any number of simulated RSCs from one process, each on its own port,
+over HTTPS when openssl is available to create a certificate. Responses can
+be delayed and failed at random, and firmware updates run as tasks that are
+followed through task monitors with Retry-After.
+
+Run it with: python -m hprsctool.simulator --count 200 --inventory rscs.txt
+"""
+
+import argparse
+import base64
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+from pathlib import Path
+import random
+import re
+import selectors
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+import uuid
+
+from ..comm.firmware_info import version_from_filename
+from ..comm.redfish_messages import PACKAGED_REGISTRIES_DIR
+from . import resources
+
+DEFAULT_USERNAME = "admin"
+DEFAULT_PASSWORD = "password"
+
+TASK_EVENT_REGISTRY = "TaskEvent.1.0.3"
+
+registry_path_regex = re.compile(r"/registries/en/(?P<registry>[\w.]+)\.json")
+filter_regex = re.compile(r"TaskState eq '(?P<state>\w+)'")
+
+
+@dataclass
+class SimulatorConfig:
+    """Behaviour of the simulated RSCs"""
+
+    username: str = DEFAULT_USERNAME
+    password: str = DEFAULT_PASSWORD
+    # Delay added to every response, and maximum random delay added on top of
+    # it, in seconds
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Fraction of the requests that fail with error_status
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Time a task takes to complete, in seconds, and the Retry-After sent by
+    # its task monitor while it runs (no header if 0)
+    task_duration: float = 2.0
+    retry_after: int = 1
+    # Fraction of the tasks that end in an exception
+    task_failure_rate: float = 0.0
+    # Advertise and honour $expand and $filter
+    query_support: bool = True
+    # Seed of the random delays and errors, for reproducible runs
+    seed: int | None = None
+
+
+@dataclass
+class SimulatorResponse:
+    """Response of a simulated RSC to one request"""
+
+    status: int
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RequestStats:
+    """Requests served by a simulated RSC. Byte counts are HTTP messages, before TLS."""
+
+    requests: Counter = field(default_factory=Counter)
+    bytes_received: int = 0
+    bytes_sent: int = 0
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def add(self, other: "RequestStats"):
+        """Add the counts of another RequestStats to this one"""
+        self.requests.update(other.requests)
+        self.bytes_received += other.bytes_received
+        self.bytes_sent += other.bytes_sent
+
+
+class SimulatedTask:
+    """Task of a simulated RSC. It completes task_duration seconds after it starts."""
+
+    def __init__(self, task_id: str, name: str, duration: float, fails: bool, on_success=None):
+        self.task_id = task_id
+        self.name = name
+        self.duration = duration
+        self.fails = fails
+        self.on_success = on_success
+        self.started = time.monotonic()
+        self.start_time = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.end_time = None
+        self.cancelled = False
+
+    @property
+    def uri(self) -> str:
+        return f"{resources.TASKS_URI}/{self.task_id}"
+
+    @property
+    def monitor_uri(self) -> str:
+        return f"{resources.TASK_MONITORS_URI}/{self.task_id}"
+
+    @property
+    def percent_complete(self) -> int:
+        if self.duration <= 0:
+            return 100
+        return min(100, int(100 * (time.monotonic() - self.started) / self.duration))
+
+    @property
+    def state(self) -> str:
+        """Redfish TaskState, completing the task when its time is up"""
+        if self.cancelled:
+            return "Cancelled"
+        if self.end_time is None and self.percent_complete >= 100:
+            self.end_time = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            if not self.fails and self.on_success is not None:
+                self.on_success()
+        if self.end_time is None:
+            return "Running"
+        return "Exception" if self.fails else "Completed"
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = self.state
+        percent = self.percent_complete
+        body = {
+            "@odata.id": self.uri,
+            "@odata.type": "#Task.v1_7_0.Task",
+            "Id": self.task_id,
+            "Name": self.name,
+            "TaskState": state,
+            "TaskStatus": {"Exception": "Critical", "Cancelled": "Warning"}.get(state, "OK"),
+            "PercentComplete": percent,
+            "StartTime": self.start_time,
+            "TaskMonitor": self.monitor_uri,
+            "Messages": [
+                {
+                    "MessageId": f"{TASK_EVENT_REGISTRY}.TaskProgressChanged",
+                    "Message": f"The task with Id '{self.task_id}' has changed to "
+                    f"progress {percent} percent complete.",
+                    "MessageArgs": [self.task_id, str(percent)],
+                }
+            ],
+        }
+        if self.end_time is not None:
+            body["EndTime"] = self.end_time
+        return body
+
+
+class SimulatedRsc:
+    """State and request handling of one simulated RSC"""
+
+    def __init__(self, index: int, config: SimulatorConfig):
+        self.index = index
+        self.config = config
+        self.password = config.password
+        self.resources = resources.initial_resources(index)
+        self.sessions: Dict[str, str] = {}
+        self.tasks: Dict[str, SimulatedTask] = {}
+        self.trusted_certificates: Dict[str, Dict[str, Any]] = {}
+        self.stats = RequestStats()
+        self._etags: Dict[str, str] = {}
+        self._etag_counter = itertools.count(1)
+        self._ids = itertools.count(1)
+        self._forced_errors: List[int] = []
+        seed = None if config.seed is None else config.seed + index
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        for uri in self.resources:
+            self._touch(uri)
+
+    def expire_sessions(self):
+        """Drop every session, as an RSC that restarts does"""
+        with self._lock:
+            self.sessions.clear()
+
+    def inject_errors(self, count: int = 1, status: int | None = None):
+        """Fail the next count requests with status, or the configured error status"""
+        with self._lock:
+            self._forced_errors.extend([status or self.config.error_status] * count)
+
+    def response_delay(self) -> float:
+        """Get the time to wait before answering a request"""
+        if not self.config.jitter:
+            return self.config.latency
+        with self._lock:
+            return self.config.latency + self._random.uniform(0, self.config.jitter)
+
+    def handle(self, method: str, target: str, headers, body: bytes) -> SimulatorResponse:
+        """Answer one request. headers is a case-insensitive mapping."""
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        with self._lock:
+            error = self._injected_error()
+            if error is not None:
+                return error
+            if path in ("/redfish", "/redfish/v1"):
+                return self._get_only(
+                    method, lambda: resources.service_root(self.config.query_support)
+                )
+            match = registry_path_regex.fullmatch(path)
+            if match:
+                return self._get_registry(method, match.group("registry"))
+            if path == resources.SESSIONS_URI and method == "POST":
+                return self._create_session(body)
+            if not self._authorized(headers):
+                return SimulatorResponse(
+                    401,
+                    resources.error_body(
+                        "Base.1.8.1.NoValidSession", "There is no valid session."
+                    ),
+                )
+            return self._route(method, path, query, headers, body)
+
+    def _injected_error(self) -> SimulatorResponse | None:
+        if self._forced_errors:
+            status = self._forced_errors.pop(0)
+        elif self.config.error_rate and self._random.random() < self.config.error_rate:
+            status = self.config.error_status
+        else:
+            return None
+        headers = {"Retry-After": "1"} if status == 503 else {}
+        return SimulatorResponse(
+            status,
+            resources.error_body("Base.1.8.1.ServiceTemporarilyUnavailable", "Simulated error."),
+            headers,
+        )
+
+    # pylint: disable=too-many-return-statements,too-many-branches
+    def _route(self, method: str, path: str, query: Dict[str, str], headers, body: bytes):
+        if path.startswith(resources.SESSIONS_URI + "/"):
+            return self._session(method, path)
+        if path == resources.TASKS_URI:
+            return self._get_only(method, lambda: self._task_collection(query))
+        if path.startswith(resources.TASK_MONITORS_URI + "/"):
+            return self._task_monitor(method, path.rsplit("/", 1)[1])
+        if path.startswith(resources.TASKS_URI + "/"):
+            task_id, _, rest = path[len(resources.TASKS_URI) + 1:].partition("/")
+            if rest == "Monitor":
+                return self._task_monitor(method, task_id)
+            if rest == "" and task_id in self.tasks:
+                return self._get_only(method, self.tasks[task_id].to_dict)
+            return self._not_found(path)
+        if path == resources.MULTIPART_UPDATE_URI:
+            if method != "POST":
+                return self._not_allowed()
+            return self._multipart_update(headers, body)
+        if path == resources.TRUSTED_CERTIFICATES_URI:
+            if method == "POST":
+                return self._add_trusted_certificate(body)
+            return self._get_only(method, self._trusted_certificate_collection)
+        if path.startswith(resources.TRUSTED_CERTIFICATES_URI + "/"):
+            return self._trusted_certificate(method, path.rsplit("/", 1)[1])
+        if path == resources.CERTIFICATE_LOCATIONS_URI:
+            return self._get_only(method, lambda: self._certificate_locations(query))
+        if "/Actions/" in path:
+            if method != "POST":
+                return self._not_allowed()
+            return self._action(path, body)
+        if path in self.resources:
+            if method == "GET":
+                return self._get_resource(path, headers)
+            if method == "PATCH":
+                return self._patch_resource(path, headers, body)
+            return self._not_allowed()
+        return self._not_found(path)
+
+    def _get_only(self, method: str, get_body) -> SimulatorResponse:
+        if method != "GET":
+            return self._not_allowed()
+        return SimulatorResponse(200, get_body())
+
+    @staticmethod
+    def _not_found(path: str) -> SimulatorResponse:
+        return SimulatorResponse(
+            404,
+            resources.error_body(
+                "Base.1.8.1.ResourceNotFound", f"The resource {path} was not found."
+            ),
+        )
+
+    @staticmethod
+    def _not_allowed() -> SimulatorResponse:
+        return SimulatorResponse(
+            405,
+            resources.error_body("Base.1.8.1.OperationNotAllowed", "The operation is not allowed."),
+        )
+
+    @staticmethod
+    def _bad_request(message: str) -> SimulatorResponse:
+        return SimulatorResponse(400, resources.error_body("Base.1.8.1.GeneralError", message))
+
+    @staticmethod
+    def _read_json(body: bytes) -> Dict[str, Any] | None:
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _authorized(self, headers) -> bool:
+        token = headers.get("X-Auth-Token")
+        if token:
+            return token in self.sessions
+        authorization = headers.get("Authorization", "")
+        if authorization.startswith("Basic "):
+            try:
+                credentials = base64.b64decode(authorization[6:]).decode("utf-8")
+            except ValueError:
+                return False
+            return credentials == f"{self.config.username}:{self.password}"
+        return False
+
+    def _create_session(self, body: bytes) -> SimulatorResponse:
+        data = self._read_json(body) or {}
+        if (data.get("UserName"), data.get("Password")) != (self.config.username, self.password):
+            return SimulatorResponse(
+                401,
+                resources.error_body(
+                    "Base.1.8.1.InvalidCredentials", "Invalid username or password."
+                ),
+            )
+        token = uuid.uuid4().hex
+        session_id = str(next(self._ids))
+        self.sessions[token] = session_id
+        location = f"{resources.SESSIONS_URI}/{session_id}"
+        return SimulatorResponse(
+            201,
+            {"@odata.id": location, "Id": session_id, "UserName": self.config.username},
+            {"X-Auth-Token": token, "Location": location},
+        )
+
+    def _session(self, method: str, path: str) -> SimulatorResponse:
+        session_id = path.rsplit("/", 1)[1]
+        tokens = [token for token, value in self.sessions.items() if value == session_id]
+        if not tokens:
+            return self._not_found(path)
+        if method == "DELETE":
+            del self.sessions[tokens[0]]
+            return SimulatorResponse(204)
+        return self._get_only(
+            method, lambda: {"@odata.id": path, "Id": session_id, "UserName": self.config.username}
+        )
+
+    def _get_registry(self, method: str, registry: str) -> SimulatorResponse:
+        if registry == resources.SIMULATOR_REGISTRY:
+            return self._get_only(method, lambda: resources.SIMULATOR_REGISTRY_JSON)
+        registry_file = PACKAGED_REGISTRIES_DIR / f"{registry}.json"
+        if not registry_file.is_file():
+            return self._not_found(f"/registries/en/{registry}.json")
+        return self._get_only(method, lambda: json.loads(registry_file.read_text(encoding="utf-8")))
+
+    def _touch(self, uri: str):
+        self._etags[uri] = f'W/"{next(self._etag_counter)}"'
+
+    def _get_resource(self, path: str, headers) -> SimulatorResponse:
+        etag = self._etags[path]
+        if headers.get("If-None-Match") == etag:
+            return SimulatorResponse(304, None, {"ETag": etag})
+        return SimulatorResponse(200, self.resources[path], {"ETag": etag})
+
+    def _patch_resource(self, path: str, headers, body: bytes) -> SimulatorResponse:
+        if_match = headers.get("If-Match")
+        if if_match and if_match not in ("*", self._etags[path]):
+            return SimulatorResponse(
+                412,
+                resources.error_body(
+                    "Base.1.8.1.PreconditionFailed",
+                    "The ETag supplied did not match the ETag required.",
+                ),
+            )
+        patch = self._read_json(body)
+        if patch is None:
+            return self._bad_request("The request body is not a JSON object.")
+        if path == "/redfish/v1/AccountService/Accounts/1" and "Password" in patch:
+            self.password = patch.pop("Password")
+        resources.merge_patch(self.resources[path], patch)
+        self._touch(path)
+        return SimulatorResponse(200, self.resources[path], {"ETag": self._etags[path]})
+
+    def _action(self, path: str, body: bytes) -> SimulatorResponse:
+        data = self._read_json(body)
+        if data is None:
+            return self._bad_request("The request body is not a JSON object.")
+        if path == "/redfish/v1/Systems/1/Actions/ComputerSystem.Reset":
+            allowed = self.resources["/redfish/v1/Systems/1"]["Actions"]["#ComputerSystem.Reset"][
+                "ResetType@Redfish.AllowableValues"
+            ]
+            if data.get("ResetType") not in allowed:
+                return self._bad_request(f"ResetType must be one of {', '.join(allowed)}.")
+            power_state = "Off" if data["ResetType"] in ("ForceOff", "GracefulShutdown") else "On"
+            self.resources["/redfish/v1/Systems/1"]["PowerState"] = power_state
+            self._touch("/redfish/v1/Systems/1")
+            return SimulatorResponse(204)
+        if path in (
+            "/redfish/v1/Managers/1/Actions/Manager.Reset",
+            "/redfish/v1/Managers/1/Actions/Manager.ResetToDefaults",
+        ):
+            return SimulatorResponse(204)
+        if path == "/redfish/v1/CertificateService/Actions/CertificateService.ReplaceCertificate":
+            if not data.get("CertificateString"):
+                return self._bad_request("CertificateString is required.")
+            self.resources[resources.HTTPS_CERTIFICATE_URI]["CertificateString"] = data[
+                "CertificateString"
+            ]
+            self._touch(resources.HTTPS_CERTIFICATE_URI)
+            return SimulatorResponse(204)
+        return self._not_found(path)
+
+    def _start_task(self, name: str, on_success=None) -> SimulatedTask:
+        fails = bool(self.config.task_failure_rate) and (
+            self._random.random() < self.config.task_failure_rate
+        )
+        task = SimulatedTask(
+            str(next(self._ids)), name, self.config.task_duration, fails, on_success
+        )
+        self.tasks[task.task_id] = task
+        return task
+
+    def _task_monitor_response(self, task: SimulatedTask) -> SimulatorResponse:
+        state = task.state
+        if state == "Running":
+            headers = {"Location": task.monitor_uri}
+            if self.config.retry_after:
+                headers["Retry-After"] = str(self.config.retry_after)
+            return SimulatorResponse(202, task.to_dict(), headers)
+        if state == "Exception":
+            return SimulatorResponse(
+                500, resources.error_body("Base.1.8.1.InternalError", f"Task {task.name} failed.")
+            )
+        return SimulatorResponse(200, task.to_dict())
+
+    def _task_monitor(self, method: str, task_id: str) -> SimulatorResponse:
+        task = self.tasks.get(task_id)
+        if task is None:
+            return self._not_found(f"{resources.TASK_MONITORS_URI}/{task_id}")
+        if method == "DELETE":
+            task.cancelled = True
+            return SimulatorResponse(204)
+        if method != "GET":
+            return self._not_allowed()
+        return self._task_monitor_response(task)
+
+    def _task_collection(self, query: Dict[str, str]) -> Dict[str, Any]:
+        tasks = list(self.tasks.values())
+        if self.config.query_support and "$filter" in query:
+            match = filter_regex.fullmatch(query["$filter"])
+            if match:
+                tasks = [task for task in tasks if task.state == match.group("state")]
+        expand = self.config.query_support and query.get("$expand", "").startswith(".")
+        return {
+            "@odata.id": resources.TASKS_URI,
+            "@odata.type": "#TaskCollection.TaskCollection",
+            "Name": "Task Collection",
+            "Members@odata.count": len(tasks),
+            "Members": [task.to_dict() if expand else {"@odata.id": task.uri} for task in tasks],
+        }
+
+    def _multipart_update(self, headers, body: bytes) -> SimulatorResponse:
+        content_type = headers.get("Content-Type", "")
+        if not content_type.startswith("multipart/form-data"):
+            return self._bad_request("The request must be multipart/form-data.")
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        update_file = None
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "UpdateFile":
+                update_file = part
+        if update_file is None:
+            return self._bad_request("The UpdateFile part is missing.")
+        version = version_from_filename(update_file.get_filename() or "")
+
+        def apply_update():
+            if version:
+                self.resources["/redfish/v1/Managers/1"]["FirmwareVersion"] = version
+                self._touch("/redfish/v1/Managers/1")
+
+        task = self._start_task("Firmware update", apply_update)
+        return self._task_monitor_response(task)
+
+    def _trusted_certificate_collection(self) -> Dict[str, Any]:
+        return {
+            "@odata.id": resources.TRUSTED_CERTIFICATES_URI,
+            "@odata.type": "#CertificateCollection.CertificateCollection",
+            "Name": "Trusted Certificates",
+            "Members@odata.count": len(self.trusted_certificates),
+            "Members": [
+                {"@odata.id": cert["@odata.id"]} for cert in self.trusted_certificates.values()
+            ],
+        }
+
+    def _add_trusted_certificate(self, body: bytes) -> SimulatorResponse:
+        data = self._read_json(body) or {}
+        try:
+            der = ssl.PEM_cert_to_DER_cert(data.get("CertificateString", "").strip())
+        except (ValueError, AttributeError):
+            return self._bad_request("CertificateString is not a PEM certificate.")
+        fingerprint = hashlib.sha256(der).hexdigest()
+        cert_id = str(uuid.uuid4())
+        uri = f"{resources.TRUSTED_CERTIFICATES_URI}/{cert_id}"
+        self.trusted_certificates[cert_id] = {
+            "@odata.id": uri,
+            "@odata.type": "#Certificate.v1_6_0.Certificate",
+            "Id": cert_id,
+            "Name": "Trusted Certificate",
+            "CertificateString": data["CertificateString"],
+            "CertificateType": data.get("CertificateType", "PEM"),
+            "Fingerprint": ":".join(re.findall("..", fingerprint)),
+            "FingerprintHashAlgorithm": "TPM_ALG_SHA256",
+        }
+        return SimulatorResponse(201, self.trusted_certificates[cert_id], {"Location": uri})
+
+    def _trusted_certificate(self, method: str, cert_id: str) -> SimulatorResponse:
+        if cert_id not in self.trusted_certificates:
+            return self._not_found(f"{resources.TRUSTED_CERTIFICATES_URI}/{cert_id}")
+        if method == "DELETE":
+            del self.trusted_certificates[cert_id]
+            return SimulatorResponse(204)
+        return self._get_only(method, lambda: self.trusted_certificates[cert_id])
+
+    def _certificate_locations(self, query: Dict[str, str]) -> Dict[str, Any]:
+        certificates = [self.resources[resources.HTTPS_CERTIFICATE_URI]]
+        certificates += list(self.trusted_certificates.values())
+        expand = self.config.query_support and query.get("$expand", "").startswith("~")
+        return {
+            "@odata.id": resources.CERTIFICATE_LOCATIONS_URI,
+            "@odata.type": "#CertificateLocations.v1_0_2.CertificateLocations",
+            "Id": "CertificateLocations",
+            "Name": "Certificate Locations",
+            "Links": {
+                "Certificates": [
+                    cert if expand else {"@odata.id": cert["@odata.id"]} for cert in certificates
+                ]
+            },
+        }
+
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """Passes the requests of one connection to the SimulatedRsc of the server"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "RscSimulator"
+    # Headers and body are written separately, Nagle's algorithm would hold
+    # the body back until the client acknowledges the headers
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        if isinstance(self.request, ssl.SSLSocket):
+            # The listening socket does not do the handshake, so that a slow
+            # client does not hold up the connections to the other RSCs
+            self.request.do_handshake()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._handle()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self._handle()
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        self._handle()
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        self._handle()
+
+    def _handle(self):
+        rsc: SimulatedRsc = self.server.rsc
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        response = rsc.handle(self.command, self.path, self.headers, body)
+        delay = rsc.response_delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        content = b"" if response.body is None else json.dumps(response.body).encode()
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        if content:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("OData-Version", "4.0")
+        self.send_header("Content-Length", str(len(content)))
+        sent = sum(len(line) for line in getattr(self, "_headers_buffer", []))
+        # Counted before the response is sent, so that a client reading the
+        # stats after the response sees its request
+        with rsc._lock:  # pylint: disable=protected-access
+            rsc.stats.requests[f"{self.command} {urlsplit(self.path).path}"] += 1
+            rsc.stats.bytes_received += (
+                len(self.raw_requestline) + len(str(self.headers)) + len(body)
+            )
+            rsc.stats.bytes_sent += sent + 2 + len(content)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class _ControllerServer(ThreadingHTTPServer):
+    """HTTP server of one simulated RSC"""
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, address: Tuple[str, int], rsc: SimulatedRsc):
+        super().__init__(address, SimulatorRequestHandler)
+        self.rsc = rsc
+
+    def handle_error(self, request, client_address):
+        # Clients closing their connections are expected in load tests
+        if not isinstance(sys.exc_info()[1], (ConnectionError, ssl.SSLError, TimeoutError)):
+            super().handle_error(request, client_address)
+
+
+def create_self_signed_certificate(directory: str | Path) -> Tuple[Path, Path] | None:
+    """Create a certificate and key for localhost with openssl. Returns None if
+    openssl is not available."""
+    cert_file = Path(directory) / "simulator.crt"
+    key_file = Path(directory) / "simulator.key"
+    command = [
+        "openssl", "req", "-x509", "-nodes", "-days", "7",
+        "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1",
+        "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        "-keyout", str(key_file), "-out", str(cert_file),
+    ]  # fmt: skip
+    try:
+        subprocess.run(command, check=True, capture_output=True, timeout=60)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return cert_file, key_file
+
+
+class RscSimulator:
+    """Serves count simulated RSCs, each on its own port.
+
+    One thread accepts the connections of all the RSCs and every connection is
+    served by its own thread, so hundreds of RSCs fit in one process. With tls,
+    the RSCs are served over HTTPS with a self-signed certificate, or over HTTP
+    if openssl cannot create one."""
+
+    def __init__(
+        self,
+        count: int = 1,
+        config: SimulatorConfig | None = None,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+        tls: bool = True,
+    ):
+        if count < 1:
+            raise ValueError("The number of simulated RSCs must be at least 1")
+        self.config = config or SimulatorConfig()
+        self.host = host
+        self.base_port = base_port
+        self.tls = tls
+        self.scheme = "http"
+        self.controllers = [SimulatedRsc(index, self.config) for index in range(count)]
+        self._servers: List[_ControllerServer] = []
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self) -> "RscSimulator":
+        """Start serving in a background thread"""
+        context = self._create_tls_context() if self.tls else None
+        self.scheme = "https" if context else "http"
+        try:
+            for index, rsc in enumerate(self.controllers):
+                port = self.base_port + index if self.base_port else 0
+                server = _ControllerServer((self.host, port), rsc)
+                if context is not None:
+                    server.socket = context.wrap_socket(
+                        server.socket, server_side=True, do_handshake_on_connect=False
+                    )
+                self._servers.append(server)
+        except OSError:
+            self._close_servers()
+            raise
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._serve, name="rsc-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the ports"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close_servers()
+
+    def __enter__(self) -> "RscSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def addresses(self) -> List[str]:
+        """Addresses of the RSCs, as given to hprsctool"""
+        return [f"{self.host}:{server.server_address[1]}" for server in self._servers]
+
+    @property
+    def base_urls(self) -> List[str]:
+        return [f"{self.scheme}://{address}" for address in self.addresses]
+
+    def stats(self) -> RequestStats:
+        """Get the requests served by all the RSCs"""
+        total = RequestStats()
+        for rsc in self.controllers:
+            with rsc._lock:  # pylint: disable=protected-access
+                total.add(rsc.stats)
+        return total
+
+    def reset_stats(self):
+        for rsc in self.controllers:
+            with rsc._lock:  # pylint: disable=protected-access
+                rsc.stats = RequestStats()
+
+    @staticmethod
+    def _create_tls_context() -> ssl.SSLContext | None:
+        # The certificate is only read from disk when it is loaded
+        with tempfile.TemporaryDirectory(prefix="hprsctool-simulator-") as cert_dir:
+            certificate = create_self_signed_certificate(cert_dir)
+            if certificate is None:
+                print("openssl is not available, serving over HTTP", file=sys.stderr)
+                return None
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*certificate)
+        return context
+
+    def _serve(self):
+        with selectors.DefaultSelector() as selector:
+            for server in self._servers:
+                selector.register(server, selectors.EVENT_READ)
+            while not self._stopping.is_set():
+                for key, _ in selector.select(timeout=0.2):
+                    key.fileobj._handle_request_noblock()  # pylint: disable=protected-access
+
+    def _close_servers(self):
+        for server in self._servers:
+            server.server_close()
+        self._servers = []
+
+
+def main(argv: List[str] | None = None):
+    """Run the simulator until interrupted"""
+    parser = argparse.ArgumentParser(
+        prog="python -m hprsctool.simulator", description="Local Redfish RSC simulator"
+    )
+    parser.add_argument("--count", type=int, default=1, help="Number of simulated RSCs")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument(
+        "--base-port", type=int, default=0,
+        help="Port of the first RSC, the others use the next ports (default: any free port)",
+    )  # fmt: skip
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument(
+        "--latency", type=float, default=0, help="Response delay, in milliseconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0, help="Maximum random extra delay, in milliseconds"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="Fraction of requests that fail"
+    )
+    parser.add_argument(
+        "--error-status", type=int, default=503, help="Status of the failed requests"
+    )
+    parser.add_argument(
+        "--task-duration", type=float, default=10, help="Duration of tasks, in seconds"
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=1, help="Retry-After of running tasks, in seconds"
+    )
+    parser.add_argument(
+        "--task-failure-rate", type=float, default=0, help="Fraction of tasks that fail"
+    )
+    parser.add_argument(
+        "--no-query-support", action="store_true", help="Do not support $expand and $filter"
+    )
+    parser.add_argument("--no-tls", action="store_true", help="Serve over HTTP")
+    parser.add_argument("--seed", type=int, help="Seed of the random delays and errors")
+    parser.add_argument("--inventory", help="Write the addresses of the RSCs to this file")
+    args = parser.parse_args(argv)
+
+    config = SimulatorConfig(
+        username=args.username,
+        password=args.password,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        task_duration=args.task_duration,
+        retry_after=args.retry_after,
+        task_failure_rate=args.task_failure_rate,
+        query_support=not args.no_query_support,
+        seed=args.seed,
+    )
+    with RscSimulator(
+        args.count, config, args.host, args.base_port, tls=not args.no_tls
+    ) as simulator:
+        if args.inventory:
+            Path(args.inventory).write_text("\n".join(simulator.addresses) + "\n", encoding="utf-8")
+        print(f"Serving {args.count} simulated RSCs:", *simulator.base_urls[:5], sep="\n  ")
+        if args.count > 5:
+            print(f"  ... and {args.count - 5} more")
+        print("Press Ctrl+C to stop", flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
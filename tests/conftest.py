@@ -0,0 +1,13 @@
+"""Fixtures shared by all tests."""
+
+import pytest
+
+from hprsctool.comm import retry
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Keep the failures of an RSC address in one test from opening its circuit in the next"""
+    retry._breakers.clear()  # pylint: disable=protected-access
+    yield
+    retry._breakers.clear()  # pylint: disable=protected-access
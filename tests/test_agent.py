@@ -0,0 +1,108 @@
+"""Tests for the agent module."""
+
+import argparse
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hprsctool import agent_client
+from hprsctool.agent import AgentServer, SessionPool, resolve_paths
+from hprsctool.comm.remote_system_controller import RedfishError
+from hprsctool.simulator.server import RscSimulator
+
+
+@pytest.fixture(name="pool")
+def fixture_pool():
+    return SessionPool(MagicMock(side_effect=lambda *args: MagicMock()), idle_timeout=60)
+
+
+def test_pool_reuses_sessions_of_the_same_user(pool):
+    first = pool.acquire("rsc1", "admin", "password")
+    pool.release(first)
+
+    assert pool.acquire("rsc1", "admin", "password") is first
+    assert pool.acquire("rsc1", "admin", "password") is not first
+    assert pool.acquire("rsc1", "admin", "other password") is not first
+    assert pool.connect.call_count == 3
+
+
+def test_pool_checks_sessions_of_failed_commands(pool):
+    session = pool.acquire("rsc1", "admin", "password")
+    pool.release(session, suspect=True)
+
+    with patch("hprsctool.agent.check_session") as check_session:
+        assert pool.acquire("rsc1", "admin", "password") is session
+    check_session.assert_called_once_with(session.rsc)
+    assert not session.suspect
+
+
+def test_pool_replaces_sessions_that_cannot_be_checked(pool):
+    session = pool.acquire("rsc1", "admin", "password")
+    pool.release(session, suspect=True)
+
+    with patch("hprsctool.agent.check_session", side_effect=RedfishError("Login failed")):
+        assert pool.acquire("rsc1", "admin", "password") is not session
+
+
+def test_pool_logs_out_idle_sessions(pool):
+    kept = pool.acquire("rsc1", "admin", "password")
+    expired = pool.acquire("rsc2", "admin", "password")
+    in_use = pool.acquire("rsc3", "admin", "password")
+    pool.release(kept)
+    pool.release(expired)
+    expired.last_used -= 120
+
+    pool.maintain()
+
+    expired.rsc.logout.assert_called_once()
+    kept.rsc.logout.assert_not_called()
+    assert {session["address"] for session in pool.status()} == {"rsc1", "rsc3"}
+
+    pool.close()
+    kept.rsc.logout.assert_called_once()
+    in_use.rsc.logout.assert_called_once()
+    assert pool.status() == []
+
+
+def test_resolve_paths():
+    args = argparse.Namespace(
+        fw_file_path="fw/rsc_fw_2.0.0.xz", cert_file="/etc/cert.pem", inventory=None, address=["rsc1"]
+    )
+
+    resolve_paths(args, "/home/user")
+
+    assert args.fw_file_path == "/home/user/fw/rsc_fw_2.0.0.xz"
+    assert args.cert_file == "/etc/cert.pem"
+    assert args.address == ["rsc1"]
+
+
+def test_no_agent_running(tmp_path):
+    assert agent_client.run_command(["system", "get"], tmp_path / "agent.sock") is None
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+def test_agent_runs_commands_with_warm_sessions(tmp_path, capsys):
+    socket_path = tmp_path / "agent.sock"
+    with RscSimulator(1) as simulator:
+        pool = SessionPool()
+        server = AgentServer(socket_path, pool)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            argv = ["-u", "admin", "-p", "password", "-a", simulator.addresses[0], "system", "get"]
+            assert agent_client.run_command(argv, socket_path) == 0
+            assert agent_client.run_command(argv, socket_path) == 0
+            assert agent_client.run_command([*argv[:-2], "system", "bogus"], socket_path) == 2
+            assert agent_client.run_command([*argv[:-2], "exporter"], socket_path) is None
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+            pool.close()
+
+        output = capsys.readouterr()
+        assert output.out.count("Serial number: SIM0000000") == 2
+        assert "invalid choice: 'bogus'" in output.err
+        assert simulator.stats().requests["POST /redfish/v1/SessionService/Sessions"] == 1
+        assert not simulator.controllers[0].sessions
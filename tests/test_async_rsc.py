@@ -0,0 +1,99 @@
+"""Tests for the asyncio RSC client and operations."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+# pylint: disable=wrong-import-position
+from redfish.aio import AsyncRestRequest, AsyncRestResponse
+
+from hprsctool.comm.aio.operations import system as system_ops
+from hprsctool.comm.aio.operations import trusted_cert as trusted_cert_ops
+from hprsctool.comm.aio.remote_system_controller import AsyncRsc
+from hprsctool.comm.remote_system_controller import RedfishConfig, RedfishError
+
+
+def make_response(status=200, body=None, headers=None, path="/redfish/v1"):
+    return AsyncRestResponse(
+        AsyncRestRequest(path),
+        status,
+        headers or {},
+        json.dumps(body).encode() if body is not None else b"",
+    )
+
+
+@pytest.fixture(name="rsc")
+def fixture_rsc():
+    rsc = AsyncRsc(RedfishConfig("https://example.com", "admin", "password"))
+    rsc._client = AsyncMock()
+    return rsc
+
+
+def test_perform_redfish_get(rsc):
+    rsc.client.get.return_value = make_response(body={"Id": "1"})
+
+    response = asyncio.run(rsc.perform_redfish_get("/redfish/v1/Systems/1"))
+
+    rsc.client.get.assert_awaited_once_with("/redfish/v1/Systems/1")
+    assert response.dict == {"Id": "1"}
+
+
+def test_perform_redfish_patch_error(rsc):
+    rsc.client.patch.return_value = make_response(
+        status=400,
+        body={"error": {"@Message.ExtendedInfo": [{"Message": "Bad value %1", "MessageArgs": ["x"]}]}},
+    )
+
+    with pytest.raises(RedfishError, match="PATCH failed for /redfish/v1/Managers/1: Bad value x"):
+        asyncio.run(rsc.perform_redfish_patch("/redfish/v1/Managers/1", {"a": 1}))
+
+
+def test_monitor_task(rsc):
+    started = make_response(status=202, headers={"Location": "/redfish/v1/TaskMonitors/1"})
+    rsc.client.get.side_effect = [
+        make_response(status=202, headers={"Retry-After": "1"}),
+        make_response(status=200, body={"TaskState": "Completed"}),
+    ]
+
+    with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        response = asyncio.run(rsc.monitor_task(started))
+
+    assert response.status == 200
+    assert rsc.client.get.await_count == 2
+    rsc.client.get.assert_awaited_with("/redfish/v1/TaskMonitors/1")
+    assert [c.args[0] for c in mock_sleep.await_args_list] == [5, 1]
+
+
+def test_get_system(rsc):
+    rsc.client.get.return_value = make_response(body={"Model": "Z2"})
+
+    system = asyncio.run(system_ops.get_system(rsc))
+
+    assert system.model == "Z2"
+
+
+def test_get_trusted_certificates(rsc):
+    responses = {
+        "/redfish/v1/CertificateService/CertificateLocations": make_response(
+            body={
+                "Links": {
+                    "Certificates": [
+                        {"@odata.id": "/redfish/v1/Managers/1/TrustedCertificates/a"},
+                        {"@odata.id": "/redfish/v1/Managers/1/NetworkProtocol/HTTPS/Certificates/1"},
+                        {"@odata.id": "/redfish/v1/Managers/1/TrustedCertificates/b"},
+                    ]
+                }
+            }
+        ),
+        "/redfish/v1/Managers/1/TrustedCertificates/a": make_response(body={"Id": "a"}),
+        "/redfish/v1/Managers/1/TrustedCertificates/b": make_response(body={"Id": "b"}),
+    }
+    rsc.client.get.side_effect = lambda url: responses[url]
+
+    certs = asyncio.run(trusted_cert_ops.get_trusted_certificates(rsc))
+
+    assert [cert.certificate_id for cert in certs] == ["a", "b"]
@@ -0,0 +1,117 @@
+"""Tests for the change_set module."""
+
+import argparse
+from unittest.mock import MagicMock
+
+import pytest
+
+from hprsctool.comm.change_set import ChangeSet, deep_merge, difference
+from hprsctool.comm.operations import network as network_ops
+from hprsctool.comm.remote_system_controller import RedfishConfig, Rsc
+from hprsctool.commands.manager.network import set_network_settings
+from hprsctool.simulator.server import RscSimulator
+
+
+def test_deep_merge():
+    target = {"Proxy": {"Enabled": True, "ExcludeAddresses": ["a"]}, "NTP": {"ProtocolEnabled": False}}
+    exclude = ["b", "c"]
+
+    deep_merge(target, {"Proxy": {"ExcludeAddresses": exclude}, "Oem": {"HP": {"x": 1}}})
+    exclude.append("d")
+
+    assert target == {
+        "Proxy": {"Enabled": True, "ExcludeAddresses": ["b", "c"]},
+        "NTP": {"ProtocolEnabled": False},
+        "Oem": {"HP": {"x": 1}},
+    }
+
+
+def test_change_set_merges_changes_by_resource():
+    change_set = ChangeSet()
+    change_set.add("/a", {"Proxy": {"Enabled": True}})
+    change_set.add("/b", {})
+    change_set.add("/a", {"Proxy": {"ProxyServerURI": "http://proxy"}})
+
+    assert len(change_set) == 1
+    assert "/b" not in change_set
+    assert list(change_set) == [("/a", {"Proxy": {"Enabled": True, "ProxyServerURI": "http://proxy"}})]
+
+
+def test_send_changes_patches_the_ethernet_interface_last():
+    rsc = MagicMock()
+    change_set = ChangeSet()
+    change_set.add(network_ops.ETHERNET_INTERFACE_URI, {"DHCPv4": {"DHCPEnabled": True}})
+    change_set.add(network_ops.NETWORK_PROTOCOL_URI, {"NTP": {"ProtocolEnabled": True}})
+
+    responses = network_ops.send_changes(rsc, change_set)
+
+    assert [url for url, _ in responses] == [
+        network_ops.NETWORK_PROTOCOL_URI,
+        network_ops.ETHERNET_INTERFACE_URI,
+    ]
+    assert rsc.perform_redfish_patch.call_count == 2
+
+    change_set.add("/redfish/v1/Systems/1", {"AssetTag": "x"})
+    with pytest.raises(ValueError, match="Cannot send changes to /redfish/v1/Systems/1"):
+        network_ops.send_changes(rsc, change_set)
+
+
+def test_send_changes_handles_each_response_before_the_next_patch():
+    rsc = MagicMock()
+    events = []
+    rsc.perform_redfish_patch.side_effect = lambda url, _data: events.append(("PATCH", url)) or url
+    change_set = ChangeSet()
+    change_set.add(network_ops.ETHERNET_INTERFACE_URI, {"DHCPv4": {"DHCPEnabled": True}})
+    change_set.add(network_ops.NETWORK_PROTOCOL_URI, {"NTP": {"ProtocolEnabled": True}})
+
+    network_ops.send_changes(rsc, change_set, lambda url, response: events.append(("monitor", response)))
+
+    assert events == [
+        ("PATCH", network_ops.NETWORK_PROTOCOL_URI),
+        ("monitor", network_ops.NETWORK_PROTOCOL_URI),
+        ("PATCH", network_ops.ETHERNET_INTERFACE_URI),
+        ("monitor", network_ops.ETHERNET_INTERFACE_URI),
+    ]
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+def test_network_set_patches_each_resource_once():
+    with RscSimulator(1) as simulator:
+        rsc = Rsc(RedfishConfig(simulator.base_urls[0], "admin", "password"))
+        rsc.login()
+        args = argparse.Namespace(
+            rsc=rsc,
+            dhcp=None,
+            static_address=None,
+            subnet_mask=None,
+            gateway=None,
+            name_server=None,
+            use_dhcp_dns=None,
+            proxy="enable",
+            proxyserver="http://proxy.example.com:8080",
+            proxyexclude=["localhost"],
+            mdns="disable",
+        )
+        simulator.reset_stats()
+
+        set_network_settings(args)
+
+        requests = simulator.stats().requests
+        assert requests[f"PATCH {network_ops.NETWORK_PROTOCOL_URI}"] == 1
+        assert f"PATCH {network_ops.ETHERNET_INTERFACE_URI}" not in requests
+        protocol = network_ops.get_manager_network_protocol(rsc)
+        assert protocol.proxy.proxy_enabled is True
+        assert protocol.mdns_protocol_enabled is False
+        rsc.logout()
+
+
+def test_difference():
+    current = {
+        "NTP": {"ProtocolEnabled": True, "NTPServers": ["a", "b"]},
+        "IPv4StaticAddresses": [{"Address": "10.0.0.5", "Gateway": "10.0.0.1"}],
+    }
+
+    assert difference({"NTP": {"ProtocolEnabled": True}}, current) == {}
+    assert difference({"NTP": {"NTPServers": ["a"]}}, current) == {"NTP": {"NTPServers": ["a"]}}
+    assert difference({"IPv4StaticAddresses": [{"Address": "10.0.0.5"}]}, current) == {}
+    assert difference({"Proxy": {"Enabled": False}}, current) == {"Proxy": {"Enabled": False}}
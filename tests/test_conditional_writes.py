@@ -0,0 +1,81 @@
+"""Tests for the conditional writes of commands changing the RSC settings."""
+
+import argparse
+
+import pytest
+
+from hprsctool.comm.operations import manager as manager_ops
+from hprsctool.comm.operations import network as network_ops
+from hprsctool.comm.remote_system_controller import RedfishConfig, Rsc
+from hprsctool.comm.response_cache import ResponseCache
+from hprsctool.commands.manager.time import set_time
+from hprsctool.simulator.server import RscSimulator
+
+pytestmark = pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+PROTOCOL_PATCH = f"PATCH {network_ops.NETWORK_PROTOCOL_URI}"
+PROTOCOL_GET = f"GET {network_ops.NETWORK_PROTOCOL_URI}"
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator():
+    with RscSimulator(1) as simulator:
+        yield simulator
+
+
+def connect(simulator, conditional_writes=True) -> Rsc:
+    address = simulator.base_urls[0]
+    rsc = Rsc(
+        RedfishConfig(address, "admin", "password"),
+        response_cache=ResponseCache(address),
+        conditional_writes=conditional_writes,
+    )
+    rsc.login()
+    return rsc
+
+
+def time_args(rsc: Rsc, offset: str) -> argparse.Namespace:
+    return argparse.Namespace(rsc=rsc, ntp="disable", ntpserver=["ntp.example.com"], time=None, offset=offset)
+
+
+def test_fresh_settings_are_not_read_again(simulator):
+    rsc = connect(simulator)
+    network_ops.get_manager_network_protocol(rsc)
+    simulator.reset_stats()
+
+    set_time(time_args(rsc, "+01:00"))
+
+    requests = simulator.stats().requests
+    assert PROTOCOL_GET not in requests
+    assert requests[PROTOCOL_PATCH] == 1
+    assert manager_ops.get_manager(rsc).date_time_offset == "+01:00"
+    rsc.logout()
+
+
+def test_command_run_again_when_settings_changed_since_read(simulator, capsys):
+    rsc = connect(simulator)
+    other = connect(simulator, conditional_writes=False)
+    network_ops.get_manager_network_protocol(rsc)
+    network_ops.set_manager_network_protocol(other, {"NTP": {"NTPServers": ["other.example.com"]}})
+    simulator.reset_stats()
+
+    set_time(time_args(rsc, "+01:00"))
+
+    requests = simulator.stats().requests
+    assert requests[PROTOCOL_PATCH] == 2
+    assert requests[PROTOCOL_GET] == 1
+    assert "reading them again" in capsys.readouterr().out
+    assert network_ops.get_manager_network_protocol(rsc).ntp.ntp_servers == ["ntp.example.com"]
+    rsc.logout()
+    other.logout()
+
+
+def test_settings_read_again_without_conditional_writes(simulator):
+    rsc = connect(simulator, conditional_writes=False)
+    network_ops.get_manager_network_protocol(rsc)
+    simulator.reset_stats()
+
+    set_time(time_args(rsc, "+01:00"))
+
+    assert simulator.stats().requests[PROTOCOL_GET] == 1
+    rsc.logout()
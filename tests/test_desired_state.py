@@ -0,0 +1,161 @@
+"""Tests for the desired_state module and the apply command."""
+
+import base64
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from hprsctool import desired_state
+from hprsctool.comm.operations import manager as manager_ops
+from hprsctool.comm.operations import network as network_ops
+from hprsctool.comm.operations import trusted_cert as trusted_cert_ops
+from hprsctool.comm.remote_system_controller import RedfishConfig, Rsc
+from hprsctool.hprsctool import create_argument_parser, run
+from hprsctool.models.ethernet_interface import EthernetInterface
+from hprsctool.simulator.server import RscSimulator
+
+pytestmark = pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+
+def write_certificate(path, content: bytes):
+    encoded = base64.encodebytes(content).decode()
+    path.write_text(f"-----BEGIN CERTIFICATE-----\n{encoded}-----END CERTIFICATE-----\n")
+
+
+@pytest.fixture(name="state_file")
+def fixture_state_file(tmp_path):
+    (tmp_path / "certs").mkdir()
+    write_certificate(tmp_path / "certs" / "ca.pem", b"certificate authority")
+    state_file = tmp_path / "state.json"
+    state_file.write_text(
+        json.dumps(
+            {
+                "ntp": {"enabled": False, "servers": ["ntp1.example.com"]},
+                "proxy": {"enabled": True, "server": "http://proxy:8080", "exclude": ["localhost"]},
+                "mdns": False,
+                "time_offset": "+02:00",
+                "trusted_certificates": ["certs/ca.pem"],
+            }
+        )
+    )
+    return state_file
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator():
+    with RscSimulator(2) as simulator:
+        yield simulator
+
+
+def connect(simulator, index=0) -> Rsc:
+    rsc = Rsc(RedfishConfig(simulator.base_urls[index], "admin", "password"))
+    rsc.login()
+    return rsc
+
+
+@pytest.mark.parametrize(
+    "settings, message",
+    [
+        ({"dns": {}}, "Unknown setting dns"),
+        ({"ntp": {"enabled": "yes"}}, "ntp.enabled must be a bool"),
+        ({"ntp": {"servers": [1]}}, "ntp.servers must be a list of strings"),
+        ({"time_offset": "2:00"}, r"time_offset must be in the format \[\+-\]HH:MM"),
+    ],
+)
+def test_invalid_desired_state(tmp_path, settings, message):
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps(settings))
+
+    with pytest.raises(ValueError, match=message):
+        desired_state.load_desired_state(str(state_file))
+
+
+def test_static_address_requires_dhcp_disabled():
+    current = EthernetInterface({"DHCPv4": {"DHCPEnabled": True}})
+    settings = {"network": {"static_address": "10.0.0.5", "subnet_mask": "255.0.0.0"}}
+
+    with pytest.raises(ValueError, match="Cannot set a static address when DHCP is enabled"):
+        desired_state.plan_ethernet_interface(settings, current, desired_state.Plan())
+
+
+def test_plan_only_sends_what_differs():
+    current = EthernetInterface(
+        {
+            "DHCPv4": {"DHCPEnabled": False, "UseDNSServers": False},
+            "IPv4StaticAddresses": [
+                {"Address": "10.0.0.5", "SubnetMask": "255.0.0.0", "Gateway": "10.0.0.1"}
+            ],
+            "StaticNameServers": ["10.0.0.2"],
+        }
+    )
+    settings = {
+        "network": {
+            "dhcp": False,
+            "static_address": "10.0.0.5",
+            "subnet_mask": "255.0.0.0",
+            "name_servers": ["10.0.0.3"],
+        }
+    }
+    plan = desired_state.Plan()
+
+    desired_state.plan_ethernet_interface(settings, current, plan)
+
+    assert list(plan.network_changes) == [
+        (network_ops.ETHERNET_INTERFACE_URI, {"StaticNameServers": ["10.0.0.3"]})
+    ]
+
+
+def test_apply_reaches_the_desired_state(simulator, state_file, tmp_path):
+    rsc = connect(simulator)
+    write_certificate(tmp_path / "old.pem", b"old certificate")
+    trusted_cert_ops.add_trusted_certificate(rsc, str(tmp_path / "old.pem"))
+    state = desired_state.load_desired_state(str(state_file))
+
+    plan = desired_state.compute_plan(rsc, state)
+    assert [(request.method, request.url) for request in plan.requests()] == [
+        ("DELETE", f"{trusted_cert_ops.TRUSTED_CERTIFICATES_URI}/{plan.deleted_certificates[0].certificate_id}"),
+        ("POST", trusted_cert_ops.TRUSTED_CERTIFICATES_URI),
+        ("PATCH", manager_ops.MANAGER_URI),
+        ("PATCH", network_ops.NETWORK_PROTOCOL_URI),
+    ]
+    desired_state.apply_plan(rsc, plan)
+
+    simulator.reset_stats()
+    assert len(desired_state.compute_plan(rsc, state)) == 0
+    assert all(request.startswith("GET") for request in simulator.stats().requests)
+    protocol = network_ops.get_manager_network_protocol(rsc)
+    assert protocol.proxy.proxy_server_uri == "http://proxy:8080"
+    assert protocol.mdns_protocol_enabled is False
+    rsc.logout()
+
+
+def test_time_offset_cannot_be_set_with_ntp():
+    rsc = MagicMock()
+    rsc.perform_redfish_get.return_value.dict = {"NTP": {"ProtocolEnabled": True}}
+    state = desired_state.DesiredState({"time_offset": "+02:00"})
+
+    with pytest.raises(ValueError, match="NTP is or will be enabled"):
+        desired_state.compute_plan(rsc, state)
+
+
+def test_apply_command_skips_rscs_in_the_desired_state(simulator, state_file, capsys):
+    argparser = create_argument_parser()
+    base_args = ["-u", "admin", "-p", "password", "-a", simulator.addresses[0]]
+    run(argparser.parse_args([*base_args, "apply", str(state_file)]), argparser)
+    simulator.reset_stats()
+
+    argparser = create_argument_parser()
+    args = argparser.parse_args(
+        [*base_args, "-a", simulator.addresses[1], "apply", "--dry-run", str(state_file)]
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        run(args, argparser)
+
+    assert exit_info.value.code == 0
+    output = capsys.readouterr().out
+    assert "Desired state applied with 3 requests" in output
+    assert output.count("Already in the desired state") == 1
+    assert "3 requests planned" in output
+    changes = [request for request in simulator.stats().requests if "Session" not in request]
+    assert all(request.startswith("GET") for request in changes)
@@ -0,0 +1,149 @@
+"""Tests for the exporter module."""
+
+import json
+import threading
+import time
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hprsctool.comm.remote_system_controller import RedfishConfig, RedfishError, Rsc, SessionRejectedError
+from hprsctool.exporter import Exporter, MetricsServer, Snapshot, Target, render_metrics
+from hprsctool.models.manager import Manager
+from hprsctool.models.system import SAMPLE_SYSTEM_JSON, System
+from hprsctool.simulator.server import RscSimulator
+
+
+def make_snapshot(address="rsc1") -> Snapshot:
+    return Snapshot(
+        address,
+        up=True,
+        system=System(json.loads(SAMPLE_SYSTEM_JSON)),
+        manager=Manager({"FirmwareVersion": "1.2.3", "SerialNumber": "RSC1", "Model": "RSC"}),
+        last_success=1700000000.0,
+    )
+
+
+@pytest.fixture(name="operations")
+def fixture_operations():
+    with patch("hprsctool.exporter.system_ops") as system_ops, patch(
+        "hprsctool.exporter.manager_ops"
+    ), patch("hprsctool.exporter.network_ops"):
+        system_ops.get_system.return_value = System(json.loads(SAMPLE_SYSTEM_JSON))
+        yield system_ops
+
+
+def test_render_openmetrics():
+    text = render_metrics([make_snapshot()])
+    lines = text.splitlines()
+
+    assert 'hprsctool_up{rsc="rsc1"} 1' in lines
+    assert "# TYPE hprsctool_system_power_state stateset" in lines
+    assert 'hprsctool_system_power_state{rsc="rsc1",hprsctool_system_power_state="On"} 1' in lines
+    assert 'hprsctool_system_health{rsc="rsc1",hprsctool_system_health="Critical"} 0' in lines
+    assert (
+        'hprsctool_manager_info{rsc="rsc1",model="RSC",serial_number="RSC1",firmware_version="1.2.3"} 1'
+        in lines
+    )
+    assert 'hprsctool_refresh_failures_total{rsc="rsc1"} 0' in lines
+    assert lines[-1] == "# EOF"
+
+
+def test_render_prometheus_text():
+    text = render_metrics([make_snapshot()], openmetrics=False)
+
+    assert "# TYPE hprsctool_manager_info gauge" in text
+    assert "# TYPE hprsctool_refresh_failures_total counter" in text
+    assert "# TYPE hprsctool_system_health gauge" in text
+    assert "# EOF" not in text
+
+
+def test_render_escapes_labels_and_unknown_states():
+    data = json.loads(SAMPLE_SYSTEM_JSON)
+    data["PowerState"] = "Unknown"
+    snapshot = Snapshot('rsc"1', up=False, system=System(data))
+
+    lines = render_metrics([snapshot]).splitlines()
+
+    assert 'hprsctool_up{rsc="rsc\\"1"} 0' in lines
+    assert 'hprsctool_system_power_state{rsc="rsc\\"1",hprsctool_system_power_state="Unknown"} 1' in lines
+
+
+def test_target_logs_in_again_when_session_is_rejected(operations):
+    rsc1, rsc2 = MagicMock(), MagicMock()
+    connect = MagicMock(side_effect=[rsc1, rsc2])
+    target = Target("rsc1", connect)
+    target.refresh()
+
+    operations.get_system.side_effect = [
+        SessionRejectedError("GET failed"),
+        operations.get_system.return_value,
+    ]
+    snapshot = target.refresh()
+
+    assert snapshot.up
+    assert target.rsc is rsc2
+    assert connect.call_count == 2
+    rsc1.logout.assert_called_once()
+
+
+def test_rejected_new_session_is_logged_out(operations):
+    rsc = MagicMock()
+    target = Target("rsc1", MagicMock(return_value=rsc))
+
+    operations.get_system.side_effect = SessionRejectedError("GET failed")
+    snapshot = target.refresh()
+
+    assert not snapshot.up
+    assert target.rsc is None
+    rsc.logout.assert_called_once()
+
+
+def test_failed_refresh_keeps_last_state_and_session(operations):
+    connect = MagicMock()
+    target = Target("rsc1", connect)
+    first = target.refresh()
+
+    operations.get_system.side_effect = RedfishError("Failed to connect to the RSC")
+    snapshot = target.refresh()
+
+    assert not snapshot.up
+    assert snapshot.error == "Failed to connect to the RSC"
+    assert snapshot.failures == 1
+    assert snapshot.system is first.system
+    assert snapshot.last_success == first.last_success
+    assert target.rsc is connect.return_value
+    connect.return_value.logout.assert_not_called()
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+def test_exporter_refreshes_in_background_and_serves_from_memory():
+    with RscSimulator(2) as simulator:
+
+        def connect(address):
+            rsc = Rsc(RedfishConfig(f"{simulator.scheme}://{address}", "admin", "password"))
+            rsc.login()
+            return rsc
+
+        with Exporter(simulator.addresses, connect, interval=0.2, workers=2) as exporter:
+            deadline = time.monotonic() + 10
+            while not all(snapshot.up for snapshot in exporter.snapshots()):
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+
+            server = MetricsServer(("127.0.0.1", 0), exporter)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{server.server_address[1]}/metrics",
+                headers={"Accept": "application/openmetrics-text"},
+            )
+            with urllib.request.urlopen(request, timeout=10) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+            server.shutdown()
+            server.server_close()
+
+        assert content_type.startswith("application/openmetrics-text")
+        assert 'serial_number="SIMRSC0000001"' in body
+        assert all(not controller.sessions for controller in simulator.controllers)
@@ -0,0 +1,163 @@
+"""Tests for the firmware image shared by concurrent uploads."""
+
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hprsctool.cli import create_argument_parser, run
+from hprsctool.comm import firmware_image
+from hprsctool.comm.firmware_image import (
+    BandwidthLimiter,
+    FirmwareImage,
+    UploadLimits,
+    get_shared_image,
+)
+from hprsctool.comm.operations import manager as manager_ops
+from hprsctool.comm.upload import create_multipart_encoder
+
+CONTENT = bytes(range(256)) * 64
+
+
+@pytest.fixture(name="fw_file")
+def fixture_fw_file(tmp_path):
+    path = tmp_path / "rsc.bin.xz"
+    path.write_bytes(CONTENT)
+    return path
+
+
+def test_readers_share_the_mapping(fw_file):
+    image = FirmwareImage(fw_file)
+    first, second = image.open(), image.open()
+
+    chunk = first.read(100)
+
+    assert isinstance(chunk, memoryview)
+    assert chunk.obj is image.view.obj
+    assert bytes(chunk) == CONTENT[:100]
+    assert first.len == len(CONTENT) - 100
+    assert bytes(second.read()) == CONTENT
+    assert bytes(first.read()) == CONTENT[100:]
+    assert len(first.read(10)) == 0
+
+
+def test_multipart_body_from_image(fw_file):
+    image = FirmwareImage(fw_file)
+    body = create_multipart_encoder({"UpdateFile": (image.name, image.open())}).to_string()
+
+    assert CONTENT in body
+    assert b'filename="rsc.bin.xz"' in body
+
+
+def test_get_shared_image(fw_file):
+    image = get_shared_image(fw_file)
+    assert get_shared_image(str(fw_file)) is image
+
+    stat = os.stat(fw_file)
+    os.utime(fw_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert get_shared_image(fw_file) is not image
+
+
+def test_get_shared_image_missing_file(tmp_path):
+    with pytest.raises(ValueError, match="not found"):
+        get_shared_image(tmp_path / "missing.bin")
+
+
+def test_bandwidth_limiter_is_shared():
+    limiter = BandwidthLimiter(100_000)
+
+    def send():
+        for _ in range(5):
+            limiter.consume(2_000)
+
+    threads = [threading.Thread(target=send) for _ in range(2)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 20 kB at 100 kB/s, the first chunk being sent right away
+    assert time.monotonic() - start >= 0.17
+
+
+def test_update_rsc_firmware_limits_concurrent_uploads(fw_file):
+    lock = threading.Lock()
+    active = [0, 0]
+    bodies = []
+
+    def fake_post(url, files, **kwargs):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.02)
+        bodies.append(bytes(files["UpdateFile"][1].read()))
+        with lock:
+            active[0] -= 1
+        return MagicMock(status_code=202)
+
+    def update(index):
+        rsc = MagicMock(address=f"https://rsc{index}")
+        rsc.monitor_task.return_value = MagicMock(status=200)
+        manager_ops.update_rsc_firmware(rsc, str(fw_file))
+
+    with patch.object(firmware_image, "upload_limits", UploadLimits(max_uploads=2)), patch.object(
+        manager_ops, "post_multipart", side_effect=fake_post
+    ):
+        threads = [threading.Thread(target=update, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert active[1] == 2
+    assert bodies == [CONTENT] * 6
+
+
+def test_upload_limits_per_rsc():
+    limits = UploadLimits(max_uploads=4, max_uploads_per_rsc=1)
+    lock = threading.Lock()
+    active = {}
+    most = {}
+
+    def upload(address):
+        with limits.upload_slot(address):
+            with lock:
+                active[address] = active.get(address, 0) + 1
+                most[address] = max(most.get(address, 0), active[address])
+            time.sleep(0.02)
+            with lock:
+                active[address] -= 1
+
+    threads = [threading.Thread(target=upload, args=(f"https://rsc{i % 2}",)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert most == {"https://rsc0": 1, "https://rsc1": 1}
+    with pytest.raises(ValueError, match="to an RSC must be at least 1"):
+        UploadLimits(max_uploads_per_rsc=0)
+
+
+def test_each_run_sets_its_own_upload_limits():
+    argparser = create_argument_parser()
+    limits = []
+    for options in (["--max-uploads", "4", "--max-bandwidth", "1"], []):
+        args = argparser.parse_args(
+            ["-u", "admin", "-p", "password", "-a", "https://rsc1", "--retries", "0"]
+            + options
+            + ["system", "get"]
+        )
+        args.func = MagicMock(
+            __name__="get", side_effect=lambda _: limits.append(firmware_image.upload_limits)
+        )
+        run(args, argparser, lambda *_: MagicMock())
+
+    assert limits[0].max_uploads == 4
+    assert limits[0].limiter.bytes_per_second == 1024 * 1024
+    assert limits[1].max_uploads is None
+    assert limits[1].limiter is None
+    assert limits[1].max_uploads_per_rsc == firmware_image.DEFAULT_MAX_UPLOADS_PER_RSC
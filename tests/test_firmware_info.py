@@ -0,0 +1,90 @@
+"""Tests for the firmware pre-flight information."""
+
+import hashlib
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from hprsctool.comm import firmware_info
+from hprsctool.comm.firmware_info import (
+    FirmwareInfoCache,
+    version_from_filename,
+    versions_match,
+)
+
+CONTENT = b"firmware image"
+
+
+@pytest.fixture(name="fw_file")
+def fixture_fw_file(tmp_path):
+    path = tmp_path / "rsc_fw_1.2.3.xz"
+    path.write_bytes(CONTENT)
+    return path
+
+
+@pytest.mark.parametrize(
+    "name, version",
+    [
+        ("rsc_fw_1.2.3.xz", "1.2.3"),
+        ("/images/2024/rsc-v2.10.0.45.bin", "2.10.0.45"),
+        ("firmware.xz", None),
+    ],
+)
+def test_version_from_filename(name, version):
+    assert version_from_filename(name) == version
+
+
+@pytest.mark.parametrize(
+    "installed, target, expected",
+    [
+        ("1.2.3", "1.2.3", True),
+        ("v1.2.0", "1.2", True),
+        ("1.2.3", "1.2.4", False),
+        ("1.20", "1.2", False),
+        ("N/A", "1.2.3", False),
+        ("1.2.3", None, False),
+    ],
+)
+def test_versions_match(installed, target, expected):
+    assert versions_match(installed, target) is expected
+
+
+def test_get_info_hashes_once(fw_file, tmp_path):
+    cache_file = tmp_path / "cache" / "firmware.json"
+    with patch.object(firmware_info, "get_shared_image", wraps=firmware_info.get_shared_image) as mock_image:
+        first = FirmwareInfoCache(cache_file).get_info(fw_file)
+        # Another process reuses the hash saved on disk
+        second = FirmwareInfoCache(cache_file).get_info(str(fw_file))
+
+    assert first == second
+    assert first.sha256 == hashlib.sha256(CONTENT).hexdigest()
+    assert first.version == "1.2.3"
+    mock_image.assert_called_once()
+
+
+def test_get_info_rehashes_modified_file(fw_file, tmp_path):
+    cache = FirmwareInfoCache(tmp_path / "firmware.json")
+    cache.get_info(fw_file)
+
+    fw_file.write_bytes(b"new firmware image")
+    stat = os.stat(fw_file)
+    os.utime(fw_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cache.get_info(fw_file).sha256 == hashlib.sha256(b"new firmware image").hexdigest()
+
+
+def test_target_version_is_remembered_by_hash(fw_file, tmp_path):
+    cache = FirmwareInfoCache(tmp_path / "firmware.json")
+    copy = tmp_path / "firmware.xz"
+    shutil.copy(fw_file, copy)
+
+    assert cache.get_info(copy).version is None
+    assert cache.get_info(copy, target_version="1.2.4").version == "1.2.4"
+    assert cache.get_info(fw_file).version == "1.2.4"
+
+
+def test_get_info_missing_file(tmp_path):
+    with pytest.raises(ValueError, match="not found"):
+        FirmwareInfoCache(tmp_path / "firmware.json").get_info(tmp_path / "missing.xz")
@@ -0,0 +1,84 @@
+"""Tests for the fleet module."""
+
+import argparse
+from unittest.mock import MagicMock
+
+import pytest
+
+from hprsctool.comm.operations import manager as manager_ops
+from hprsctool.comm.remote_system_controller import RedfishConfig, RedfishError, Rsc
+from hprsctool.fleet import read_inventory, run_fleet, run_on_host
+from hprsctool.simulator.server import RscSimulator, SimulatorConfig
+
+
+def test_read_inventory(tmp_path):
+    inventory = tmp_path / "inventory.txt"
+    inventory.write_text(
+        "# lab RSCs\nrsc1.example.com\n\nrsc2.example.com  # rack 2\nrsc1.example.com\n",
+        encoding="utf-8",
+    )
+    assert read_inventory(str(inventory)) == ["rsc1.example.com", "rsc2.example.com"]
+
+
+def test_run_on_host_success():
+    args = argparse.Namespace(func=lambda a: print(f"hello from {a.rsc.address}"))
+    rsc = MagicMock(address="https://rsc1")
+
+    result = run_on_host("rsc1", args, lambda address: rsc)
+
+    assert result.succeeded
+    assert result.error is None
+    assert "rsc" not in args
+
+
+def test_run_on_host_connect_failure():
+    def connect(address):
+        raise RedfishError(f"Failed to connect to {address}")
+
+    result = run_on_host("rsc1", argparse.Namespace(func=MagicMock()), connect)
+
+    assert not result.succeeded
+    assert result.error == "Failed to connect to rsc1"
+
+
+def test_run_fleet_isolates_failures_and_captures_output():
+    def func(args):
+        print(f"model of {args.rsc.address}")
+        if args.rsc.address == "bad":
+            raise ValueError("boom")
+
+    args = argparse.Namespace(func=func)
+    results = list(
+        run_fleet(["good1", "bad", "good2"], args, lambda a: MagicMock(address=a), 2)
+    )
+
+    by_address = {result.address: result for result in results}
+    assert set(by_address) == {"good1", "bad", "good2"}
+    assert by_address["good1"].succeeded
+    assert by_address["good1"].output == "model of good1\n"
+    assert by_address["good2"].output == "model of good2\n"
+    assert not by_address["bad"].succeeded
+    assert by_address["bad"].error == "Invalid parameters: boom"
+
+
+def test_run_fleet_invalid_workers():
+    with pytest.raises(ValueError):
+        list(run_fleet(["rsc1"], argparse.Namespace(func=MagicMock()), MagicMock(), 0))
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+def test_run_fleet_monitors_the_tasks_of_all_hosts_together(tmp_path, capsys):
+    fw_file = tmp_path / "rsc_fw_2.1.0.xz"
+    fw_file.write_bytes(b"firmware" * 1000)
+
+    def connect(address):
+        rsc = Rsc(RedfishConfig(address, "admin", "password"))
+        rsc.login()
+        return rsc
+
+    args = argparse.Namespace(func=lambda a: manager_ops.update_rsc_firmware(a.rsc, str(fw_file)))
+    with RscSimulator(3, SimulatorConfig(task_duration=0.2, retry_after=1)) as simulator:
+        results = list(run_fleet(simulator.base_urls, args, connect, 3))
+
+    assert all(result.succeeded for result in results)
+    assert "3/3 tasks done (3 succeeded, 0 failed)" in capsys.readouterr().err
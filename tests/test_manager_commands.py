@@ -1,7 +1,9 @@
 """Tests for manager commands"""
 
+import argparse
 from unittest.mock import patch, MagicMock
 import pytest
+from hprsctool.comm.firmware_info import FirmwareInfo
 from hprsctool.commands.manager.manager import (
     print_manager,
     change_password,
@@ -9,6 +11,7 @@ from hprsctool.commands.manager.manager import (
     restart_manager,
     factory_reset_manager,
 )
+from hprsctool.models.manager import Manager
 
 
 @pytest.fixture
@@ -59,10 +62,14 @@ def test_update_firmware(mock_args, mock_rsc):
     mock_args.fw_file_path = "path/to/firmware"
 
     with patch(
+        "hprsctool.commands.manager.manager.firmware_info.get_firmware_info"
+    ) as mock_info, patch(
         "hprsctool.commands.manager.manager.manager_ops.update_rsc_firmware"
     ) as mock_update_firmware:
         update_firmware(mock_args)
-        mock_update_firmware.assert_called_once_with(mock_rsc, "path/to/firmware")
+        mock_update_firmware.assert_called_once_with(
+            mock_rsc, "path/to/firmware", mock_info.return_value.version
+        )
 
 
 def test_restart_manager(mock_args, mock_rsc):
@@ -83,3 +90,60 @@ def test_factory_reset_manager(mock_args, mock_rsc):
     ) as mock_factory_reset:
         factory_reset_manager(mock_args)
         mock_factory_reset.assert_called_once_with(mock_rsc)
+
+
+def test_update_firmware_skips_current_rsc(mock_rsc, capsys):
+    args = argparse.Namespace(
+        rsc=mock_rsc, fw_file_path="rsc_fw_1.2.3.xz", target_version=None, force=False
+    )
+
+    with patch(
+        "hprsctool.commands.manager.manager.firmware_info.get_firmware_info",
+        return_value=FirmwareInfo("rsc_fw_1.2.3.xz", "abc", "1.2.3"),
+    ), patch(
+        "hprsctool.commands.manager.manager.manager_ops.get_manager",
+        return_value=Manager({"FirmwareVersion": "1.2.3"}),
+    ), patch(
+        "hprsctool.commands.manager.manager.manager_ops.update_rsc_firmware"
+    ) as mock_update_firmware:
+        update_firmware(args)
+
+    mock_update_firmware.assert_not_called()
+    assert "already at version 1.2.3" in capsys.readouterr().out
+
+
+def test_update_firmware_updates_outdated_rsc(mock_rsc):
+    args = argparse.Namespace(
+        rsc=mock_rsc, fw_file_path="firmware.xz", target_version="1.2.4", force=False
+    )
+
+    with patch(
+        "hprsctool.commands.manager.manager.firmware_info.get_firmware_info",
+        return_value=FirmwareInfo("firmware.xz", "abc", "1.2.4"),
+    ) as mock_info, patch(
+        "hprsctool.commands.manager.manager.manager_ops.get_manager",
+        return_value=Manager({"FirmwareVersion": "1.2.3"}),
+    ), patch(
+        "hprsctool.commands.manager.manager.manager_ops.update_rsc_firmware"
+    ) as mock_update_firmware:
+        update_firmware(args)
+
+    mock_info.assert_called_once_with("firmware.xz", "1.2.4")
+    mock_update_firmware.assert_called_once_with(mock_rsc, "firmware.xz", "1.2.4")
+
+
+def test_update_firmware_force(mock_rsc):
+    args = argparse.Namespace(
+        rsc=mock_rsc, fw_file_path="firmware.xz", target_version=None, force=True
+    )
+
+    with patch(
+        "hprsctool.commands.manager.manager.firmware_info.get_firmware_info"
+    ) as mock_info, patch(
+        "hprsctool.commands.manager.manager.manager_ops.update_rsc_firmware"
+    ) as mock_update_firmware:
+        update_firmware(args)
+
+    mock_info.assert_called_once_with("firmware.xz", None)
+    mock_rsc.perform_redfish_get.assert_not_called()
+    mock_update_firmware.assert_called_once_with(mock_rsc, "firmware.xz", mock_info.return_value.version)
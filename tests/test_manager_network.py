@@ -94,7 +94,7 @@ def test_set_network_settings_dhcp_enable(mock_args, mock_rsc):
     ) as mock_set_protocol, patch.object(mock_args.rsc, "monitor_task", return_value=mock_response):
         set_network_settings(mock_args)
         mock_set_ethernet.assert_called_once()
-        assert mock_set_protocol.call_count == 2
+        assert mock_set_protocol.call_count == 1
 
 
 def test_set_network_settings_dhcp_disable(mock_args, mock_rsc):
@@ -128,7 +128,7 @@ def test_set_network_settings_dhcp_disable(mock_args, mock_rsc):
     ) as mock_set_protocol, patch.object(mock_args.rsc, "monitor_task", return_value=mock_response):
         set_network_settings(mock_args)
         mock_set_ethernet.assert_called_once()
-        assert mock_set_protocol.call_count == 2
+        assert mock_set_protocol.call_count == 1
 
 
 def test_cannot_use_static_address_when_dhcp_is_enabled(mock_args, mock_rsc):
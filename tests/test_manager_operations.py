@@ -0,0 +1,143 @@
+"""Test cases for manager operations."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redfish.rest.v1 import RetriesExhaustedError
+from requests.structures import CaseInsensitiveDict
+
+from hprsctool.comm.operations import manager as manager_ops
+from hprsctool.comm.remote_system_controller import RedfishError
+
+TASK_MONITOR = "/redfish/v1/TaskService/TaskMonitors/1"
+
+
+@pytest.fixture(name="mock_rsc")
+def fixture_mock_rsc():
+    rsc = MagicMock(address="https://rsc")
+    rsc.client.get_session_key.return_value = "token"
+    return rsc
+
+
+@pytest.fixture(name="fw_file")
+def fixture_fw_file(tmp_path):
+    path = tmp_path / "rsc_fw_1.2.4.xz"
+    path.write_bytes(b"firmware")
+    return str(path)
+
+
+def manager_response(version):
+    return MagicMock(status=200, dict={"FirmwareVersion": version})
+
+
+def started_task():
+    return MagicMock(status_code=202, headers=CaseInsensitiveDict({"Location": TASK_MONITOR}))
+
+
+def test_update_reattaches_to_task_after_session_loss(mock_rsc, fw_file):
+    running = MagicMock(status=202, is_processing=True)
+    mock_rsc.client.get.return_value = running
+    mock_rsc.monitor_task.side_effect = [MagicMock(status=401), MagicMock(status=200)]
+
+    with patch.object(manager_ops, "post_multipart", return_value=started_task()):
+        manager_ops.update_rsc_firmware(mock_rsc, fw_file, "1.2.4")
+
+    mock_rsc.login.assert_called_once()
+    mock_rsc.client.get.assert_called_once_with(TASK_MONITOR)
+    mock_rsc.monitor_task.assert_called_with(running)
+
+
+def rsc_responses(*manager_responses):
+    """client.get side effect: the task is gone, then the manager responses"""
+    responses = iter(manager_responses)
+
+    def get(url):
+        if url == TASK_MONITOR:
+            return MagicMock(status=404)
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return get
+
+
+def test_update_waits_for_version_when_task_is_gone(mock_rsc, fw_file):
+    mock_rsc.monitor_task.return_value = MagicMock(status=401)
+    # The RSC is restarting, rejects the session it forgot, then comes back
+    # with the old, then the new version
+    mock_rsc.login.side_effect = [None, RedfishError("Login failed"), None, None]
+    mock_rsc.client.get.side_effect = rsc_responses(
+        MagicMock(status=401), manager_response("1.2.3"), manager_response("1.2.4")
+    )
+
+    with patch.object(manager_ops, "post_multipart", return_value=started_task()), patch(
+        "time.sleep"
+    ) as mock_sleep:
+        manager_ops.update_rsc_firmware(mock_rsc, fw_file, "1.2.4")
+
+    assert mock_rsc.login.call_count == 4
+    assert mock_rsc.logout.call_count == 4
+    assert mock_sleep.call_count == 3
+
+
+def test_wait_for_firmware_version_keeps_the_session(mock_rsc):
+    mock_rsc.client.get.side_effect = rsc_responses(
+        RetriesExhaustedError(), manager_response("1.2.3"), manager_response("1.2.4")
+    )
+
+    with patch("time.sleep") as mock_sleep:
+        manager_ops.wait_for_firmware_version(mock_rsc, "1.2.4")
+
+    mock_rsc.login.assert_called_once()
+    assert mock_sleep.call_count == 2
+
+
+def test_update_without_target_version_checks_version_change(mock_rsc, fw_file):
+    mock_rsc.perform_redfish_get.return_value = manager_response("1.2.3")
+    mock_rsc.monitor_task.return_value = MagicMock(status=401)
+    mock_rsc.client.get.side_effect = rsc_responses(
+        manager_response("1.2.3"), manager_response("1.2.4")
+    )
+
+    with patch.object(manager_ops, "post_multipart", return_value=started_task()), patch(
+        "time.sleep"
+    ) as mock_sleep:
+        manager_ops.update_rsc_firmware(mock_rsc, fw_file)
+
+    mock_sleep.assert_called_once()
+
+
+def test_wait_for_firmware_version_fails_if_the_version_does_not_change(mock_rsc):
+    mock_rsc.client.get.return_value = manager_response("1.2.3")
+
+    with pytest.raises(RedfishError, match="the RSC runs version 1.2.3"):
+        manager_ops.wait_for_firmware_version(mock_rsc, None, "1.2.3", timeout=0, interval=1)
+
+
+def test_wait_for_firmware_version_without_any_version_is_unconfirmed(mock_rsc):
+    mock_rsc.client.get.return_value = manager_response("1.2.3")
+
+    with pytest.raises(RedfishError, match="could not be confirmed"):
+        manager_ops.wait_for_firmware_version(mock_rsc, None, None)
+
+
+def test_wait_for_firmware_version_times_out(mock_rsc):
+    mock_rsc.client.get.return_value = manager_response("1.2.3")
+
+    with pytest.raises(RedfishError, match="the RSC runs version 1.2.3"):
+        manager_ops.wait_for_firmware_version(mock_rsc, "1.2.4", None, timeout=0, interval=1)
+
+
+def test_reattach_task_monitor_login_keeps_failing(mock_rsc):
+    mock_rsc.login.side_effect = RedfishError("Login failed")
+
+    with pytest.raises(RedfishError, match="session was lost"):
+        manager_ops.reattach_task_monitor(mock_rsc, TASK_MONITOR, timeout=0, interval=1)
+
+
+def test_reattach_task_monitor_reports_task_failure(mock_rsc):
+    failed = MagicMock(status=500, is_processing=False)
+    mock_rsc.client.get.return_value = failed
+
+    assert manager_ops.reattach_task_monitor(mock_rsc, TASK_MONITOR) is failed
+    mock_rsc.monitor_task.assert_not_called()
@@ -1,5 +1,7 @@
 """Tests for models"""
 
+import json
+
 import pytest
 
 from hprsctool.models import (
@@ -49,6 +51,12 @@ def test_certificate_str():
     assert str(cert) == expected_str
 
 
+def test_certificate_normalized_fingerprint():
+    cert = certificate.Certificate({"Fingerprint": "1A:14:c7:93"})
+    assert cert.normalized_fingerprint == "1a14c793"
+    assert certificate.Certificate({}).normalized_fingerprint is None
+
+
 def test_redfish_address_constructor():
     data = {
         "Address": "192.168.1.1",
@@ -645,6 +653,21 @@ def test_task_collection_constructor():
     assert task_collection.members[1] == "/redfish/v1/TaskService/Tasks/Task2"
 
 
+def test_task_collection_expanded():
+    data = {
+        "Members": [
+            {"@odata.id": "/redfish/v1/TaskService/Tasks/Task1", "Id": "Task1"},
+            {"@odata.id": "/redfish/v1/TaskService/Tasks/Task2", "Id": "Task2"},
+        ]
+    }
+    task_collection = task_model.TaskCollection(data)
+    assert task_collection.expanded
+    assert [task.task_id for task in task_collection.tasks] == ["Task1", "Task2"]
+    assert not task_model.TaskCollection(
+        {"Members": [{"@odata.id": "/redfish/v1/TaskService/Tasks/Task1"}]}
+    ).expanded
+
+
 def test_task_collection_constructor_no_data():
     with pytest.raises(ValueError, match="data is required"):
         task_model.TaskCollection(None)
@@ -679,3 +702,23 @@ def test_task_collection_iter():
     assert len(members) == 2
     assert members[0] == "/redfish/v1/TaskService/Tasks/Task1"
     assert members[1] == "/redfish/v1/TaskService/Tasks/Task2"
+
+
+def test_models_are_slotted_and_read_only():
+    system = system_model.System(json.loads(system_model.SAMPLE_SYSTEM_JSON))
+    assert not hasattr(system, "__dict__")
+    with pytest.raises(AttributeError, match="System is read-only"):
+        system.model = "Other"
+    with pytest.raises(AttributeError, match="System is read-only"):
+        del system.data
+    assert system.model == "HP Z2 Mini G9 Workstation Desktop PC"
+
+
+def test_models_parse_nested_objects_once():
+    data = json.loads(system_model.SAMPLE_SYSTEM_JSON)
+    system = system_model.System(data)
+    assert system.data is data
+    assert system.blink_code_state is system.blink_code_state
+    assert system.blink_code_state.message_id == "HPBlinkCode.1.1.0.NoError"
+    assert system.processor_summary.core_count == 12
+    assert system.health == "OK"
@@ -0,0 +1,76 @@
+"""Tests for the prefetch of the resources read by commands."""
+
+import argparse
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from hprsctool.commands.prefetch import uses_resources
+from hprsctool.comm.operations import manager as manager_ops
+from hprsctool.comm.operations import network as network_ops
+from hprsctool.comm.remote_system_controller import RedfishConfig, RedfishError, Rsc
+from hprsctool.simulator.server import RscSimulator, SimulatorConfig
+
+pytestmark = pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+URLS = [manager_ops.MANAGER_URI, network_ops.NETWORK_PROTOCOL_URI, network_ops.ETHERNET_INTERFACE_URI]
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator():
+    with RscSimulator(1, SimulatorConfig(latency=0.1)) as simulator:
+        yield simulator
+
+
+@pytest.fixture(name="rsc")
+def fixture_rsc(simulator):
+    rsc = Rsc(RedfishConfig(simulator.base_urls[0], "admin", "password"))
+    rsc.login()
+    # Open the connections used by concurrent requests
+    with rsc.prefetch(URLS):
+        pass
+    return rsc
+
+
+def test_prefetch_is_as_slow_as_one_request(simulator, rsc):
+    simulator.reset_stats()
+    start = time.monotonic()
+    with rsc.prefetch(URLS):
+        prefetched = time.monotonic() - start
+        assert manager_ops.get_manager(rsc).serial_number == "SIMRSC0000000"
+        network_ops.get_manager_network_protocol(rsc)
+        network_ops.get_manager_ethernet_interface(rsc)
+        # Prefetched responses are only used once
+        manager_ops.get_manager(rsc)
+
+    assert prefetched < 0.25
+    assert simulator.stats().total_requests == 4
+
+
+def test_prefetched_response_dropped_when_resource_changes(rsc):
+    with rsc.prefetch([network_ops.NETWORK_PROTOCOL_URI]):
+        network_ops.set_manager_network_protocol(rsc, {"NTP": {"ProtocolEnabled": True}})
+        protocol = network_ops.get_manager_network_protocol(rsc)
+
+    assert protocol.ntp.ntp_protocol_enabled is True
+
+
+def test_prefetch_error_raised_when_read(simulator, rsc):
+    simulator.controllers[0].inject_errors(1, 500)
+    with rsc.prefetch([manager_ops.MANAGER_URI]):
+        with pytest.raises(RedfishError, match="Simulated error"):
+            manager_ops.get_manager(rsc)
+
+
+def test_uses_resources():
+    rsc = MagicMock()
+    command = MagicMock(__name__="print_things")
+
+    decorated = uses_resources("/redfish/v1/a", "/redfish/v1/b")(command)
+    decorated(argparse.Namespace(rsc=rsc))
+
+    rsc.prefetch.assert_called_once_with(["/redfish/v1/a", "/redfish/v1/b"])
+    command.assert_called_once()
+    assert decorated.resources == ("/redfish/v1/a", "/redfish/v1/b")
+    assert decorated.__name__ == "print_things"
@@ -1,7 +1,10 @@
 """Test cases for redfish_config.py module."""
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 import pytest
-from hprsctool.comm.remote_system_controller import Rsc, RedfishConfig, check_response_for_error
+from hprsctool.comm.remote_system_controller import (
+    PreconditionFailedError, Rsc, RedfishConfig, check_response_for_error
+)
+from hprsctool.comm.response_cache import ResponseCache
 
 @pytest.fixture(name="redfish_config")
 def redfish_config_fixture():
@@ -65,27 +68,27 @@ def test_rsc_logout(rsc):
 def test_perform_redfish_get(rsc):
     url = "/redfish/v1/Systems"
     response = rsc.perform_redfish_get(url)
-    rsc.client.get.assert_called_once_with(url)
+    rsc.client.get.assert_called_once_with(url, timeout=ANY, max_retry=0)
     assert response.status == 200
 
 def test_perform_redfish_patch(rsc):
     url = "/redfish/v1/Systems"
     data = {"Name": "NewName"}
     response = rsc.perform_redfish_patch(url, data)
-    rsc.client.patch.assert_called_once_with(url, body=data)
+    rsc.client.patch.assert_called_once_with(url, body=data, timeout=ANY, max_retry=0)
     assert response.status == 200
 
 def test_perform_redfish_post(rsc):
     url = "/redfish/v1/Systems"
     data = {"Name": "NewName"}
     response = rsc.perform_redfish_post(url, data)
-    rsc.client.post.assert_called_once_with(url, body=data, headers={}, timeout=30)
+    rsc.client.post.assert_called_once_with(url, body=data, headers={}, timeout=ANY, max_retry=0)
     assert response.status == 200
 
 def test_perform_redfish_delete(rsc):
     url = "/redfish/v1/Systems"
     response = rsc.perform_redfish_delete(url)
-    rsc.client.delete.assert_called_once_with(url)
+    rsc.client.delete.assert_called_once_with(url, timeout=ANY, max_retry=0)
     assert response.status == 200
 
 def test_monitor_task(rsc):
@@ -103,3 +106,77 @@ def test_check_response_for_error_no_error():
     response.dict = {}
     error_message = check_response_for_error(response)
     assert error_message is None
+
+def test_rsc_initialization_without_connectivity_check(redfish_config):
+    with patch("redfish.redfish_client") as mock_client:
+        Rsc(redfish_config, check_connectivity=False)
+        assert mock_client.call_args.kwargs["check_connectivity"] is False
+
+def test_resume_session(rsc):
+    assert rsc.resume_session("token", "/redfish/v1/SessionService/Sessions/1")
+    rsc.client.set_session_key.assert_called_once_with("token")
+    rsc.client.get.assert_called_once()
+    assert rsc.client.get.call_args.args == ("/redfish/v1/SessionService/Sessions/1",)
+
+def test_resume_session_rejected(rsc):
+    rsc.client.get.return_value = MagicMock(status=401, dict={}, text="")
+    assert not rsc.resume_session("token", "/redfish/v1/SessionService/Sessions/1")
+    rsc.client.set_session_key.assert_called_with(None)
+
+def test_perform_redfish_get_many_keeps_order(rsc):
+    rsc.client.get.side_effect = lambda url, **_: MagicMock(status=200, dict={"url": url}, text="x")
+    urls = [f"/redfish/v1/TaskService/Tasks/{i}" for i in range(20)]
+    responses = rsc.perform_redfish_get_many(urls)
+    assert [response.dict["url"] for response in responses] == urls
+
+def test_supports_query(rsc):
+    rsc.client.root_resp = MagicMock(dict={
+        "ProtocolFeaturesSupported": {
+            "ExpandQuery": {"NoLinks": True, "Links": False},
+            "FilterQuery": True,
+        }
+    })
+    assert rsc.supports_query("ExpandQuery", "NoLinks")
+    assert not rsc.supports_query("ExpandQuery", "Links")
+    assert rsc.supports_query("FilterQuery")
+    assert not rsc.supports_query("SelectQuery")
+
+def test_perform_redfish_get_with_response_cache(rsc):
+    rsc.response_cache = MagicMock()
+    rsc.response_cache.request_headers.return_value = {"If-None-Match": '"1"'}
+    rsc.response_cache.update.return_value = MagicMock(status=200, dict={}, text="")
+    url = "/redfish/v1/Managers/1"
+    response = rsc.perform_redfish_get(url)
+    rsc.client.get.assert_called_once_with(
+        url, headers={"If-None-Match": '"1"'}, timeout=ANY, max_retry=0
+    )
+    assert response == rsc.response_cache.update.return_value
+
+def test_perform_redfish_patch_with_if_match(rsc):
+    url = "/redfish/v1/Managers/1"
+    read = MagicMock(status=200, dict={}, text="")
+    read.getheader.side_effect = lambda name: '"1"' if name == "ETag" else None
+    rsc.client.get.return_value = read
+    rsc.conditional_writes = True
+    rsc.perform_redfish_get(url)
+
+    rsc.perform_redfish_patch(url, {"DateTime": "now"})
+    rsc.client.patch.assert_called_once_with(
+        url, body={"DateTime": "now"}, headers={"If-Match": '"1"'}, timeout=ANY, max_retry=0
+    )
+
+    rsc.perform_redfish_get(url)
+    rsc.client.patch.return_value = MagicMock(status=412, dict={}, text="")
+    with pytest.raises(PreconditionFailedError):
+        rsc.perform_redfish_patch(url, {"DateTime": "now"})
+
+def test_not_modified_without_cached_entry_is_read_again(rsc):
+    rsc.response_cache = ResponseCache("example.com")
+    not_modified = MagicMock(status=304, dict={}, text="")
+    read = MagicMock(status=200, dict={"Id": "1"}, text='{"Id": "1"}')
+    for response in (not_modified, read):
+        response.getheader.return_value = None
+    rsc.client.get.side_effect = [not_modified, read]
+    url = "/redfish/v1/Managers/1"
+    assert rsc.perform_redfish_get(url) == read
+    assert rsc.client.get.call_args_list[1].kwargs == {"timeout": ANY, "max_retry": 0}
@@ -1,6 +1,18 @@
 """Tests for the redfish_messages module."""
 
-from hprsctool.comm.redfish_messages import get_error_message
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hprsctool.comm import redfish_messages
+from hprsctool.comm.redfish_messages import get_error_message, get_redfish_message
+
+REGISTRY = {
+    "Id": "HPBlinkCode.1.1.0",
+    "Messages": {"Code1": {"Message": "Blink %1 times"}},
+}
 
 def test_get_error_message_with_none():
     """Test get_error_message with None input."""
@@ -42,3 +54,88 @@ def test_get_error_message_with_extended_info():
         ]
     }
     assert get_error_message(resp_json) == "Error 123 occurred."
+
+
+@pytest.fixture(name="registry_dirs")
+def fixture_registry_dirs(tmp_path, monkeypatch):
+    packaged_dir = tmp_path / "packaged"
+    packaged_dir.mkdir()
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(redfish_messages, "PACKAGED_REGISTRIES_DIR", packaged_dir)
+    monkeypatch.setattr(redfish_messages, "registry_cache_dir", cache_dir)
+    monkeypatch.setattr(redfish_messages, "cached_registries", {})
+    return packaged_dir, cache_dir
+
+
+@patch("hprsctool.comm.redfish_messages.requests.get")
+def test_get_redfish_message_caches_registry_on_disk(mock_get, registry_dirs):
+    """A downloaded registry is written to the cache and reused without network."""
+    _, cache_dir = registry_dirs
+    mock_get.return_value = MagicMock(json=MagicMock(return_value=REGISTRY))
+
+    message = get_redfish_message("https://rsc1", "HPBlinkCode.1.1.0.Code1", ["2"])
+
+    assert message == "Blink 2 times"
+    mock_get.assert_called_once()
+    assert mock_get.call_args.args[0] == "https://rsc1/registries/en/HPBlinkCode.1.1.0.json"
+    assert json.loads((cache_dir / "HPBlinkCode.1.1.0.json").read_text()) == REGISTRY
+
+    # A new process on another RSC finds the registry on disk
+    redfish_messages.cached_registries.clear()
+    assert get_redfish_message("https://rsc2", "HPBlinkCode.1.1.0.Code1", ["3"]) == "Blink 3 times"
+    mock_get.assert_called_once()
+
+
+@patch("hprsctool.comm.redfish_messages.requests.get")
+def test_get_redfish_message_uses_packaged_registry(mock_get, registry_dirs):
+    """A registry shipped with the package is used without network."""
+    packaged_dir, cache_dir = registry_dirs
+    (packaged_dir / "HPBlinkCode.1.1.0.json").write_text(json.dumps(REGISTRY))
+
+    assert get_redfish_message("https://rsc1", "HPBlinkCode.1.1.0.Code1", ["2"]) == "Blink 2 times"
+    mock_get.assert_not_called()
+    assert not cache_dir.exists()
+
+
+@patch("hprsctool.comm.redfish_messages.requests.get")
+def test_get_redfish_message_ignores_other_versions_and_bad_files(mock_get, registry_dirs):
+    """Only a valid file of the exact registry version is used."""
+    packaged_dir, cache_dir = registry_dirs
+    (packaged_dir / "HPBlinkCode.1.0.0.json").write_text(json.dumps(REGISTRY))
+    cache_dir.mkdir()
+    (cache_dir / "HPBlinkCode.1.1.0.json").write_text("{not json")
+    mock_get.return_value = MagicMock(json=MagicMock(return_value=REGISTRY))
+
+    assert get_redfish_message("https://rsc1", "HPBlinkCode.1.1.0.Code1", ["2"]) == "Blink 2 times"
+    mock_get.assert_called_once()
+    assert json.loads((cache_dir / "HPBlinkCode.1.1.0.json").read_text()) == REGISTRY
+
+
+@patch("hprsctool.comm.redfish_messages.requests.get")
+def test_slow_download_does_not_block_other_registries(mock_get, registry_dirs):
+    """Only the threads waiting for the registry being downloaded wait for it."""
+    packaged_dir, _ = registry_dirs
+    (packaged_dir / "Base.1.8.1.json").write_text(
+        json.dumps({"Id": "Base.1.8.1", "Messages": {"Success": {"Message": "Done"}}})
+    )
+    downloading = threading.Event()
+    release = threading.Event()
+
+    def slow_get(*_, **__):
+        downloading.set()
+        release.wait(5)
+        return MagicMock(json=MagicMock(return_value=REGISTRY))
+
+    mock_get.side_effect = slow_get
+    download = threading.Thread(
+        target=get_redfish_message, args=("https://rsc1", "HPBlinkCode.1.1.0.Code1", ["2"])
+    )
+    download.start()
+    try:
+        assert downloading.wait(5)
+        assert get_redfish_message("https://rsc2", "Base.1.8.1.Success") == "Done"
+        assert download.is_alive()
+    finally:
+        release.set()
+        download.join()
+    mock_get.assert_called_once()
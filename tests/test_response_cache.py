@@ -0,0 +1,98 @@
+"""Tests for the response_cache module."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from hprsctool.comm.response_cache import ResponseCache
+
+
+def make_response(status=200, etag='"1"', body='{"Id": "1"}'):
+    response = MagicMock(status=status, text=body)
+    response.getheader.side_effect = lambda name: etag if name == "ETag" else None
+    response.getheaders.return_value = [("ETag", etag)] if etag else []
+    response.dict = {} if not body else {"Id": "1"}
+    return response
+
+
+@pytest.fixture(name="cache")
+def fixture_cache():
+    return ResponseCache("https://rsc1")
+
+
+def test_conditional_get_served_from_cache(cache):
+    url = "/redfish/v1/Managers/1"
+    assert cache.request_headers(url) == {}
+
+    cache.update(url, make_response())
+    assert cache.request_headers(url) == {"If-None-Match": '"1"'}
+
+    response = cache.update(url, make_response(status=304, etag=None, body=""))
+    assert response.status == 200
+    assert response.dict == {"Id": "1"}
+    assert response.getheader("etag") == '"1"'
+    assert cache.stats == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_response_without_etag_not_cached(cache):
+    cache.update("/redfish/v1/Systems/1", make_response(etag=None))
+    assert cache.stats["entries"] == 0
+
+
+def test_odata_etag_used_when_header_missing(cache):
+    response = make_response(etag=None)
+    response.dict = {"@odata.etag": 'W/"abc"'}
+    cache.update("/redfish/v1/Systems/1", response)
+    assert cache.request_headers("/redfish/v1/Systems/1") == {"If-None-Match": 'W/"abc"'}
+
+
+def test_expired_entries_dropped():
+    cache = ResponseCache("https://rsc1", ttl=60)
+    cache.update("/redfish/v1/Managers/1", make_response())
+    cache.lookup("/redfish/v1/Managers/1").stored_at = time.time() - 61
+    assert cache.lookup("/redfish/v1/Managers/1") is None
+
+
+def test_least_recently_used_evicted():
+    cache = ResponseCache("https://rsc1", max_entries=2)
+    cache.update("/a", make_response())
+    cache.update("/b", make_response())
+    cache.lookup("/a")
+    cache.update("/c", make_response())
+    assert cache.lookup("/b") is None
+    assert cache.lookup("/a") is not None
+    assert cache.lookup("/c") is not None
+
+
+def test_disk_cache_survives_instances(tmp_path):
+    ResponseCache("https://rsc1", cache_dir=tmp_path).update("/a", make_response())
+    assert ResponseCache("https://rsc1", cache_dir=tmp_path).request_headers("/a") == {
+        "If-None-Match": '"1"'
+    }
+    assert ResponseCache("https://rsc2", cache_dir=tmp_path).request_headers("/a") == {}
+
+
+def test_lookup_fresh(cache):
+    url = "/redfish/v1/Managers/1"
+    cache.update(url, make_response())
+    assert cache.lookup_fresh(url).etag == '"1"'
+
+    cache.lookup(url).stored_at -= cache.fresh_for + 1
+    assert cache.lookup_fresh(url) is None
+    assert cache.lookup(url) is not None
+
+
+def test_disk_cache_keeps_the_entries_of_other_instances(tmp_path):
+    first = ResponseCache("https://rsc1", cache_dir=tmp_path)
+    second = ResponseCache("https://rsc1", cache_dir=tmp_path)
+    first.update("/a", make_response())
+    second.update("/b", make_response(etag='"2"'))
+    first.invalidate("/c")
+
+    cache = ResponseCache("https://rsc1", cache_dir=tmp_path)
+    assert cache.request_headers("/a") == {"If-None-Match": '"1"'}
+    assert cache.request_headers("/b") == {"If-None-Match": '"2"'}
+
+    second.invalidate("/a")
+    assert ResponseCache("https://rsc1", cache_dir=tmp_path).request_headers("/a") == {}
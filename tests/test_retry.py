@@ -0,0 +1,234 @@
+"""Tests for the retry module and the retries of the Rsc requests."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from redfish.rest.v1 import RetriesExhaustedError
+
+from hprsctool.comm.remote_system_controller import CircuitOpenError, RedfishConfig, RedfishError, Rsc
+from hprsctool.comm.retry import (
+    CircuitBreaker,
+    RetryPolicy,
+    can_retry_error,
+    can_retry_status,
+    get_circuit_breaker,
+    get_retry_after,
+)
+from hprsctool.hprsctool import create_argument_parser, run
+from hprsctool.simulator.server import RscSimulator
+
+FAST_POLICY = RetryPolicy(attempts=3, backoff=0.001, max_backoff=0.001)
+
+
+def response(status: int, retry_after: str | None = None) -> MagicMock:
+    result = MagicMock(status=status, dict={}, text="")
+    result.getheader.side_effect = lambda name: retry_after if name == "Retry-After" else None
+    return result
+
+
+def refused() -> RetriesExhaustedError:
+    error = RetriesExhaustedError()
+    error.__cause__ = requests.exceptions.ConnectionError("refused")
+    return error
+
+
+@pytest.fixture(name="rsc")
+def fixture_rsc():
+    with patch("redfish.redfish_client"):
+        yield Rsc(RedfishConfig("https://rsc1", "admin", "password"), retry_policy=FAST_POLICY)
+
+
+def test_delay_has_full_jitter():
+    policy = RetryPolicy(backoff=1.0, max_backoff=4.0)
+    with patch("random.uniform", side_effect=lambda low, high: high) as uniform:
+        assert [policy.delay(attempt) for attempt in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 4.0]
+    uniform.assert_called_with(0, 4.0)
+    assert policy.delay(1, retry_after=7) == 7
+
+
+def test_timeouts_stay_within_the_deadline():
+    policy = RetryPolicy(connect_timeout=10, read_timeout=30)
+    assert policy.timeouts(60) == (10, 30)
+    assert policy.timeouts(5) == (5, 5)
+
+
+def test_from_config():
+    policy = RetryPolicy.from_config(RedfishConfig("https://rsc1", "admin", "password", timeout=5, max_retry=1))
+    assert (policy.attempts, policy.connect_timeout, policy.read_timeout) == (2, 5, 5)
+
+
+def test_only_requests_not_processed_are_retried_with_any_method():
+    assert can_retry_status("GET", 502)
+    assert not can_retry_status("PATCH", 502)
+    assert can_retry_status("POST", 503)
+    assert not can_retry_status("GET", 500)
+    assert can_retry_error("POST", requests.exceptions.ConnectTimeout())
+    assert not can_retry_error("POST", requests.exceptions.ReadTimeout())
+    assert can_retry_error("DELETE", requests.exceptions.ReadTimeout())
+
+
+def test_get_retry_after():
+    assert get_retry_after(response(503, "3")) == 3
+    assert get_retry_after(response(503, "Thu, 01 Jan 1970 00:00:00 GMT")) == 0
+    assert get_retry_after(response(503, "soon")) is None
+    assert get_retry_after(response(503)) is None
+
+
+def test_circuit_breaker_lets_a_single_trial_through_after_the_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    with patch("time.monotonic", return_value=100.0) as monotonic:
+        breaker.record_failure()
+        assert breaker.allow() is None
+        breaker.record_failure()
+        assert breaker.allow() == 10
+
+        monotonic.return_value = 110.0
+        assert breaker.allow() is None
+        assert breaker.allow() == 0
+        breaker.record_failure()
+        assert breaker.allow() == 10
+
+        monotonic.return_value = 120.0
+        assert breaker.allow() is None
+        breaker.record_success()
+        assert not breaker.is_open
+        assert breaker.allow() is None
+
+
+def test_breakers_are_shared_by_address():
+    assert get_circuit_breaker("https://rsc1") is get_circuit_breaker("https://rsc1")
+    assert get_circuit_breaker("https://rsc1") is not get_circuit_breaker("https://rsc2")
+
+
+def test_get_is_retried_after_retry_after(rsc):
+    rsc.client.get.side_effect = [response(503, "2"), refused(), response(200)]
+
+    with patch("time.sleep") as sleep:
+        assert rsc.perform_redfish_get("/redfish/v1/Systems/1").status == 200
+
+    assert rsc.client.get.call_count == 3
+    assert sleep.call_args_list[0].args == (2,)
+    assert rsc.client.get.call_args.kwargs["max_retry"] == 0
+
+
+def test_patch_is_not_retried_when_it_may_have_been_processed(rsc):
+    rsc.client.patch.side_effect = [response(502), response(200)]
+    with pytest.raises(RedfishError, match="HTTP error: 502"):
+        rsc.perform_redfish_patch("/redfish/v1/Managers/1", {"DateTime": "now"})
+
+    rsc.client.patch.side_effect = [response(429, "0"), response(200)]
+    assert rsc.perform_redfish_patch("/redfish/v1/Managers/1", {"DateTime": "now"}).status == 200
+    assert rsc.client.patch.call_count == 3
+
+
+def test_requests_fail_fast_while_the_circuit_is_open(rsc):
+    rsc.client.get.side_effect = refused()
+
+    with pytest.raises(RedfishError, match="Failed to connect to the RSC"):
+        rsc.perform_redfish_get("/redfish/v1/Systems/1")
+    with pytest.raises(CircuitOpenError):
+        rsc.perform_redfish_get("/redfish/v1/Systems/1")
+
+    assert rsc.client.get.call_count == 5
+    with pytest.raises(CircuitOpenError), patch("redfish.redfish_client") as redfish_client:
+        Rsc(RedfishConfig("https://rsc1", "admin", "password"))
+    redfish_client.assert_not_called()
+
+    rsc.breaker.opened_at -= rsc.breaker.reset_timeout
+    rsc.login()
+    assert not rsc.breaker.is_open
+
+
+def test_unexpected_errors_of_the_trial_let_another_trial_through(rsc):
+    for _ in range(rsc.breaker.failure_threshold):
+        rsc.breaker.record_failure()
+    rsc.breaker.opened_at -= rsc.breaker.reset_timeout
+    rsc.client.get.side_effect = ValueError("bad response")
+    with pytest.raises(ValueError):
+        rsc.perform_redfish_get("/redfish/v1/Systems/1")
+
+    rsc.client.login.side_effect = TypeError("bad login")
+    with pytest.raises(RedfishError, match="Login failed: bad login"):
+        rsc.login()
+
+    rsc.client.get.side_effect = None
+    rsc.client.get.return_value = response(200)
+    assert rsc.perform_redfish_get("/redfish/v1/Systems/1").status == 200
+    assert not rsc.breaker.is_open
+
+
+def test_resume_session_fails_fast_while_the_circuit_is_open(rsc):
+    rsc.client.get.side_effect = refused()
+    with pytest.raises(RedfishError, match="Failed to connect to the RSC"):
+        rsc.resume_session("token", "/redfish/v1/SessionService/Sessions/1")
+    assert rsc.client.get.call_count == 3
+
+    with pytest.raises(RedfishError):
+        rsc.perform_redfish_get("/redfish/v1/Systems/1")
+    with pytest.raises(CircuitOpenError):
+        rsc.resume_session("token", "/redfish/v1/SessionService/Sessions/1")
+    assert rsc.client.get.call_count == 5
+
+
+def test_uploads_are_sent_once_and_fail_fast_while_the_circuit_is_open(rsc):
+    url = "/redfish/v1/UpdateService/MultipartUpdate"
+    fields = {"UpdateFile": ("fw.bin", b"firmware")}
+    with patch(
+        "hprsctool.comm.remote_system_controller.post_multipart",
+        side_effect=requests.exceptions.ConnectTimeout("timed out"),
+    ) as post_multipart:
+        with pytest.raises(RedfishError, match="Failed to connect to the RSC"):
+            rsc.perform_redfish_post(url, fields, is_multipart=True)
+        assert post_multipart.call_count == 1
+
+        for _ in range(rsc.breaker.failure_threshold - 1):
+            rsc.breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            rsc.perform_redfish_post(url, fields, is_multipart=True)
+        assert post_multipart.call_count == 1
+
+
+def test_task_monitor_polls_are_retried(rsc):
+    running = MagicMock(
+        is_processing=True, dict={}, retry_after=None, task_location="/redfish/v1/TaskMonitors/1"
+    )
+    done = response(200)
+    done.is_processing = False
+    rsc.client.get.side_effect = [response(503, "0"), done]
+
+    with patch("time.sleep"):
+        assert rsc.monitor_task(running, use_events=False) is done
+
+    assert rsc.client.get.call_count == 2
+    assert rsc.client.get.call_args.args == ("/redfish/v1/TaskMonitors/1",)
+
+
+def test_retry_options_only_apply_to_their_command(rsc):
+    argparser = create_argument_parser()
+    policies = []
+    for options in (["--retries", "5"], []):
+        args = argparser.parse_args(
+            ["-u", "admin", "-p", "password", "-a", "https://rsc1", *options, "system", "get"]
+        )
+        args.func = MagicMock(
+            __name__="get", side_effect=lambda args: policies.append(args.rsc.retry_policy)
+        )
+        run(args, argparser, lambda *_: rsc)
+
+    assert policies[0].attempts == 6
+    assert policies[1] == RetryPolicy.from_config(rsc.config)
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+def test_gateway_errors_are_retried_on_the_simulator():
+    with RscSimulator(1) as simulator:
+        rsc = Rsc(RedfishConfig(simulator.base_urls[0], "admin", "password"), retry_policy=FAST_POLICY)
+        rsc.login()
+        simulator.controllers[0].inject_errors(2, 502)
+        simulator.reset_stats()
+
+        assert rsc.perform_redfish_get("/redfish/v1/Systems/1").status == 200
+
+        assert simulator.stats().requests["GET /redfish/v1/Systems/1"] == 3
+        rsc.logout()
@@ -0,0 +1,118 @@
+"""Tests for the session_cache module."""
+
+import os
+import stat
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hprsctool.comm.remote_system_controller import RedfishConfig
+from hprsctool.comm.session_cache import CachedSession, SessionCache
+
+
+@pytest.fixture(name="mock_rsc")
+def fixture_mock_rsc():
+    rsc = MagicMock()
+    rsc.config = RedfishConfig("https://rsc1", "admin", "password")
+    rsc.client.get_session_key.return_value = "token1"
+    rsc.client.get_session_location.return_value = (
+        "https://rsc1/redfish/v1/SessionService/Sessions/1"
+    )
+    return rsc
+
+
+@pytest.fixture(name="cache")
+def fixture_cache(tmp_path):
+    return SessionCache(tmp_path / "sessions.json")
+
+
+def test_login_without_cached_session(cache, mock_rsc):
+    cache.login(mock_rsc)
+
+    mock_rsc.resume_session.assert_not_called()
+    mock_rsc.login.assert_called_once()
+    entry = cache._load()[SessionCache.key("https://rsc1", "admin")]
+    assert entry.token == "token1"
+    assert entry.location == "/redfish/v1/SessionService/Sessions/1"
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(cache.cache_file).st_mode) == 0o600
+
+
+def test_login_reuses_cached_session(cache, mock_rsc):
+    cache.login(mock_rsc)
+    mock_rsc.login.reset_mock()
+    mock_rsc.resume_session.return_value = True
+
+    cache.login(mock_rsc)
+
+    mock_rsc.resume_session.assert_called_once_with(
+        "token1", "/redfish/v1/SessionService/Sessions/1"
+    )
+    mock_rsc.login.assert_not_called()
+
+
+def test_login_when_cached_session_rejected(cache, mock_rsc):
+    cache.login(mock_rsc)
+    mock_rsc.login.reset_mock()
+    mock_rsc.resume_session.return_value = False
+
+    cache.login(mock_rsc)
+
+    mock_rsc.login.assert_called_once()
+
+
+def test_idle_sessions_are_logged_out(cache, mock_rsc):
+    cache._save(
+        {
+            "admin@https://rsc2": CachedSession(
+                "https://rsc2", "old-token", "/redfish/v1/SessionService/Sessions/7",
+                time.time() - cache.max_idle - 1,
+            )
+        }
+    )
+
+    with patch("hprsctool.comm.session_cache.requests.delete") as mock_delete:
+        cache.login(mock_rsc)
+
+    mock_delete.assert_called_once_with(
+        "https://rsc2/redfish/v1/SessionService/Sessions/7",
+        headers={"X-Auth-Token": "old-token"},
+        verify=False,
+        timeout=mock_rsc.config.timeout,
+    )
+    assert list(cache._load()) == ["admin@https://rsc1"]
+
+
+def test_least_recently_used_session_evicted_when_full(tmp_path, mock_rsc):
+    cache = SessionCache(tmp_path / "sessions.json", max_entries=2)
+    now = time.time()
+    cache._save(
+        {
+            "admin@https://old": CachedSession("https://old", "t1", "/s/1", now - 10),
+            "admin@https://new": CachedSession("https://new", "t2", "/s/2", now - 5),
+        }
+    )
+
+    with patch("hprsctool.comm.session_cache.requests.delete") as mock_delete:
+        cache.login(mock_rsc)
+
+    assert mock_delete.call_args[0][0] == "https://old/s/1"
+    assert set(cache._load()) == {"admin@https://new", "admin@https://rsc1"}
+
+
+@pytest.mark.skipif(os.name != "posix", reason="The file lock needs fcntl")
+def test_concurrent_caches_keep_each_other_sessions(tmp_path, mock_rsc):
+    other = SessionCache(tmp_path / "sessions.json")
+    cache = SessionCache(tmp_path / "sessions.json")
+    login = threading.Thread(target=cache.login, args=(mock_rsc,))
+
+    with other._locked():
+        login.start()
+        login.join(0.2)
+        assert login.is_alive()
+        other._save({"admin@https://rsc2": CachedSession("https://rsc2", "t2", "/s/2", time.time())})
+    login.join()
+
+    assert set(cache._load()) == {"admin@https://rsc1", "admin@https://rsc2"}
@@ -0,0 +1,148 @@
+"""Tests for the local RSC simulator."""
+
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import ssl
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from hprsctool.comm.operations import manager as manager_ops
+from hprsctool.comm.operations import network as network_ops
+from hprsctool.comm.operations import system as system_ops
+from hprsctool.comm.operations import task as task_ops
+from hprsctool.comm.remote_system_controller import RedfishConfig, RedfishError, Rsc
+from hprsctool.comm.response_cache import ResponseCache
+from hprsctool.simulator import server
+from hprsctool.simulator.server import RscSimulator, SimulatorConfig
+
+pytestmark = pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+AUTHORIZATION = "Basic " + base64.b64encode(b"admin:password").decode()
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator():
+    with RscSimulator(2, SimulatorConfig(task_duration=0.2, retry_after=0)) as simulator:
+        yield simulator
+
+
+def connect(simulator, index=0, password="password", **kwargs) -> Rsc:
+    rsc = Rsc(RedfishConfig(simulator.base_urls[index], "admin", password), **kwargs)
+    rsc.login()
+    return rsc
+
+
+def test_serves_operations_over_https(simulator):
+    assert simulator.scheme == "https"
+    rsc = connect(simulator, 1)
+
+    assert system_ops.get_system(rsc).serial_number == "SIM0000001"
+    network_ops.set_manager_network_protocol(rsc, {"NTP": {"NTPServers": ["ntp.example.com"]}})
+    protocol = network_ops.get_manager_network_protocol(rsc)
+    assert protocol.ntp.ntp_servers == ["ntp.example.com"]
+    assert protocol.proxy.proxy_enabled is False
+    rsc.logout()
+
+    assert not simulator.controllers[1].sessions
+    assert simulator.controllers[0].stats.total_requests == 0
+    stats = simulator.stats()
+    assert stats.requests["PATCH /redfish/v1/Managers/1/NetworkProtocol"] == 1
+    assert stats.bytes_sent > stats.bytes_received > 0
+
+
+def test_rejects_invalid_credentials_and_lost_sessions(simulator):
+    with pytest.raises(RedfishError, match="Login failed"):
+        connect(simulator, password="wrong")
+
+    rsc = connect(simulator)
+    simulator.controllers[0].expire_sessions()
+    with pytest.raises(RedfishError, match="GET failed"):
+        manager_ops.get_manager(rsc)
+
+
+def test_conditional_get(simulator):
+    rsc = connect(simulator, response_cache=ResponseCache(simulator.base_urls[0]))
+
+    manager_ops.get_manager(rsc)
+    assert manager_ops.get_manager(rsc).firmware_version == "1.0.0"
+    assert rsc.response_cache.hits == 1
+
+
+def test_firmware_update_task(simulator, tmp_path):
+    fw_file = tmp_path / "rsc_fw_2.1.0.xz"
+    fw_file.write_bytes(b"firmware" * 1000)
+    rsc = connect(simulator)
+
+    with patch("builtins.print"):
+        manager_ops.update_rsc_firmware(rsc, str(fw_file))
+
+    assert manager_ops.get_manager(rsc).firmware_version == "2.1.0"
+    [task] = task_ops.get_tasks(rsc)
+    assert task.task_state == "Completed"
+
+
+def test_task_monitor_sends_retry_after(tmp_path):
+    config = SimulatorConfig(task_duration=60, retry_after=3)
+    with RscSimulator(1, config) as simulator:
+        rsc = connect(simulator)
+        response = requests.post(
+            f"{simulator.base_urls[0]}/redfish/v1/UpdateService/MultipartUpdate",
+            files={"UpdateFile": ("rsc_fw_2.1.0.xz", b"firmware")},
+            headers={"X-Auth-Token": rsc.client.get_session_key()},
+            verify=False,
+            timeout=10,
+        )
+        monitor = rsc.client.get(response.headers["Location"])
+
+    assert response.status_code == 202
+    assert monitor.status == 202
+    assert monitor.retry_after == 3
+    assert monitor.dict["TaskState"] == "Running"
+
+
+def test_error_injection_and_latency():
+    with RscSimulator(1, SimulatorConfig(latency=0.05, jitter=0.02, seed=1)) as simulator:
+        rsc = connect(simulator)
+        simulator.controllers[0].inject_errors(1, 500)
+        with pytest.raises(RedfishError, match="Simulated error"):
+            system_ops.get_system(rsc)
+
+        start = time.monotonic()
+        system_ops.get_system(rsc)
+        assert time.monotonic() - start >= 0.05
+
+
+def test_serves_hundreds_of_rscs():
+    # One client TLS context for all the connections, requests creates one
+    # per connection
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+
+    def get_serial_number(address):
+        connection = http.client.HTTPSConnection(address, timeout=10, context=context)
+        connection.request("GET", "/redfish/v1/Systems/1", headers={"Authorization": AUTHORIZATION})
+        body = json.loads(connection.getresponse().read())
+        connection.close()
+        return body["SerialNumber"]
+
+    with RscSimulator(200) as simulator:
+        with ThreadPoolExecutor(32) as executor:
+            serial_numbers = list(executor.map(get_serial_number, simulator.addresses))
+
+    assert serial_numbers == [f"SIM{index:07d}" for index in range(200)]
+
+
+def test_falls_back_to_http_without_openssl():
+    with patch.object(server, "create_self_signed_certificate", return_value=None), patch(
+        "sys.stderr"
+    ):
+        with RscSimulator(1) as simulator:
+            rsc = connect(simulator)
+            assert simulator.scheme == "http"
+            assert manager_ops.get_manager(rsc).serial_number == "SIMRSC0000000"
@@ -0,0 +1,68 @@
+"""Tests keeping the start-up of hprsctool cheap."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Generous budget for importing the main module, in milliseconds. Importing
+# redfish and requests alone takes well over 100 ms, so this catches them
+# being pulled in at start-up again. Slow CI machines can raise it.
+STARTUP_BUDGET_MS = float(os.environ.get("HPRSCTOOL_STARTUP_BUDGET_MS", "60"))
+
+HEAVY_MODULES = ["redfish", "requests", "hprsctool.comm", "hprsctool.commands", "hprsctool.models"]
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(*args):
+    """Run python with -X importtime and return the cumulative time of each
+    imported module, in microseconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=ROOT_DIR,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return result, times
+
+
+def heavy_imports(times):
+    return [
+        name for name in times if any(name == m or name.startswith(m + ".") for m in HEAVY_MODULES)
+    ]
+
+
+def test_import_main_module_is_light():
+    _, times = import_times("-c", "import hprsctool.hprsctool")
+
+    assert heavy_imports(times) == []
+    assert times["hprsctool.hprsctool"] / 1000 < STARTUP_BUDGET_MS
+
+
+@pytest.mark.parametrize("args", [["--version"], ["-h"]])
+def test_version_and_help_do_not_import_redfish(args):
+    result, times = import_times("-m", "hprsctool.hprsctool", *args)
+
+    assert result.returncode == 0
+    assert heavy_imports(times) == []
+
+
+def test_only_selected_command_is_loaded():
+    result, times = import_times("-m", "hprsctool.hprsctool", "-u", "u", "-p", "p", "tasks", "-h")
+
+    assert result.returncode == 0
+    assert "list tasks" in result.stdout
+    # importlib.import_module is not timed by -X importtime, so look at the
+    # operations each command module imports
+    assert "hprsctool.comm.operations.task" in times
+    assert "hprsctool.comm.operations.manager" not in times
+    assert "hprsctool.comm.operations.system" not in times
@@ -0,0 +1,192 @@
+"""Tests for task monitoring through the SSE event stream."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hprsctool.comm import task_events
+from hprsctool.comm.remote_system_controller import RedfishConfig, Rsc
+from hprsctool.comm.task_events import TaskEventListener, read_events
+
+SSE_URI = "/redfish/v1/EventService/SSE"
+
+TASK_EVENT = {"Events": [{"MessageId": "TaskEvent.1.0.TaskCompletedOK"}]}
+OTHER_EVENT = {"Events": [{"MessageId": "ResourceEvent.1.0.ResourceChanged"}]}
+
+
+class SseHandler(BaseHTTPRequestHandler):
+    """Stand-in for the SSE stream of an RSC. Sends the events queued on the
+    server, waiting for each one to be released."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.server.tokens.append(self.headers.get("X-Auth-Token"))
+        if self.path != SSE_URI:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self.wfile.write(b": keep-alive\n\n")
+        self.wfile.flush()
+        for release, event in self.server.events:
+            if not release.wait(5):
+                return
+            self.wfile.write(f"id: 1\ndata: {json.dumps(event)}\n\n".encode())
+            self.wfile.flush()
+        self.server.done.wait(5)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(name="sse_server")
+def fixture_sse_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SseHandler)
+    server.daemon_threads = True
+    server.tokens = []
+    server.events = []
+    server.done = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.done.set()
+    for release, _ in server.events:
+        release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def make_rsc(base_url):
+    with patch("redfish.redfish_client") as mock_client:
+        rsc = Rsc(RedfishConfig(base_url, "admin", "password"))
+    rsc.client = mock_client.return_value
+    rsc.client.get_session_key.return_value = "token"
+    rsc.client.root_resp = MagicMock(
+        dict={"EventService": {"@odata.id": "/redfish/v1/EventService"}}
+    )
+    rsc.client.get.return_value = MagicMock(
+        status=200, dict={"ServiceEnabled": True, "ServerSentEventUri": SSE_URI}, text="x"
+    )
+    return rsc
+
+
+def make_task_responses(rsc, count):
+    """Task monitor responses: count 202 responses, then a 200, each one
+    returned by the GET of the task monitor of the previous one"""
+    final = MagicMock(is_processing=False, status=200, dict={"TaskState": "Completed"})
+    responses = [
+        MagicMock(
+            is_processing=True,
+            status=202,
+            dict={},
+            retry_after=None,
+            task_location=f"/redfish/v1/TaskMonitors/{i}",
+        )
+        for i in range(count)
+    ]
+    next_responses = {
+        response.task_location: next_response
+        for response, next_response in zip(responses, responses[1:] + [final])
+    }
+    other = rsc.client.get.return_value
+    rsc.client.get.side_effect = lambda url, **_: next_responses.get(url, other)
+    return responses[0], final
+
+
+def test_read_events():
+    lines = [
+        ": comment",
+        "id: 1",
+        'data: {"Events":',
+        "data: []}",
+        "",
+        "data: not json",
+        "",
+        "",
+        'data:{"a": 1}',
+        "",
+    ]
+    assert list(read_events(iter(lines))) == [{"Events": []}, {"a": 1}]
+
+
+def test_get_event_stream_uri_disabled():
+    rsc = make_rsc("http://127.0.0.1")
+    rsc.client.get.return_value = MagicMock(
+        status=200, dict={"ServiceEnabled": False, "ServerSentEventUri": SSE_URI}, text="x"
+    )
+    assert task_events.get_event_stream_uri(rsc) is None
+
+
+def test_get_event_stream_uri_no_event_service():
+    rsc = make_rsc("http://127.0.0.1")
+    rsc.client.root_resp = MagicMock(dict={})
+    assert task_events.get_event_stream_uri(rsc) is None
+
+
+def test_listener_wakes_up_on_task_events(sse_server):
+    other_release, task_release = threading.Event(), threading.Event()
+    sse_server.events = [(other_release, OTHER_EVENT), (task_release, TASK_EVENT)]
+    rsc = make_rsc(f"http://127.0.0.1:{sse_server.server_port}")
+
+    listener = TaskEventListener.start(rsc)
+    try:
+        other_release.set()
+        assert not listener.wait(0.3)
+        task_release.set()
+        assert listener.wait(5)
+    finally:
+        listener.close()
+
+    assert sse_server.tokens == ["token"]
+
+
+def test_listener_closed_before_connecting_does_not_keep_the_stream(sse_server):
+    rsc = make_rsc(f"http://127.0.0.1:{sse_server.server_port}")
+    listener = TaskEventListener(rsc, SSE_URI)
+
+    listener.close()
+    listener._thread.start()
+
+    listener._thread.join(2)
+    assert not listener.connected
+
+
+def test_monitor_task_polls_on_event(sse_server):
+    release = threading.Event()
+    sse_server.events = [(release, TASK_EVENT)]
+    rsc = make_rsc(f"http://127.0.0.1:{sse_server.server_port}")
+    task_response, final = make_task_responses(rsc, 1)
+    threading.Timer(0.2, release.set).start()
+
+    start = time.monotonic()
+    assert rsc.monitor_task(task_response) is final
+
+    # Without the event, the next poll would only happen after 5 seconds
+    assert time.monotonic() - start < 3
+
+
+def test_monitor_task_without_events_polls_adaptively():
+    rsc = make_rsc("http://127.0.0.1")
+    task_response, final = make_task_responses(rsc, 4)
+
+    with patch.object(TaskEventListener, "start", return_value=None), patch(
+        "time.sleep"
+    ) as mock_sleep:
+        assert rsc.monitor_task(task_response) is final
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0, 2.0, 4.0]
+
+
+def test_monitor_task_honours_retry_after():
+    rsc = make_rsc("http://127.0.0.1")
+    task_response, final = make_task_responses(rsc, 2)
+    task_response.retry_after = 7
+
+    with patch("time.sleep") as mock_sleep:
+        assert rsc.monitor_task(task_response, use_events=False) is final
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [7, 0.5]
@@ -0,0 +1,204 @@
+"""Tests for the multiplexed task monitor scheduler."""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from redfish.rest.v1 import RetriesExhaustedError
+
+from hprsctool.comm.remote_system_controller import RedfishError
+from hprsctool.comm.retry import RetryPolicy
+from hprsctool.comm.task_scheduler import TaskMonitorScheduler
+
+FAST_POLICY = RetryPolicy(attempts=3, backoff=0.001, max_backoff=0.001)
+
+
+def make_response(status=202, body=None, retry_after=None):
+    return MagicMock(
+        is_processing=status == 202, status=status, dict=body or {}, retry_after=retry_after
+    )
+
+
+def chain(*responses):
+    """Make each response's monitor() return the next one"""
+    for response, next_response in zip(responses, responses[1:]):
+        response.monitor.side_effect = lambda client, r=next_response: r
+    return responses[0]
+
+
+def states(events, key):
+    return [(event.state, event.percent_complete) for event in events if event.key == key]
+
+
+def test_scheduler_streams_state_changes():
+    scheduler = TaskMonitorScheduler(poll_interval=0.01)
+    rsc_a, rsc_b = MagicMock(), MagicMock()
+    scheduler.add(
+        "a",
+        rsc_a,
+        chain(
+            make_response(body={"TaskState": "Running", "PercentComplete": 10}),
+            make_response(body={"TaskState": "Running", "PercentComplete": 10}),
+            make_response(body={"TaskState": "Running", "PercentComplete": 50}),
+            make_response(200, {"TaskState": "Completed", "PercentComplete": 100}),
+        ),
+    )
+    scheduler.add(
+        "b",
+        rsc_b,
+        chain(
+            make_response(),
+            make_response(500, {"error": {"@Message.ExtendedInfo": [{"Message": "Update failed"}]}}),
+        ),
+    )
+
+    events = list(scheduler.run())
+
+    assert states(events, "a") == [("Running", 10), ("Running", 50), ("Completed", 100)]
+    assert states(events, "b") == [("Running", None), ("Exception", None)]
+    assert events[-1].done
+    assert [e.message for e in events if e.key == "b"][-1] == "Update failed"
+    assert scheduler.results["a"].status == 200
+    progress = scheduler.progress
+    assert (progress.succeeded, progress.failed, progress.running) == (1, 1, 0)
+    assert str(progress) == "2/2 tasks done (1 succeeded, 1 failed), 100% complete"
+
+
+def test_scheduler_polls_with_rsc_client():
+    rsc = MagicMock()
+    started = chain(make_response(), make_response(200))
+    scheduler = TaskMonitorScheduler(poll_interval=0.01)
+    scheduler.add("a", rsc, started)
+
+    list(scheduler.run())
+
+    started.monitor.assert_called_once_with(rsc.client)
+
+
+def test_scheduler_honours_retry_after():
+    polled = {}
+
+    def record_poll(key):
+        def monitor(client):
+            polled[key] = time.monotonic()
+            return make_response(200)
+        return monitor
+
+    first = make_response(retry_after=0.3)
+    first.monitor.side_effect = record_poll("slow")
+    second = make_response()
+    second.monitor.side_effect = record_poll("fast")
+    scheduler = TaskMonitorScheduler(poll_interval=0.01)
+    start = time.monotonic()
+    scheduler.add("slow", MagicMock(), first)
+    scheduler.add("fast", MagicMock(), second)
+
+    list(scheduler.run())
+
+    assert polled["fast"] < polled["slow"]
+    assert polled["slow"] - start >= 0.3
+
+
+def test_scheduler_isolates_poll_failures():
+    failing = make_response()
+    failing.monitor.side_effect = ConnectionError("connection reset")
+    scheduler = TaskMonitorScheduler(poll_interval=0.01)
+    scheduler.add("failing", MagicMock(), failing)
+    scheduler.add("ok", MagicMock(), chain(make_response(), make_response(200)))
+
+    events = list(scheduler.run())
+
+    failure = [e for e in events if e.key == "failing"][-1]
+    assert failure.done and not failure.succeeded
+    assert "connection reset" in failure.message
+    assert [e for e in events if e.key == "ok"][-1].succeeded
+    assert failure.to_dict()["state"] == "Exception"
+
+
+def test_scheduler_bounds_concurrent_polls():
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def slow_monitor(client):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return make_response(200)
+
+    scheduler = TaskMonitorScheduler(max_workers=2, poll_interval=0.01)
+    for index in range(8):
+        started = make_response()
+        started.monitor.side_effect = slow_monitor
+        scheduler.add(str(index), MagicMock(), started)
+
+    events = list(scheduler.run())
+
+    assert active[1] <= 2
+    assert scheduler.progress.succeeded == 8
+    assert len(events) == 16
+
+
+def test_scheduler_rejects_duplicate_keys():
+    scheduler = TaskMonitorScheduler()
+    scheduler.add("a", MagicMock(), make_response(200))
+    with pytest.raises(ValueError):
+        scheduler.add("a", MagicMock(), make_response())
+
+
+def test_scheduler_retries_transient_poll_failures():
+    lost = RetriesExhaustedError()
+    lost.__cause__ = requests.exceptions.ConnectionError("connection reset")
+    started = make_response()
+    started.monitor.side_effect = [lost, make_response(503), make_response(200)]
+    scheduler = TaskMonitorScheduler(poll_interval=0.01, retry_policy=FAST_POLICY)
+    scheduler.add("a", MagicMock(), started)
+
+    events = list(scheduler.run())
+
+    assert started.monitor.call_count == 3
+    assert [event.state for event in events] == ["Running", "Completed"]
+
+
+def test_scheduler_gives_up_after_the_retry_policy_attempts():
+    lost = RetriesExhaustedError()
+    lost.__cause__ = requests.exceptions.ConnectionError("connection reset")
+    started = make_response()
+    started.monitor.side_effect = lost
+    scheduler = TaskMonitorScheduler(poll_interval=0.01, retry_policy=FAST_POLICY)
+    scheduler.add("a", MagicMock(), started)
+
+    events = list(scheduler.run())
+
+    assert started.monitor.call_count == 3
+    assert events[-1].state == "Exception"
+
+
+def test_background_scheduler_monitors_tasks_of_many_threads():
+    events = []
+    scheduler = TaskMonitorScheduler(poll_interval=0.01)
+    scheduler.start(events.append)
+    failing = make_response()
+    failing.monitor.side_effect = ConnectionError("connection reset")
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = [
+                executor.submit(scheduler.wait, "rsc1", MagicMock(), chain(make_response(), make_response(200)))
+                for _ in range(3)
+            ]
+            failure = executor.submit(scheduler.wait, "rsc2", MagicMock(), failing)
+            assert [result.result(5).status for result in results] == [200, 200, 200]
+            with pytest.raises(RedfishError, match="connection reset"):
+                failure.result(5)
+    finally:
+        scheduler.close()
+
+    assert set(scheduler.tasks) == {"rsc1", "rsc1 (2)", "rsc1 (3)", "rsc2"}
+    assert str(scheduler.progress) == "4/4 tasks done (3 succeeded, 1 failed), 100% complete"
+    assert len([event for event in events if event.done]) == 4
+    assert scheduler.wait("rsc3", MagicMock(), make_response(200)).status == 200
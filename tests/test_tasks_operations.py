@@ -4,7 +4,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from hprsctool.comm.operations.task import get_task, delete_task, get_task_collection
+from hprsctool.comm.operations.task import get_task, get_tasks, delete_task, get_task_collection
 
 
 @pytest.fixture(name="mock_rsc")
@@ -69,3 +69,47 @@ def test_delete_task(mock_rsc):
         mock_delete.assert_called_once_with(
             f"/redfish/v1/TaskService/Tasks/{task_id}/Monitor"
         )
+
+
+def test_get_tasks_uses_expand_and_filter(mock_rsc):
+    mock_rsc.supports_query.return_value = True
+    mock_response = MagicMock()
+    mock_response.dict = {
+        "Members": [
+            {"@odata.id": "/redfish/v1/TaskService/Tasks/1", "Id": "1", "TaskState": "Running"},
+            {"@odata.id": "/redfish/v1/TaskService/Tasks/2", "Id": "2", "TaskState": "Completed"},
+        ]
+    }
+    mock_rsc.perform_redfish_get.return_value = mock_response
+
+    tasks = get_tasks(mock_rsc, running_only=True)
+
+    mock_rsc.perform_redfish_get.assert_called_once_with(
+        "/redfish/v1/TaskService/Tasks?$expand=.&$filter=TaskState%20eq%20'Running'"
+    )
+    mock_rsc.perform_redfish_get_many.assert_not_called()
+    assert [task.task_id for task in tasks] == ["1"]
+
+
+def test_get_tasks_fetches_members_concurrently_without_expand(mock_rsc):
+    mock_rsc.supports_query.return_value = False
+    mock_response = MagicMock()
+    mock_response.dict = {
+        "Members": [
+            {"@odata.id": "/redfish/v1/TaskService/Tasks/1"},
+            {"@odata.id": "/redfish/v1/TaskService/Tasks/2"},
+        ]
+    }
+    mock_rsc.perform_redfish_get.return_value = mock_response
+    mock_rsc.perform_redfish_get_many.return_value = [
+        MagicMock(dict={"Id": "1", "TaskState": "Completed"}),
+        MagicMock(dict={"Id": "2", "TaskState": "Running"}),
+    ]
+
+    tasks = get_tasks(mock_rsc, running_only=True, max_workers=4)
+
+    mock_rsc.perform_redfish_get.assert_called_once_with("/redfish/v1/TaskService/Tasks")
+    mock_rsc.perform_redfish_get_many.assert_called_once_with(
+        ["/redfish/v1/TaskService/Tasks/1", "/redfish/v1/TaskService/Tasks/2"], 4
+    )
+    assert [task.task_id for task in tasks] == ["2"]
@@ -0,0 +1,118 @@
+"""Tests for the trace module."""
+
+import io
+import json
+from unittest.mock import ANY, MagicMock, patch
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from hprsctool.comm.remote_system_controller import RedfishConfig, RedfishError, Rsc
+from hprsctool.comm.trace import TraceEvent, TraceRecorder, format_summary, trace_phase
+from hprsctool.simulator.server import RscSimulator
+
+
+@pytest.fixture(name="traced_rsc")
+def fixture_traced_rsc():
+    recorder = TraceRecorder()
+    with patch("redfish.redfish_client") as redfish_client:
+        redfish_client.return_value.get.return_value = MagicMock(status=200, read=b'{"Id": "1"}')
+        redfish_client.return_value.patch.return_value = MagicMock(status=200, read=b"")
+        rsc = Rsc(RedfishConfig("https://rsc1", "admin", "password"), trace=recorder)
+    return rsc, recorder
+
+
+def test_requests_are_traced(traced_rsc):
+    rsc, recorder = traced_rsc
+    rsc.perform_redfish_get("/redfish/v1/Managers/1")
+    rsc.perform_redfish_patch("/redfish/v1/Managers/1", {"DateTime": "now"})
+
+    connect, get, patch_ = recorder.events
+    assert (connect.kind, connect.name, connect.address) == ("phase", "connect", "https://rsc1")
+    assert (get.kind, get.name, get.url, get.status) == ("request", "GET", "/redfish/v1/Managers/1", 200)
+    assert get.response_bytes == len(b'{"Id": "1"}')
+    assert patch_.request_bytes == len(json.dumps({"DateTime": "now"}))
+
+
+def test_failed_request_is_traced(traced_rsc):
+    rsc, recorder = traced_rsc
+    rsc.client.get.side_effect = ConnectionError("unreachable")
+
+    with pytest.raises(ConnectionError):
+        rsc.perform_redfish_get("/redfish/v1/Systems/1")
+
+    assert recorder.events[-1].status is None
+    assert recorder.events[-1].error == "unreachable"
+
+
+def test_rsc_without_trace_sends_requests_directly():
+    with patch("redfish.redfish_client") as redfish_client:
+        rsc = Rsc(RedfishConfig("https://rsc1", "admin", "password"))
+    rsc.client.get.return_value = MagicMock(status=200)
+
+    rsc.perform_redfish_get("/redfish/v1/Systems/1")
+
+    assert "https_adapter" not in redfish_client.call_args.kwargs
+    rsc.client.get.assert_called_once_with("/redfish/v1/Systems/1", timeout=ANY, max_retry=0)
+
+
+def test_trace_phase_records_errors():
+    recorder = TraceRecorder()
+    with pytest.raises(RedfishError):
+        with trace_phase(recorder, "login", "https://rsc1"):
+            raise RedfishError("Login failed")
+
+    [event] = recorder.events
+    assert event.error == "Login failed"
+    assert "request_bytes" not in event.to_dict()
+
+
+def test_recorder_writes_json_lines():
+    stream = io.StringIO()
+    recorder = TraceRecorder(stream)
+    recorder(TraceEvent("request", "GET", "https://rsc1", "/redfish/v1", status=200, elapsed=0.01))
+
+    line = json.loads(stream.getvalue())
+    assert line["url"] == "/redfish/v1"
+    assert "error" not in line
+
+
+def test_summary_groups_requests_slowest_first():
+    events = [
+        TraceEvent("phase", "login", "https://rsc1", elapsed=0.2),
+        TraceEvent("request", "GET", url="/redfish/v1/Systems/1", status=200, elapsed=0.01),
+        TraceEvent("request", "GET", url="/redfish/v1/Managers/1", status=200, elapsed=0.03),
+        TraceEvent("request", "GET", url="/redfish/v1/Systems/1", status=503, elapsed=0.01, retries=1),
+    ]
+
+    lines = format_summary(events).splitlines()
+
+    assert lines[1] == "  login https://rsc1: 200.0 ms"
+    assert lines[4].endswith("GET /redfish/v1/Managers/1 (200)")
+    assert lines[5].split()[:5] == ["2", "20.0", "10.0", "0", "1"]
+    assert lines[5].endswith("GET /redfish/v1/Systems/1 (200, 503)")
+    assert lines[-1] == "Total: 3 requests, 0 bytes, 50.0 ms in requests"
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+def test_retries_are_traced():
+    recorder = TraceRecorder()
+    send = HTTPAdapter.send
+    failures = [requests.ConnectionError("reset")]
+
+    def flaky_send(adapter, request, *args, **kwargs):
+        if failures and request.url.endswith("/Systems/1"):
+            raise failures.pop()
+        return send(adapter, request, *args, **kwargs)
+
+    with RscSimulator(1) as simulator:
+        rsc = Rsc(RedfishConfig(simulator.base_urls[0], "admin", "password"), trace=recorder)
+        rsc.login()
+        with patch.object(HTTPAdapter, "send", flaky_send), patch("redfish.rest.v1.time.sleep"):
+            rsc.perform_redfish_get("/redfish/v1/Systems/1")
+
+    assert [event.name for event in recorder.events[:2]] == ["connect", "login"]
+    get = recorder.events[-1]
+    assert (get.status, get.retries) == (200, 1)
+    assert get.response_bytes > 0
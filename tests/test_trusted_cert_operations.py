@@ -0,0 +1,86 @@
+"""Tests for the trusted certificate operations module."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from hprsctool.comm.operations.trusted_cert import (
+    get_trusted_certificates,
+    get_trusted_certificates_by_fingerprint,
+)
+
+LOCATIONS_URL = "/redfish/v1/CertificateService/CertificateLocations"
+LINKS = [
+    {"@odata.id": "/redfish/v1/Managers/1/TrustedCertificates/b"},
+    {"@odata.id": "/redfish/v1/Managers/1/NetworkProtocol/HTTPS/Certificates/1"},
+    {"@odata.id": "/redfish/v1/Managers/1/TrustedCertificates/a"},
+]
+
+
+@pytest.fixture(name="mock_rsc")
+def fixture_mock_rsc():
+    return MagicMock()
+
+
+def test_get_trusted_certificates_concurrently(mock_rsc):
+    mock_rsc.supports_query.return_value = False
+    mock_rsc.perform_redfish_get.return_value = MagicMock(
+        dict={"Links": {"Certificates": LINKS}}
+    )
+    mock_rsc.perform_redfish_get_many.return_value = [
+        MagicMock(dict={"Id": "b", "Fingerprint": "BB:01"}),
+        MagicMock(dict={"Id": "a", "Fingerprint": "AA:02"}),
+    ]
+
+    certs = get_trusted_certificates(mock_rsc)
+
+    mock_rsc.perform_redfish_get.assert_called_once_with(LOCATIONS_URL)
+    mock_rsc.perform_redfish_get_many.assert_called_once_with(
+        [
+            "/redfish/v1/Managers/1/TrustedCertificates/b",
+            "/redfish/v1/Managers/1/TrustedCertificates/a",
+        ]
+    )
+    assert [cert.certificate_id for cert in certs] == ["b", "a"]
+
+
+def test_get_trusted_certificates_expanded(mock_rsc):
+    mock_rsc.supports_query.return_value = True
+    mock_rsc.perform_redfish_get.return_value = MagicMock(
+        dict={
+            "Links": {
+                "Certificates": [
+                    {"@odata.id": "/redfish/v1/Managers/1/TrustedCertificates/b", "Id": "b"},
+                    {"@odata.id": "/redfish/v1/Managers/1/TrustedCertificates/a", "Id": "a"},
+                ]
+            }
+        }
+    )
+
+    certs = get_trusted_certificates(mock_rsc)
+
+    mock_rsc.perform_redfish_get.assert_called_once_with(f"{LOCATIONS_URL}?$expand=~")
+    mock_rsc.perform_redfish_get_many.assert_not_called()
+    assert [cert.certificate_id for cert in certs] == ["b", "a"]
+
+
+def test_get_trusted_certificates_no_links(mock_rsc):
+    mock_rsc.supports_query.return_value = False
+    mock_rsc.perform_redfish_get.return_value = MagicMock(dict={})
+    assert not get_trusted_certificates(mock_rsc)
+
+
+def test_get_trusted_certificates_by_fingerprint(mock_rsc):
+    mock_rsc.supports_query.return_value = False
+    mock_rsc.perform_redfish_get.return_value = MagicMock(
+        dict={"Links": {"Certificates": LINKS}}
+    )
+    mock_rsc.perform_redfish_get_many.return_value = [
+        MagicMock(dict={"Id": "b", "Fingerprint": "BB:01"}),
+        MagicMock(dict={"Id": "a"}),
+    ]
+
+    certs = get_trusted_certificates_by_fingerprint(mock_rsc)
+
+    assert list(certs) == ["bb01"]
+    assert certs["bb01"].certificate_id == "b"
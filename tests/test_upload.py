@@ -0,0 +1,167 @@
+"""Tests for streaming multipart uploads."""
+
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hprsctool.comm import upload
+from hprsctool.comm.operations import manager as manager_ops
+from hprsctool.comm.remote_system_controller import UPLOAD_READ_TIMEOUT, RedfishConfig, Rsc
+from hprsctool.comm.retry import RetryPolicy
+from hprsctool.comm.upload import ProgressPrinter, UploadProgress, post_multipart
+
+FILE_SIZE = 1024 * 1024
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    """Stand-in for the MultipartUpdate endpoint of an RSC"""
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        self.server.requests.append(
+            {
+                "path": self.path,
+                "token": self.headers.get("X-Auth-Token"),
+                "parts": {
+                    part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                    for part in message.iter_parts()
+                },
+            }
+        )
+        self.send_response(202)
+        self.send_header("Location", "/redfish/v1/TaskService/TaskMonitors/1")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UploadHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TrackedFile(io.BytesIO):
+    """File that remembers the largest read, to check the body is streamed"""
+
+    largest_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.largest_read = max(self.largest_read, len(data))
+        return data
+
+
+def test_post_multipart_streams_file(server):
+    firmware = TrackedFile(bytes(range(256)) * (FILE_SIZE // 256))
+    progress = []
+
+    response = post_multipart(
+        f"http://127.0.0.1:{server.server_port}/upload",
+        {"UpdateFile": ("image.bin", firmware)},
+        headers={"X-Auth-Token": "token"},
+        callback=progress.append,
+        timeout=10,
+    )
+
+    assert response.status_code == 202
+    request = server.requests[0]
+    assert request["token"] == "token"
+    assert request["parts"]["UpdateFile"] == firmware.getvalue()
+    assert firmware.largest_read < FILE_SIZE / 4
+    assert len(progress) > 1
+    sent = [p.bytes_sent for p in progress]
+    assert sent == sorted(sent)
+    assert progress[-1].done
+    assert progress[-1].total_bytes > FILE_SIZE
+
+
+def test_perform_redfish_post_multipart(server):
+    with patch("redfish.redfish_client") as mock_client:
+        rsc = Rsc(RedfishConfig(f"http://127.0.0.1:{server.server_port}", "admin", "password"))
+    mock_client.return_value.get_session_key.return_value = "token"
+    progress = MagicMock()
+
+    response = rsc.perform_redfish_post(
+        "/redfish/v1/UpdateService/MultipartUpdate",
+        {"UpdateParameters": '{"Targets": []}', "UpdateFile": ("image.bin", io.BytesIO(b"abc"))},
+        is_multipart=True,
+        progress=progress,
+    )
+
+    assert response.status == 202
+    assert response.task_location == "/redfish/v1/TaskService/TaskMonitors/1"
+    mock_client.return_value.post.assert_not_called()
+    request = server.requests[0]
+    assert request["path"] == "/redfish/v1/UpdateService/MultipartUpdate"
+    assert request["token"] == "token"
+    assert request["parts"] == {"UpdateParameters": b'{"Targets": []}', "UpdateFile": b"abc"}
+    assert progress.call_args.args[0].done
+
+
+def test_uploads_use_the_timeouts_of_the_retry_policy():
+    with patch("redfish.redfish_client"):
+        rsc = Rsc(
+            RedfishConfig("https://rsc", "admin", "password"),
+            retry_policy=RetryPolicy(connect_timeout=3, read_timeout=5000),
+        )
+    assert rsc.upload_timeouts == (3, 5000)
+
+    rsc.retry_policy = RetryPolicy(connect_timeout=3, read_timeout=5)
+    with patch.object(upload.requests, "post") as mock_post:
+        mock_post.return_value.status_code = 202
+        rsc.perform_redfish_post(
+            "/redfish/v1/UpdateService/MultipartUpdate",
+            {"UpdateFile": ("image.bin", io.BytesIO(b"abc"))},
+            is_multipart=True,
+        )
+    assert mock_post.call_args.kwargs["timeout"] == (3, UPLOAD_READ_TIMEOUT)
+
+
+def test_update_rsc_firmware_streams_upload(tmp_path):
+    fw_file = tmp_path / "rsc.bin"
+    fw_file.write_bytes(b"firmware")
+    rsc = MagicMock(address="https://rsc")
+    rsc.client.get_session_key.return_value = "token"
+    rsc.monitor_task.return_value = MagicMock(status=200)
+
+    with patch.object(manager_ops, "post_multipart") as mock_post:
+        mock_post.return_value.status_code = 202
+        manager_ops.update_rsc_firmware(rsc, str(fw_file))
+
+    args = mock_post.call_args
+    assert args.args[0] == "https://rsc/redfish/v1/UpdateService/MultipartUpdate"
+    filename, firmware = args.args[1]["UpdateFile"]
+    assert filename == "rsc.bin"
+    assert bytes(firmware.read()) == b"firmware"
+    assert args.kwargs["headers"] == {"X-Auth-Token": "token"}
+    assert isinstance(args.kwargs["callback"], ProgressPrinter)
+
+
+def test_progress_printer_throttles_output():
+    stream = io.StringIO()
+    printer = ProgressPrinter(stream=stream, interval=60)
+
+    printer(UploadProgress(0, 4 * upload.MIB, 0))
+    printer(UploadProgress(upload.MIB, 4 * upload.MIB, 1))
+    printer(UploadProgress(4 * upload.MIB, 4 * upload.MIB, 2))
+
+    assert stream.getvalue() == (
+        "\r  0% 0.0/4.0 MiB (0.0 MiB/s)"
+        "\r100% 4.0/4.0 MiB (2.0 MiB/s)\n"
+    )